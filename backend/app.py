@@ -10,12 +10,22 @@ import os
 # Agregar el directorio padre al path para importar módulos
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, g, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-from parser.lr1_parser import LR1Parser
-from parser.lalr1_parser import LALR1Parser
-from parser.visualizer_graphviz import LR1GraphvizVisualizer
+from parser.visualizer_graphviz import LR1GraphvizVisualizer, render_dot_source, dot_available
+from parser.layout import RANKDIRS, layout_to_svg
+from parser.budget import BuildBudget, BudgetExceeded
+from backend.registry import ParserRegistry
+from backend.parse_cache import ParseResultCache
+from backend.jobs import BuildJobManager
+from backend.render_cache import RenderCache, MIME_TYPES
+from backend.metrics import (BUILD_BUCKETS, CONTENT_TYPE, SIZE_BUCKETS, STEPS_BUCKETS,
+                             THROUGHPUT_BUCKETS, MetricsRegistry, hit_ratio)
+from backend.views import (STATE_ITEM_FIELDS, TABLE_FIELDS, encode_view, page_bounds, page_info,
+                           parse_fields, parsing_table_page, states_page, table_rows)
 import base64
+import json
+import time
 from io import BytesIO
 
 # Configurar rutas para static (almacenar imágenes generadas)
@@ -34,9 +44,144 @@ CORS(app, resources={
     }
 })
 
-# Parser global
-parser = None
-graphviz_viz = None
+def _env_number(name, default, cast=int):
+    """Lee un límite numérico de una variable de entorno ('' o ausente = default)"""
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+# Límites de construcción: una gramática patológica no puede agotar el worker
+build_budget = BuildBudget(
+    max_states=_env_number('BUILD_MAX_STATES', 20000),
+    max_items=_env_number('BUILD_MAX_ITEMS', 2000000),
+    max_seconds=_env_number('BUILD_MAX_SECONDS', 60.0, float),
+    max_memory_bytes=_env_number('BUILD_MAX_MEMORY_MB', 1024) * 1024 * 1024
+)
+
+# Registro de parsers construidos (LRU por grammar_id)
+registry = ParserRegistry(
+    max_entries=int(os.environ.get('PARSER_CACHE_ENTRIES', 32)),
+    max_states=int(os.environ.get('PARSER_CACHE_MAX_STATES', 50000)),
+    max_bytes=int(os.environ.get('PARSER_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+    budget=build_budget,
+    fallback=os.environ.get('BUILD_FALLBACK', '1') == '1',
+    kernel_only=os.environ.get('PARSER_KERNEL_ONLY', '0') == '1',
+    # LALR(1): conservar el autómata LR(1) para las reconstrucciones con base_grammar_id
+    keep_canonical=os.environ.get('PARSER_KEEP_CANONICAL', '0') == '1',
+    # Directorio de tablas compartidas entre los workers de gunicorn
+    shared_dir=os.environ.get('PARSER_SHARED_DIR') or None,
+    shared_max_bytes=int(os.environ.get('PARSER_SHARED_MAX_BYTES', 256 * 1024 * 1024))
+)
+
+# Resultados de /api/parse_string guardados en las entradas del registro
+parse_cache = ParseResultCache(
+    registry,
+    max_results=int(os.environ.get('PARSE_CACHE_RESULTS', 256)),
+    max_result_bytes=int(os.environ.get('PARSE_CACHE_MAX_RESULT_BYTES', 256 * 1024))
+)
+
+# Renderizados de Graphviz (SVG/PNG) por hash del código DOT
+render_cache = RenderCache(max_bytes=int(os.environ.get('RENDER_CACHE_MAX_BYTES', 64 * 1024 * 1024)))
+
+# Vistas JSON precalculadas al construir cada parser (y comprimidas con gzip)
+PRECOMPUTE_VIEWS = os.environ.get('PRECOMPUTE_VIEWS', '1') == '1'
+VIEWS_GZIP = os.environ.get('VIEWS_GZIP', '1') == '1'
+
+# Motor de layout por defecto: 'dot', 'builtin' o 'auto' (dot si está instalado)
+LAYOUT_ENGINE = os.environ.get('LAYOUT_ENGINE', 'auto')
+
+# Construcciones en segundo plano (pool de workers compartiendo el registro)
+build_jobs = BuildJobManager(registry, max_workers=int(os.environ.get('BUILD_WORKERS', 2)))
+
+# Métricas de Prometheus en /metrics (METRICS_ENABLED=0 desactiva los hooks)
+metrics = MetricsRegistry(enabled=os.environ.get('METRICS_ENABLED', '1') == '1')
+
+request_latency = metrics.histogram(
+    'lr1_http_request_duration_seconds', 'Latencia de las peticiones HTTP por ruta',
+    ('route', 'method', 'status'))
+build_duration = metrics.histogram(
+    'lr1_build_duration_seconds', 'Duración de la construcción de parsers',
+    ('parser_type',), BUILD_BUCKETS)
+build_states = metrics.histogram(
+    'lr1_build_states', 'Estados del autómata construido', ('parser_type',), SIZE_BUCKETS)
+build_transitions = metrics.histogram(
+    'lr1_build_transitions', 'Transiciones del autómata construido', ('parser_type',), SIZE_BUCKETS)
+shared_attaches = metrics.counter(
+    'lr1_shared_attaches_total', 'Parsers cargados de las tablas compartidas (sin construir)', ('parser_type',))
+parse_duration = metrics.histogram(
+    'lr1_parse_duration_seconds', 'Duración del análisis de cadenas', ('accepted',))
+parse_steps = metrics.histogram(
+    'lr1_parse_steps', 'Pasos (shift/reduce) por análisis', ('accepted',), STEPS_BUCKETS)
+parse_throughput = metrics.histogram(
+    'lr1_parse_tokens_per_second', 'Tokens por segundo de cada análisis', (), THROUGHPUT_BUCKETS)
+parse_tokens = metrics.counter('lr1_parse_tokens_total', 'Tokens analizados')
+view_responses = metrics.counter(
+    'lr1_view_responses_total', 'Respuestas de vistas JSON (not_modified = 304 por ETag)', ('result',))
+
+# Métricas que ya llevan otros objetos: se leen solo al consultar /metrics
+metrics.collected('lr1_cache_hits_total', 'Aciertos de las cachés', lambda: [
+    ({'cache': 'parser'}, registry.stats()['hits']),
+    ({'cache': 'render'}, render_cache.stats()['hits']),
+    ({'cache': 'parse'}, parse_cache.stats()['hits'])], kind='counter')
+metrics.collected('lr1_cache_misses_total', 'Fallos de las cachés', lambda: [
+    ({'cache': 'parser'}, registry.stats()['misses']),
+    ({'cache': 'render'}, render_cache.stats()['misses']),
+    ({'cache': 'parse'}, parse_cache.stats()['misses'])], kind='counter')
+metrics.collected('lr1_cache_hit_ratio', 'Proporción de aciertos de las cachés', lambda: [
+    ({'cache': 'parser'}, hit_ratio(registry.stats())),
+    ({'cache': 'render'}, hit_ratio(render_cache.stats())),
+    ({'cache': 'parse'}, hit_ratio(parse_cache.stats())),
+    ({'cache': 'views'}, view_hit_ratio())])
+metrics.collected('lr1_cache_bytes', 'Bytes ocupados por las cachés', lambda: [
+    ({'cache': 'parser'}, registry.stats()['total_bytes']),
+    ({'cache': 'render'}, render_cache.stats()['total_bytes'])])
+metrics.collected('lr1_builds_in_flight', 'Construcciones de parsers en curso',
+                  lambda: [({}, registry.in_flight())])
+metrics.collected('lr1_build_jobs_active', 'Trabajos de construcción en cola o en ejecución',
+                  lambda: [({}, build_jobs.active_count())])
+
+
+def view_hit_ratio():
+    """Proporción de vistas JSON respondidas con 304 (el cliente ya tenía la copia)"""
+    counts = {labels['result']: value for _, labels, value in view_responses.samples()}
+    total = sum(counts.values())
+    return counts.get('not_modified', 0) / total if total else 0.0
+
+
+@app.before_request
+def start_request_timer():
+    """Marca el inicio de la petición para medir su latencia"""
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_latency(response):
+    """Registra la latencia de la petición, agrupada por la regla de la ruta"""
+    start = g.get('request_start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_latency.observe(time.perf_counter() - start, route=route,
+                                method=request.method, status=response.status_code)
+    return response
+
+
+def record_build(entry):
+    """Registra duración y tamaño de una construcción recién terminada"""
+    if not metrics.enabled:
+        return
+    parser_type = entry.parser_type
+
+    # Las entradas cargadas de shared_dir no se construyeron en este proceso:
+    # su duración sería solo la de FIRST/FOLLOW y sesgaría los histogramas
+    if entry.extras.get('shared', {}).get('attached'):
+        shared_attaches.inc(parser_type=parser_type)
+        return
+
+    stats = entry.parser.stats
+    build_duration.observe(sum(phase['wall_seconds'] for phase in stats.phases), parser_type=parser_type)
+    build_states.observe(stats.states, parser_type=parser_type)
+    build_transitions.observe(stats.transitions, parser_type=parser_type)
 
 # Gramática por defecto
 DEFAULT_GRAMMAR = """S -> q * A * B * C
@@ -51,19 +196,42 @@ D -> ε"""
 
 
 def init_parser(grammar_text, parser_type='LR1'):
-    """Inicializa el parser con una gramática"""
-    global parser, graphviz_viz
+    """Inicializa el parser con una gramática (reutiliza el registro si ya existe)"""
+    entry, _ = registry.build(grammar_text, parser_type)
+    return entry.parser
 
-    if parser_type.upper() == 'LALR1' or parser_type.upper() == 'LALR(1)':
-        parser = LALR1Parser()
-    else:
-        parser = LR1Parser()
 
-    parser.parse_grammar(grammar_text)
+def get_visualizer(entry):
+    """Retorna el visualizador de una entrada del registro, creándolo bajo demanda"""
+    if entry.visualizer is None:
+        entry.visualizer = LR1GraphvizVisualizer(entry.parser)
+    return entry.visualizer
+
+
+def lookup_entry():
+    """
+    Busca el parser indicado por grammar_id (en el body JSON o en la query string)
+
+    Returns:
+        Tupla (entrada, respuesta_de_error); solo uno de los dos es distinto de None
+    """
+    data = request.get_json(silent=True) or {}
+    grammar_id = data.get('grammar_id') or request.args.get('grammar_id')
 
-    graphviz_viz = LR1GraphvizVisualizer(parser)
+    if not grammar_id:
+        return None, (jsonify({
+            'success': False,
+            'error': 'Falta grammar_id. Primero construya el parser.'
+        }), 400)
+
+    entry = registry.get(grammar_id)
+    if entry is None:
+        return None, (jsonify({
+            'success': False,
+            'error': 'grammar_id desconocido o expirado. Vuelva a construir el parser.'
+        }), 404)
 
-    return parser
+    return entry, None
 
 
 @app.route('/')
@@ -74,14 +242,65 @@ def index():
         'version': '1.0',
         'endpoints': {
             'build_parser': '/api/build_parser',
+            'build_jobs': '/api/build_jobs/<job_id>',
             'generate_graphviz': '/api/generate_graphviz',
+            'export_automaton': '/api/export_automaton',
             'parse_string': '/api/parse_string',
             'get_states': '/api/get_states',
-            'get_parsing_table': '/api/get_parsing_table'
+            'get_parsing_table': '/api/get_parsing_table',
+            'metrics': '/metrics'
         }
     })
 
 
+def build_parser_payload(entry, cached):
+    """Arma la respuesta de construcción de un parser del registro"""
+    parser = entry.parser
+
+    # Obtener información
+    info = get_visualizer(entry).get_automaton_info()
+
+    # Obtener conjuntos FIRST y FOLLOW
+    first_sets = {}
+    follow_sets = {}
+
+    for nt in sorted(parser.non_terminals):
+        first_sets[nt] = sorted(list(parser.first_sets.get(nt, set())))
+        follow_sets[nt] = sorted(list(parser.follow_sets.get(nt, set())))
+
+    # Obtener producciones (origin: número en la gramática sin reducir)
+    productions = []
+    for i, prod in enumerate(parser.grammar):
+        productions.append({
+            'number': i,
+            'origin': parser.production_origin[i] if parser.production_origin else i,
+            'text': str(prod)
+        })
+
+    # Determinar tipo de parser usado (con AUTO, la clase elegida)
+    parser_type_str = parser.parser_type_name
+
+    return {
+        'success': True,
+        'grammar_id': entry.grammar_id,
+        'cached': cached,
+        'parser_type': parser_type_str,
+        'fallback': entry.extras.get('fallback'),
+        'auto': entry.extras.get('auto'),
+        'conflicts': parser.conflicts,
+        'lazy': {'expanded_states': parser.expanded_states} if parser.lazy else None,
+        'shared': entry.extras.get('shared'),
+        'info': info,
+        'stats': parser.stats.to_dict(),
+        'reduction': parser.reduction.to_dict() if parser.reduction is not None else None,
+        'ebnf_helpers': dict(parser.ebnf_helpers),
+        'incremental': parser.diff.to_dict() if parser.diff is not None else None,
+        'first_sets': first_sets,
+        'follow_sets': follow_sets,
+        'productions': productions
+    }
+
+
 @app.route('/api/build_parser', methods=['POST'])
 def build_parser():
     """Construye el parser LR(1) o LALR(1) con la gramática dada"""
@@ -90,39 +309,51 @@ def build_parser():
         grammar = data.get('grammar', DEFAULT_GRAMMAR)
         parser_type = data.get('parser_type', 'LR1')
 
-        # Construir parser
-        init_parser(grammar, parser_type)
-
-        # Obtener información
-        info = graphviz_viz.get_automaton_info()
+        # Con "async": true la construcción se encola y se responde de inmediato
+        if data.get('async'):
+            return submit_build_job(grammar, parser_type)
 
-        # Obtener conjuntos FIRST y FOLLOW
-        first_sets = {}
-        follow_sets = {}
+        # Con base_grammar_id (la versión anterior de la gramática en el editor)
+        # la construcción reutiliza lo que la edición no afecta
+        base = registry.get(data['base_grammar_id']) if data.get('base_grammar_id') else None
 
-        for nt in sorted(parser.non_terminals):
-            first_sets[nt] = sorted(list(parser.first_sets.get(nt, set())))
-            follow_sets[nt] = sorted(list(parser.follow_sets.get(nt, set())))
+        # Construir parser (o reutilizarlo si la gramática ya está en el registro)
+        entry, cached = registry.build(grammar, parser_type, fallback=data.get('fallback'),
+                                       previous=base.parser if base is not None else None)
 
-        # Obtener producciones
-        productions = []
-        for i, prod in enumerate(parser.grammar):
-            productions.append({
-                'number': i,
-                'text': str(prod)
-            })
+        return jsonify(build_parser_payload(entry, cached))
 
-        # Determinar tipo de parser usado
-        parser_type_str = 'LALR(1)' if isinstance(parser, LALR1Parser) else 'LR(1)'
+    except BudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'budget_exceeded': e.to_dict()
+        }), 400
 
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'parser_type': parser_type_str,
-            'info': info,
-            'first_sets': first_sets,
-            'follow_sets': follow_sets,
-            'productions': productions
-        })
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+def submit_build_job(grammar, parser_type):
+    """Encola una construcción y responde 202 con el id del trabajo"""
+    job = build_jobs.submit(grammar, parser_type)
+    return jsonify({
+        'success': True,
+        'job_id': job.job_id,
+        'status_url': f'/api/build_jobs/{job.job_id}'
+    }), 202
+
+
+@app.route('/api/build_jobs', methods=['POST'])
+def create_build_job():
+    """Encola la construcción de un parser en segundo plano"""
+    try:
+        data = request.json
+        return submit_build_job(data.get('grammar', DEFAULT_GRAMMAR),
+                                data.get('parser_type', 'LR1'))
 
     except Exception as e:
         return jsonify({
@@ -131,31 +362,97 @@ def build_parser():
         }), 400
 
 
+@app.route('/api/build_jobs/<job_id>', methods=['GET'])
+def get_build_job(job_id):
+    """Estado y progreso de una construcción en segundo plano"""
+    job = build_jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Trabajo no encontrado'
+        }), 404
+
+    response = {'success': True, 'job': job.to_dict()}
+
+    # Al terminar se incluye el mismo resultado que /api/build_parser
+    if job.status == 'done':
+        entry = registry.get(job.grammar_id)
+        if entry is not None:
+            response['result'] = build_parser_payload(entry, True)
+
+    return jsonify(response)
+
+
+@app.route('/api/build_jobs/<job_id>/cancel', methods=['POST'])
+def cancel_build_job(job_id):
+    """Solicita la cancelación de una construcción en segundo plano"""
+    if not build_jobs.cancel(job_id):
+        return jsonify({
+            'success': False,
+            'error': 'Trabajo no encontrado o ya terminado'
+        }), 404
+
+    return jsonify({'success': True, 'job': build_jobs.get(job_id).to_dict()})
+
+
 @app.route('/api/generate_graphviz', methods=['POST'])
 def generate_graphviz():
     """Genera visualización con Graphviz"""
     try:
-        if parser is None:
-            return jsonify({
-                'success': False,
-                'error': 'Parser no inicializado. Primero construya el parser.'
-            }), 400
+        entry, error_response = lookup_entry()
+        if entry is None:
+            return error_response
+
+        # Vista opcional para autómatas grandes: full, kernel, ids o summary,
+        # restringida a la vecindad de un estado si se indica center
+        data = request.get_json(silent=True) or {}
+        view = data.get('view', 'full')
+        center = data.get('center')
+        center = int(center) if center is not None else None
+        radius = int(data.get('radius', 1))
+
+        visualizer = get_visualizer(entry)
+        source = visualizer.get_dot_source(view, center, radius)
+
+        # El render_id es el hash del código DOT: mismo autómata, misma imagen
+        render_id = render_cache.register(source)
+
+        # Motor integrado en Python puro: no necesita el binario dot
+        engine = data.get('engine', LAYOUT_ENGINE)
+        if engine == 'auto':
+            engine = 'dot' if dot_available() else 'builtin'
+
+        if engine == 'builtin':
+            # rankdir forma parte de la clave de la caché: solo valores conocidos
+            rankdir = data.get('rankdir', 'LR')
+            if rankdir not in RANKDIRS:
+                raise ValueError(f"rankdir no válido: {rankdir}. Opciones: {', '.join(RANKDIRS)}")
+            layout_json = render_cache.get(
+                render_id, f'layout-{rankdir}',
+                lambda _source, _fmt: json.dumps(
+                    visualizer.create_layout(view, center, radius, rankdir)).encode('utf-8'))
+            layout = json.loads(layout_json)
 
-        # Generar visualización
-        static_path = os.path.join(os.path.dirname(__file__), '../frontend/static')
-        filename = os.path.join(static_path, 'automata_graphviz')
-        os.makedirs(static_path, exist_ok=True)
+            return jsonify({
+                'success': True,
+                'engine': 'builtin',
+                'render_id': render_id,
+                'svg': layout_to_svg(layout),
+                'layout': layout
+            })
 
-        graphviz_viz.visualize(filename, output_format='svg', view_file=False)
+        if engine != 'dot':
+            raise ValueError(f"Motor de layout no válido: {engine}. Opciones: dot, builtin, auto")
 
-        # Leer el archivo SVG
-        with open(f'{filename}.svg', 'r') as f:
-            svg_content = f.read()
+        svg_content = render_cache.get(render_id, 'svg', render_dot_source)
 
         return jsonify({
             'success': True,
-            'svg': svg_content,
-            'png_url': f'/static/automata_graphviz.png'
+            'engine': 'dot',
+            'render_id': render_id,
+            'svg': svg_content.decode('utf-8'),
+            'svg_url': f'/download/{render_id}.svg',
+            'png_url': f'/download/{render_id}.png'
         })
 
     except Exception as e:
@@ -169,25 +466,41 @@ def generate_graphviz():
 def parse_string():
     """Analiza una cadena con el parser LR(1)"""
     try:
-        if parser is None:
-            return jsonify({
-                'success': False,
-                'error': 'Parser no inicializado. Primero construya el parser.'
-            }), 400
+        entry, error_response = lookup_entry()
+        if entry is None:
+            return error_response
 
         data = request.json
         input_string = data.get('string', '')
-
-        # Analizar cadena
-        result = parser.parse_string(input_string)
-
-        # El método parse_string retorna 'success' (True/False) y 'trace'
-        return jsonify({
-            'success': True,
-            'accepted': result.get('success', False),
-            'trace': result.get('trace', []),
-            'error': result.get('error', '')
-        })
+        # trace es booleano JSON o texto ("false", "0", ...): bool("false") sería True
+        trace = data.get('trace', True)
+        if not isinstance(trace, bool):
+            trace = str(trace).lower() in ('1', 'true')
+
+        def parse():
+            start = time.perf_counter()
+            result = entry.parser.parse_string(input_string)
+            if metrics.enabled:
+                record_parse(input_string, result, time.perf_counter() - start)
+
+            # El método parse_string retorna 'success' (True/False) y 'trace'
+            payload = {
+                'success': True,
+                'accepted': result.get('success', False),
+                'error': result.get('error', '')
+            }
+            if trace:
+                payload['trace'] = result.get('trace', [])
+            return payload
+
+        # Las mismas cadenas se repiten mucho (ejemplos, reintentos del frontend)
+        view, cached = parse_cache.get_or_parse(entry, input_string, trace, parse)
+        if not cached:
+            # Un parser perezoso pudo expandir estados: cuentan para la expulsión
+            registry.track_growth(entry)
+        response = send_view(view)
+        response.headers['X-Parse-Cache'] = 'hit' if cached else 'miss'
+        return response
 
     except Exception as e:
         return jsonify({
@@ -196,40 +509,140 @@ def parse_string():
         }), 400
 
 
+def record_parse(input_string, result, seconds):
+    """Registra duración, pasos y tokens por segundo de un análisis"""
+    accepted = 'true' if result.get('success') else 'false'
+    tokens = len(input_string.split())
+    parse_duration.observe(seconds, accepted=accepted)
+    parse_steps.observe(len(result.get('trace', [])), accepted=accepted)
+    parse_tokens.inc(tokens)
+    if seconds > 0:
+        parse_throughput.observe(tokens / seconds)
+
+
+def request_page(total):
+    """Rango de estados pedido en la query string (start y limit)"""
+    return page_bounds(total,
+                       request.args.get('start', 0, type=int),
+                       request.args.get('limit', type=int))
+
+
+def is_full_view_request():
+    """Indica si la petición pide la vista completa (sin página ni selección de campos)"""
+    return not any(request.args.get(name) for name in ('start', 'limit', 'fields'))
+
+
+def get_table_rows(entry):
+    """Filas de ACTION/GOTO agrupadas por estado, calculadas una vez por parser"""
+    # Las tablas de un parser perezoso crecen con cada análisis: no se guardan
+    if entry.parser.lazy:
+        return table_rows(entry.parser)
+    if 'table_rows' not in entry.extras:
+        entry.extras['table_rows'] = table_rows(entry.parser)
+    return entry.extras['table_rows']
+
+
+def prepare_views(entry):
+    """
+    Serializa las vistas completas de estados y tabla al construir el parser
+
+    Se ejecuta en el thread de la construcción (ver ParserRegistry.prepare);
+    las peticiones posteriores solo copian bytes o responden 304.
+
+    Returns:
+        Bytes ocupados por las vistas, que cuentan para el tamaño de la entrada
+    """
+    # Con estados compactados las vistas guardarían de nuevo todas las clausuras
+    if not PRECOMPUTE_VIEWS or entry.parser.lazy or entry.parser.kernel_only:
+        return 0
+
+    parser = entry.parser
+    total = len(parser.states)
+    rows = get_table_rows(entry)
+
+    payloads = {
+        'states': {'states': states_page(parser, 0, total)},
+        'parsing_table': parsing_table_page(parser, rows, 0, total),
+        'parsing_table_sparse': parsing_table_page(parser, rows, 0, total, sparse=True)
+    }
+
+    views = {}
+    for name, payload in payloads.items():
+        payload = {'success': True, **payload, **page_info(total, 0, total)}
+        views[name] = encode_view(payload, f'{entry.grammar_id}-{name}', compress=VIEWS_GZIP)
+    entry.extras['views'] = views
+
+    return sum(view.size_bytes for view in views.values())
+
+
+def prepare_entry(entry):
+    """Hook de construcción del registro: métricas y vistas precalculadas"""
+    record_build(entry)
+    return prepare_views(entry)
+
+
+registry.prepare = prepare_entry
+
+
+def send_view(view):
+    """
+    Responde una vista serializada con ETag fuerte
+
+    Con If-None-Match igual al ETag responde 304 sin cuerpo; si el cliente
+    acepta gzip y hay versión comprimida, la envía tal cual.
+    """
+    response = Response(mimetype='application/json')
+    response.set_etag(view.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+
+    if request.if_none_match.contains(view.etag):
+        response.status_code = 304
+        if metrics.enabled:
+            view_responses.inc(result='not_modified')
+        return response
+
+    if metrics.enabled:
+        view_responses.inc(result='full')
+
+    if view.gzip_body is not None and 'gzip' in request.accept_encodings:
+        response.set_data(view.gzip_body)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response.set_data(view.plain_body())
+    return response
+
+
+def send_page(entry, name, payload):
+    """Responde una página calculada en el momento, con ETag para revalidar"""
+    return send_view(encode_view(payload, f'{entry.grammar_id}-{name}', compress=VIEWS_GZIP))
+
+
 @app.route('/api/get_states', methods=['GET'])
 def get_states():
-    """Obtiene información de todos los estados"""
+    """
+    Obtiene información de los estados
+
+    Query string opcional: start y limit (página de estados) y fields
+    (campos de cada item: production, left, right, lookahead).
+    """
     try:
-        if parser is None:
-            return jsonify({
-                'success': False,
-                'error': 'Parser no inicializado'
-            }), 400
-
-        states_info = []
-
-        for idx, state in enumerate(parser.states):
-            items = []
-            for item in sorted(state, key=lambda x: (x.production, x.dot_position, x.lookahead)):
-                prod = parser.grammar[item.production]
-                right = list(prod.right)
-                right.insert(item.dot_position, '•')
-
-                items.append({
-                    'production': item.production,
-                    'left': prod.left,
-                    'right': ' '.join(right),
-                    'lookahead': item.lookahead
-                })
-
-            states_info.append({
-                'id': idx,
-                'items': items
-            })
+        entry, error_response = lookup_entry()
+        if entry is None:
+            return error_response
+        parser = entry.parser
 
-        return jsonify({
+        views = entry.extras.get('views')
+        if views is not None and is_full_view_request():
+            return send_view(views['states'])
+
+        fields = parse_fields(request.args.get('fields'), STATE_ITEM_FIELDS)
+        start, end = request_page(len(parser.states))
+
+        return send_page(entry, 'states', {
             'success': True,
-            'states': states_info
+            'states': states_page(parser, start, end, fields),
+            **page_info(len(parser.states), start, end)
         })
 
     except Exception as e:
@@ -241,53 +654,31 @@ def get_states():
 
 @app.route('/api/get_parsing_table', methods=['GET'])
 def get_parsing_table():
-    """Obtiene la tabla de parsing ACTION/GOTO"""
+    """
+    Obtiene la tabla de parsing ACTION/GOTO
+
+    Query string opcional: start y limit (filas), sparse=1 (solo celdas no
+    vacías) y fields (action, goto).
+    """
     try:
-        if parser is None:
-            return jsonify({
-                'success': False,
-                'error': 'Parser no inicializado'
-            }), 400
-
-        # Obtener terminales y no terminales
-        terminals = sorted(list(parser.terminals))
-        non_terminals = sorted(list(parser.non_terminals))
-
-        # Construir tabla ACTION
-        action_table = {}
-        for state_idx in range(len(parser.states)):
-            action_table[state_idx] = {}
-            for terminal in terminals:
-                key = (state_idx, terminal)
-                if key in parser.action_table:
-                    action_table[state_idx][terminal] = parser.action_table[key]
-                else:
-                    action_table[state_idx][terminal] = ''
-
-        # Construir tabla GOTO
-        goto_table = {}
-        for state_idx in range(len(parser.states)):
-            goto_table[state_idx] = {}
-            for non_terminal in non_terminals:
-                # Excluir S' de la tabla GOTO (es símbolo aumentado)
-                if non_terminal == parser.augmented_start:
-                    continue
-                key = (state_idx, non_terminal)
-                if key in parser.goto_table:
-                    goto_table[state_idx][non_terminal] = parser.goto_table[key]
-                else:
-                    goto_table[state_idx][non_terminal] = ''
-
-        # Filtrar no terminales para no mostrar S'
-        non_terminals_filtered = [nt for nt in non_terminals if nt != parser.augmented_start]
+        entry, error_response = lookup_entry()
+        if entry is None:
+            return error_response
+        parser = entry.parser
 
-        return jsonify({
+        sparse = request.args.get('sparse', '0').lower() in ('1', 'true')
+
+        views = entry.extras.get('views')
+        if views is not None and is_full_view_request():
+            return send_view(views['parsing_table_sparse' if sparse else 'parsing_table'])
+
+        fields = parse_fields(request.args.get('fields'), TABLE_FIELDS)
+        start, end = request_page(len(parser.states))
+
+        return send_page(entry, 'parsing_table', {
             'success': True,
-            'terminals': terminals,
-            'non_terminals': non_terminals_filtered,
-            'action': action_table,
-            'goto': goto_table,
-            'num_states': len(parser.states)
+            **parsing_table_page(parser, get_table_rows(entry), start, end, sparse, fields),
+            **page_info(len(parser.states), start, end)
         })
 
     except Exception as e:
@@ -297,25 +688,78 @@ def get_parsing_table():
         }), 400
 
 
-@app.route('/download/<viz_type>')
-def download(viz_type):
-    """Descarga archivos generados"""
+# Formatos de exportación en streaming: (método del visualizador, tipo MIME)
+EXPORT_FORMATS = {
+    'dot': ('iter_dot', 'text/vnd.graphviz'),
+    'jsonl': ('iter_jsonl', 'application/x-ndjson')
+}
+
+
+@app.route('/api/export_automaton', methods=['GET'])
+def export_automaton():
+    """
+    Exporta el autómata (o una vista) en DOT o JSON lines, en streaming
+
+    Query string: grammar_id, format (dot o jsonl), view, center, radius.
+    La respuesta empieza a enviarse de inmediato y se genera estado por
+    estado, sin armar el grafo completo en memoria.
+    """
     try:
-        static_path = os.path.join(os.path.dirname(__file__), '../frontend/static')
-
-        if viz_type == 'graphviz-png':
-            file_path = os.path.join(static_path, 'automata_graphviz.png')
-            return send_file(file_path,
-                           as_attachment=True,
-                           download_name='automata_lr1_graphviz.png')
-        elif viz_type == 'graphviz-svg':
-            file_path = os.path.join(static_path, 'automata_graphviz.svg')
-            return send_file(file_path,
-                           as_attachment=True,
-                           download_name='automata_lr1_graphviz.svg')
-        else:
+        entry, error_response = lookup_entry()
+        if entry is None:
+            return error_response
+
+        output_format = request.args.get('format', 'dot')
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato no válido: {output_format}. Opciones: {', '.join(EXPORT_FORMATS)}")
+        method, mimetype = EXPORT_FORMATS[output_format]
+
+        center = request.args.get('center', type=int)
+        radius = request.args.get('radius', 1, type=int)
+        view = request.args.get('view', 'full')
+
+        # La vista se valida aquí; los errores posteriores ya no pueden cambiar el status
+        lines = getattr(get_visualizer(entry), method)(view, center, radius)
+
+        response = Response(stream_with_context(lines), mimetype=mimetype)
+        response.headers['Content-Disposition'] = \
+            f'attachment; filename=automata_{entry.grammar_id}_{view}.{output_format}'
+        return response
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@app.route('/metrics')
+def get_metrics():
+    """Métricas del servidor en formato de texto de Prometheus"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+
+@app.route('/download/<render_id>.<output_format>')
+def download(render_id, output_format):
+    """Descarga un renderizado del autómata (svg, png, pdf o dot) por su render_id"""
+    try:
+        if output_format not in MIME_TYPES:
             return "Tipo de archivo no válido", 400
 
+        data = render_cache.get(render_id, output_format, render_dot_source)
+        if data is None:
+            return "Visualización no encontrada. Vuelva a generarla.", 404
+
+        response = send_file(BytesIO(data),
+                             mimetype=MIME_TYPES[output_format],
+                             as_attachment=True,
+                             download_name=f'automata_{render_id}.{output_format}')
+
+        # El contenido de un render_id nunca cambia
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        response.set_etag(f'{render_id}.{output_format}')
+        return response.make_conditional(request)
+
     except Exception as e:
         return f"Error: {str(e)}", 500
 
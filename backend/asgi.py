@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Servidor ASGI para sesiones de análisis en streaming (WebSocket y HTTP chunked)
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Uso: uvicorn backend.asgi:app --port 5002
+"""
+
+import asyncio
+import codecs
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from parser.parse_session import ParseSession
+from backend.registry import ParserRegistry, RegistryEntry
+
+# Tiempo máximo (segundos) que una sesión HTTP puede quedar inactiva
+SESSION_TTL = 300
+
+# Parsers construidos, compartidos por todas las sesiones de la misma gramática
+registry = ParserRegistry()
+
+
+@dataclass
+class HttpSession:
+    """Sesión HTTP abierta"""
+    session: ParseSession
+    entry: RegistryEntry
+    last_used: float = field(default_factory=time.monotonic)
+    # Hay una petición de tokens en curso: una segunda responde 409 en vez
+    # de mezclar sus fragmentos con los de la primera
+    streaming: bool = False
+
+
+# Sesiones HTTP abiertas por id
+_sessions: Dict[str, HttpSession] = {}
+
+
+async def get_entry(grammar_text: str, parser_type: str = 'LR1') -> RegistryEntry:
+    """
+    Obtiene la entrada de una gramática desde el registro compartido
+
+    La construcción corre en un thread del executor para no bloquear el
+    event loop; el registro garantiza que peticiones concurrentes de la
+    misma gramática esperen una única construcción.
+    """
+    loop = asyncio.get_running_loop()
+    entry, _ = await loop.run_in_executor(None, registry.build, grammar_text, parser_type)
+    return entry
+
+
+def _purge_sessions():
+    """Elimina sesiones HTTP inactivas"""
+    now = time.monotonic()
+    for session_id, http_session in list(_sessions.items()):
+        if not http_session.streaming and now - http_session.last_used > SESSION_TTL:
+            del _sessions[session_id]
+
+
+# ---------------------------------------------------------------------------
+# Utilidades HTTP
+# ---------------------------------------------------------------------------
+
+_CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'GET, POST, DELETE, OPTIONS'),
+    (b'access-control-allow-headers', b'Content-Type'),
+]
+
+
+async def _read_body(receive) -> bytes:
+    """Lee el cuerpo completo de una petición HTTP"""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+async def _send_json(send, payload: Dict[str, Any], status: int = 200):
+    """Envía una respuesta JSON completa"""
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())] + _CORS_HEADERS
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _stream_tokens(session_id: str, finish: bool, receive, send):
+    """
+    Alimenta una sesión con el cuerpo chunked de la petición
+
+    Responde en NDJSON: un evento por cada chunk recibido, de modo que el
+    cliente ve el error en cuanto ocurre sin esperar el resto del cuerpo.
+    Un token puede quedar partido entre chunks de la misma petición, pero
+    el fin del cuerpo siempre cierra el último token: la petición siguiente
+    de la sesión empieza un token nuevo. Si el cliente se desconecta, el
+    fragmento pendiente se descarta. Un cuerpo que no es UTF-8 válido
+    cierra la sesión con un evento de error.
+    """
+    http_session = _sessions[session_id]
+    session = http_session.session
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    async def send_event(event: Dict[str, Any]):
+        await send({
+            'type': 'http.response.body',
+            'body': json.dumps(event).encode('utf-8') + b'\n',
+            'more_body': True
+        })
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'application/x-ndjson')] + _CORS_HEADERS
+    })
+
+    http_session.streaming = True
+    try:
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                session.drop_pending()
+                return
+            more_body = message.get('more_body', False)
+
+            if session.closed:
+                continue
+
+            try:
+                text = decoder.decode(message.get('body', b''), final=not more_body)
+            except UnicodeDecodeError as e:
+                await send_event(session.abort(f'Texto UTF-8 inválido: {e.reason}'))
+                continue
+
+            await send_event(session.feed_text(text, final=not more_body))
+
+        if finish and not session.closed:
+            await send_event(session.finish())
+
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        # Un parser perezoso pudo expandir estados: cuentan para la expulsión
+        registry.track_growth(http_session.entry)
+        http_session.streaming = False
+        http_session.last_used = time.monotonic()
+        if session.closed:
+            _sessions.pop(session_id, None)
+
+
+async def _handle_http(scope, receive, send):
+    """Enruta las peticiones HTTP"""
+    method = scope['method']
+    path = scope['path'].rstrip('/')
+    query = parse_qs(scope.get('query_string', b'').decode())
+
+    if method == 'OPTIONS':
+        await send({'type': 'http.response.start', 'status': 204, 'headers': _CORS_HEADERS})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    if path == '' and method == 'GET':
+        await _send_json(send, {
+            'message': 'LR(1) Parser API - Sesiones de análisis en streaming',
+            'endpoints': {
+                'open_session': 'POST /api/sessions',
+                'stream_tokens': 'POST /api/sessions/<id>/tokens?end=1',
+                'close_session': 'DELETE /api/sessions/<id>',
+                'websocket': '/ws/parse'
+            }
+        })
+        return
+
+    parts = path.split('/')
+
+    # POST /api/sessions
+    if parts[1:] == ['api', 'sessions'] and method == 'POST':
+        try:
+            data = json.loads(await _read_body(receive) or b'{}')
+            entry = await get_entry(data['grammar'], data.get('parser_type', 'LR1'))
+        except Exception as e:
+            await _send_json(send, {'success': False, 'error': str(e)}, 400)
+            return
+
+        _purge_sessions()
+        session_id = uuid.uuid4().hex
+        _sessions[session_id] = HttpSession(ParseSession(entry.parser), entry)
+        await _send_json(send, {'success': True, 'session_id': session_id})
+        return
+
+    if len(parts) >= 4 and parts[1:3] == ['api', 'sessions']:
+        session_id = parts[3]
+        if session_id not in _sessions:
+            await _send_json(send, {'success': False, 'error': 'Sesión no encontrada'}, 404)
+            return
+        if _sessions[session_id].streaming:
+            await _send_json(send, {'success': False,
+                                    'error': 'La sesión ya está recibiendo tokens en otra petición'}, 409)
+            return
+
+        # POST /api/sessions/<id>/tokens
+        if parts[4:] == ['tokens'] and method == 'POST':
+            finish = query.get('end', ['0'])[0] in ('1', 'true')
+            await _stream_tokens(session_id, finish, receive, send)
+            return
+
+        # DELETE /api/sessions/<id>
+        if len(parts) == 4 and method == 'DELETE':
+            http_session = _sessions.pop(session_id)
+            await _send_json(send, {'success': True, 'result': http_session.session.status()})
+            return
+
+    await _send_json(send, {'success': False, 'error': 'Ruta no encontrada'}, 404)
+
+
+# ---------------------------------------------------------------------------
+# WebSocket
+# ---------------------------------------------------------------------------
+
+async def _handle_websocket(scope, receive, send):
+    """
+    Sesión de análisis sobre WebSocket
+
+    Protocolo (mensajes JSON):
+        cliente -> {"grammar": "...", "parser_type": "LR1"}   abre la sesión
+        cliente -> {"tokens": "id + id"}                      envía un chunk
+                                                              (un token puede seguir
+                                                              en el mensaje siguiente)
+        cliente -> {"tokens": ["id", "+"]}                    envía tokens completos
+        cliente -> {"end": true}                              fin de entrada
+        servidor -> {"event": "ready" | "progress" | "accept" | "error", ...}
+    """
+    session: Optional[ParseSession] = None
+    entry: Optional[RegistryEntry] = None
+
+    while True:
+        message = await receive()
+
+        if message['type'] == 'websocket.connect':
+            await send({'type': 'websocket.accept'})
+            continue
+
+        if message['type'] == 'websocket.disconnect':
+            return
+
+        try:
+            data = json.loads(message.get('text') or message.get('bytes') or b'{}')
+
+            if session is None:
+                entry = await get_entry(data['grammar'], data.get('parser_type', 'LR1'))
+                session = ParseSession(entry.parser)
+                event = {'event': 'ready'}
+            elif 'tokens' in data:
+                tokens = data['tokens']
+                if isinstance(tokens, str):
+                    event = session.feed_text(tokens)
+                else:
+                    event = session.feed(tokens)
+                if data.get('end'):
+                    event = session.finish()
+                registry.track_growth(entry)
+            elif data.get('end'):
+                event = session.finish()
+            else:
+                event = {'event': 'error', 'error': 'Mensaje no reconocido'}
+        except Exception as e:
+            event = {'event': 'error', 'error': str(e)}
+
+        await send({'type': 'websocket.send', 'text': json.dumps(event)})
+
+        if session is not None and session.closed:
+            await send({'type': 'websocket.close', 'code': 1000})
+            return
+
+
+async def app(scope, receive, send):
+    """Aplicación ASGI"""
+    if scope['type'] == 'http':
+        await _handle_http(scope, receive, send)
+    elif scope['type'] == 'websocket':
+        await _handle_websocket(scope, receive, send)
+    elif scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Construcción de parsers en segundo plano con reporte de progreso
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from parser.budget import BudgetExceeded
+from backend.registry import BuildCancelled, ParserRegistry, normalize_parser_type
+
+
+@dataclass
+class BuildJob:
+    """Estado de una construcción en segundo plano"""
+    job_id: str
+    grammar_text: str
+    parser_type: str
+    status: str = 'queued'  # queued, running, done, failed, cancelled
+    phase: str = ''
+    progress: Dict[str, Any] = field(default_factory=dict)
+    grammar_id: Optional[str] = None
+    error: Optional[str] = None
+    budget_exceeded: Optional[Dict[str, Any]] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    # Protege la decisión final (done/cancelled) frente a cancel()
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación serializable del trabajo"""
+        end = self.finished_at or time.time()
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'parser_type': self.parser_type,
+            'phase': self.phase,
+            'progress': dict(self.progress),
+            'grammar_id': self.grammar_id,
+            'error': self.error,
+            'budget_exceeded': self.budget_exceeded,
+            'elapsed': round(end - self.started_at, 3) if self.started_at else 0.0
+        }
+
+
+class BuildJobManager:
+    """
+    Ejecuta construcciones de parsers en un pool de workers
+
+    Cada trabajo reporta su fase y progreso a través del callback del parser.
+    El resultado queda en el registro de parsers y el trabajo guarda su
+    grammar_id. Si la misma gramática ya se está construyendo (otro trabajo
+    o una petición síncrona), el trabajo se suma a esa construcción: recibe
+    su progreso y cancelarlo solo deja de esperarla (ver ParserRegistry.build).
+
+    Los trabajos viven en la memoria del proceso: con varios workers de
+    gunicorn, consultar un job_id en un worker distinto del que lo creó
+    responde 404. Para usar trabajos en segundo plano hay que levantar un
+    solo worker (con threads) o fijar las peticiones de un cliente a un worker.
+    """
+
+    def __init__(self, registry: ParserRegistry, max_workers: int = 2, max_jobs: int = 200):
+        self.registry = registry
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='build-job')
+        self._jobs: 'OrderedDict[str, BuildJob]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, grammar_text: str, parser_type: str = 'LR1') -> BuildJob:
+        """Encola la construcción de una gramática y retorna el trabajo"""
+        job = BuildJob(
+            job_id=uuid.uuid4().hex,
+            grammar_text=grammar_text,
+            parser_type=normalize_parser_type(parser_type)
+        )
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._discard_old_jobs()
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[BuildJob]:
+        """Retorna un trabajo por su id (o None)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Solicita la cancelación de un trabajo
+
+        La cancelación es cooperativa: el parser la detecta en el siguiente
+        reporte de progreso (o deja de esperar la construcción compartida).
+        Un trabajo cancelado termina siempre como 'cancelled'.
+
+        Returns:
+            False si el trabajo no existe o ya tiene su resultado
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        with job.lock:
+            if job.finished:
+                return False
+            job.cancel_event.set()
+            return True
+
+    def active_count(self) -> int:
+        """Número de trabajos en cola o en ejecución"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def _run(self, job: BuildJob):
+        """Ejecuta un trabajo en un thread del pool"""
+        if job.cancel_event.is_set():
+            self._finish(job, 'cancelled')
+            return
+
+        job.status = 'running'
+        job.started_at = time.time()
+
+        def on_progress(phase: str, data: Dict[str, Any]):
+            job.phase = phase
+            job.progress = data
+
+        try:
+            entry, _ = self.registry.build(job.grammar_text, job.parser_type,
+                                           progress_callback=on_progress,
+                                           cancelled=job.cancel_event.is_set)
+        except BuildCancelled:
+            self._finish(job, 'cancelled')
+        except BudgetExceeded as e:
+            job.error = str(e)
+            job.budget_exceeded = e.to_dict()
+            self._finish(job, 'failed')
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            self._finish(job, 'failed')
+        else:
+            job.grammar_id = entry.grammar_id
+            self._finish(job, 'done')
+
+    def _finish(self, job: BuildJob, status: str):
+        """Fija el estado final; una cancelación aceptada por cancel() siempre gana"""
+        with job.lock:
+            if status == 'done' and job.cancel_event.is_set():
+                status = 'cancelled'
+            if status == 'done':
+                job.phase = 'done'
+            job.status = status
+            job.finished_at = time.time()
+
+    def _discard_old_jobs(self):
+        """Olvida los trabajos terminados más antiguos (requiere el lock)"""
+        while len(self._jobs) > self.max_jobs:
+            for job_id, job in self._jobs.items():
+                if job.finished:
+                    del self._jobs[job_id]
+                    break
+            else:
+                return
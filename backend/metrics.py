@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Métricas del servidor en formato de texto de Prometheus
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Implementación mínima sin dependencias (no requiere prometheus_client).
+Registrar un evento cuesta un lock y un bisect sobre los límites de los
+buckets; el texto solo se arma cuando alguien consulta /metrics, y las
+métricas que ya existen en otros objetos (cachés, trabajos en curso) se
+leen en ese momento mediante colectores, sin costo entre consultas.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Límites de los buckets (en segundos salvo que se indique otra cosa)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUILD_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000)
+STEPS_BUCKETS = (10, 50, 100, 250, 500, 1000, 5000, 10000)
+THROUGHPUT_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 5e6)
+
+# Valores de una muestra: (etiquetas, valor)
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    """Escapa un valor de etiqueta según el formato de texto"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Etiquetas como '{a="x",b="y"}' ('' si no hay)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Número en el formato de Prometheus (enteros sin decimales, +Inf)"""
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Contador monótono, opcionalmente separado por etiquetas"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        """Suma amount al contador de las etiquetas dadas"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in values]
+
+
+class Histogram:
+    """
+    Histograma con buckets fijos
+
+    Cada serie (combinación de etiquetas) guarda la cuenta por bucket sin
+    acumular; la acumulación que exige el formato se hace al exportar.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Serie -> [cuentas por bucket (+Inf al final), suma, cantidad]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Registra una observación"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            series = [(key, list(counts), total, count)
+                      for key, (counts, total, count) in self._series.items()]
+
+        samples = []
+        for key, counts, total, count in series:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append((self.name + '_bucket', {**labels, 'le': _format_value(bound)}, cumulative))
+            samples.append((self.name + '_sum', labels, total))
+            samples.append((self.name + '_count', labels, count))
+        return samples
+
+
+class CollectedMetric:
+    """Métrica cuyos valores se leen de otro objeto solo al exportar"""
+
+    def __init__(self, name: str, documentation: str, kind: str,
+                 collect: Callable[[], Iterable[Sample]]):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [(self.name, labels, value) for labels, value in self.collect()]
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas exportadas en /metrics
+
+    Con enabled=False los contadores e histogramas siguen existiendo pero
+    los hooks de la aplicación no los alimentan (ver app.py), y render()
+    solo incluye las métricas recolectadas.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: List = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def collected(self, name: str, documentation: str, collect: Callable[[], Iterable[Sample]],
+                  kind: str = 'gauge') -> CollectedMetric:
+        return self._add(CollectedMetric(name, documentation, kind, collect))
+
+    def render(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def _add(self, metric):
+        if any(existing.name == metric.name for existing in self._metrics):
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics.append(metric)
+        return metric
+
+
+def hit_ratio(stats: Dict[str, int]) -> float:
+    """Proporción de aciertos de una caché (0 si todavía no hubo consultas)"""
+    total = stats['hits'] + stats['misses']
+    return stats['hits'] / total if total else 0.0
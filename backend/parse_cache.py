@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Caché de resultados de /api/parse_string por gramática y entrada
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.registry import ParserRegistry, RegistryEntry
+from backend.views import EncodedView, encode_view
+
+
+class ParseResultCache:
+    """
+    Respuestas de /api/parse_string memoizadas por (grammar_id, tokens, traza)
+
+    El grammar_id ya es el hash de la gramática canónica y del tipo de
+    parser. Los resultados se guardan serializados (y comprimidos si son
+    grandes) dentro de la entrada del registro de su gramática, en
+    entry.extras['parse_results'], y sus bytes se suman al tamaño de la
+    entrada: comparten el presupuesto de memoria del registro y desaparecen
+    con ella. Editar la gramática cambia el grammar_id, así que los
+    resultados viejos nunca se reutilizan.
+    """
+
+    def __init__(self, registry: ParserRegistry, max_results: int = 256,
+                 max_result_bytes: int = 256 * 1024):
+        """
+        Args:
+            registry: Registro cuyas entradas guardan los resultados
+            max_results: Resultados por gramática (LRU); 0 desactiva la caché
+            max_result_bytes: Los resultados más grandes no se guardan
+        """
+        self.registry = registry
+        self.max_results = max_results
+        self.max_result_bytes = max_result_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(input_string: str, trace: bool) -> Tuple[str, bool]:
+        """Entrada normalizada: los tokens separados por un espacio (como parse_string)"""
+        return ' '.join(input_string.split()), trace
+
+    def get_or_parse(self, entry: RegistryEntry, input_string: str, trace: bool,
+                     parse: Callable[[], Dict[str, Any]]) -> Tuple[EncodedView, bool]:
+        """
+        Retorna la respuesta guardada o la calcula con parse y la guarda
+
+        Args:
+            entry: Entrada del registro con el parser
+            input_string: Cadena a analizar
+            trace: Si la respuesta incluye la traza
+            parse: Calcula la respuesta (se llama fuera del lock)
+
+        Returns:
+            Tupla (respuesta serializada, cached)
+        """
+        key = self.key(input_string, trace)
+
+        with self._lock:
+            results = entry.extras.get('parse_results')
+            view = results.get(key) if results is not None else None
+            if view is not None:
+                results.move_to_end(key)
+                self.hits += 1
+                return view, True
+            self.misses += 1
+
+        view = encode_view(parse(), f'{entry.grammar_id}-parse', keep_plain=False)
+        if self.max_results > 0 and view.size_bytes <= self.max_result_bytes:
+            self._store(entry, key, view)
+        return view, False
+
+    def _store(self, entry: RegistryEntry, key: Tuple[str, bool], view: EncodedView):
+        """Guarda un resultado en la entrada y ajusta los bytes del registro"""
+        with self._lock:
+            results = entry.extras.setdefault('parse_results', OrderedDict())
+            if key in results:
+                return
+            results[key] = view
+            delta = view.size_bytes
+            while len(results) > self.max_results:
+                _, evicted = results.popitem(last=False)
+                delta -= evicted.size_bytes
+
+        # Si la entrada ya fue expulsada no se cuenta nada: sus resultados se van con ella
+        self.registry.charge(entry, delta)
+
+    def stats(self) -> Dict[str, int]:
+        """Aciertos y fallos (los bytes se cuentan en el registro)"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses
+            }
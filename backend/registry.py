@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Registro de parsers construidos con caché LRU por gramática
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import glob
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.lr0_parser import LR0Parser, SLR1Parser
+from parser.lazy_lr1_parser import LazyLR1Parser
+from parser.auto_parser import build_cheapest_parser
+from parser.state_store import KernelStates
+from parser.shared_tables import SharedTables, write_tables
+from parser.budget import BuildBudget, BudgetExceeded
+
+# Estimación aproximada de memoria (medida con tracemalloc sobre gramáticas de ejemplo)
+_BYTES_PER_ITEM = 250
+_BYTES_PER_ENTRY = 200
+
+# Forma de un grammar_id (ver grammar_id()): lo que no coincida nunca llega al disco
+_GRAMMAR_ID_RE = re.compile(r'[0-9a-f]{16}')
+
+# Archivos temporales de tablas compartidas más viejos que esto quedaron de
+# una escritura interrumpida
+_SHARED_TEMP_MAX_AGE = 3600
+
+# Cada cuánto revisa su cancelación quien espera una construcción ajena
+_CANCEL_POLL_SECONDS = 0.05
+
+
+# Clases de parser por tipo normalizado ('AUTO' elige la más barata sin conflictos)
+PARSER_CLASSES = {
+    'LR0': LR0Parser,
+    'SLR1': SLR1Parser,
+    'LALR1': LALR1Parser,
+    'LR1': LR1Parser,
+    'LR1LAZY': LazyLR1Parser,
+}
+
+
+def normalize_parser_type(parser_type: str) -> str:
+    """Normaliza el tipo de parser recibido por la API ('LALR(1)' -> 'LALR1', 'LR1-lazy' -> 'LR1LAZY')"""
+    normalized = ''.join(c for c in parser_type.upper() if c not in '()-_ ')
+    if normalized in PARSER_CLASSES or normalized == 'AUTO':
+        return normalized
+    return 'LR1'
+
+
+def create_parser(parser_type: str) -> LR1Parser:
+    """Crea una instancia vacía del parser del tipo indicado"""
+    return PARSER_CLASSES.get(normalize_parser_type(parser_type), LR1Parser)()
+
+
+def parser_class_type(parser: LR1Parser) -> str:
+    """Tipo normalizado de la clase de un parser (el que eligió AUTO o el fallback)"""
+    for parser_type, parser_class in PARSER_CLASSES.items():
+        if type(parser) is parser_class:
+            return parser_type
+    return 'LR1'
+
+
+def canonical_grammar(grammar_text: str) -> str:
+    """
+    Forma canónica del texto de una gramática
+
+    Ignora comentarios, líneas vacías y diferencias de espacios, de modo que
+    dos textos que producen la misma gramática tienen el mismo hash.
+    """
+    lines = []
+    for line in grammar_text.strip().split('\n'):
+        line = line.strip()
+        if not line or line.startswith('#') or '->' not in line:
+            continue
+
+        left, right = line.split('->', 1)
+        alternatives = [' '.join(alt.split()) or 'ε' for alt in right.split('|')]
+        alternatives = ['ε' if alt == 'epsilon' else alt for alt in alternatives]
+        lines.append(f"{left.strip()} -> {' | '.join(alternatives)}")
+
+    return '\n'.join(lines)
+
+
+def grammar_id(grammar_text: str, parser_type: str) -> str:
+    """Identificador de una gramática: hash de su forma canónica y del tipo de parser"""
+    key = normalize_parser_type(parser_type) + '\n' + canonical_grammar(grammar_text)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def stored_items(states) -> int:
+    """Items guardados en una lista de estados (solo los kernels si está compactada)"""
+    if isinstance(states, KernelStates):
+        return states.item_count()
+    return sum(len(state) for state in states)
+
+
+def estimate_parser_bytes(parser: LR1Parser) -> int:
+    """Estima la memoria ocupada por un parser construido"""
+    # LALR(1) con keep_canonical conserva además el autómata LR(1) canónico
+    items = sum(stored_items(states) for states in (parser.states, getattr(parser, 'lr1_states', [])))
+    # Las tablas compartidas entre procesos (parser/shared_tables.py) no ocupan
+    # memoria propia del proceso
+    tables = (parser.transitions, parser.action_table, parser.goto_table,
+              getattr(parser, 'lr1_transitions', {}))
+    entries = sum(len(table) for table in tables if isinstance(table, dict))
+    # LazyLR1Parser guarda además el kernel de cada estado descubierto y su índice
+    if parser.lazy:
+        items += parser.kernel_items
+        entries += len(parser.states)
+    return items * _BYTES_PER_ITEM + entries * _BYTES_PER_ENTRY
+
+
+class BuildCancelled(Exception):
+    """Se cancela una construcción (o la espera de una) a pedido de quien la solicitó"""
+
+    def __init__(self, message: str = 'Construcción cancelada'):
+        super().__init__(message)
+
+
+@dataclass
+class _InFlight:
+    """Construcción en curso compartida por todos los que pidieron la misma gramática"""
+    future: Future = field(default_factory=Future)
+    # Callbacks de progreso y verificaciones de cancelación de cada interesado
+    # (None = no se puede cancelar, por ejemplo una petición síncrona)
+    callbacks: List[Callable[[str, Dict[str, Any]], None]] = field(default_factory=list)
+    cancel_checks: List[Optional[Callable[[], bool]]] = field(default_factory=list)
+    last_progress: Optional[Tuple[str, Dict[str, Any]]] = None
+
+
+@dataclass
+class RegistryEntry:
+    """Parser construido junto con sus datos asociados"""
+    grammar_id: str
+    parser_type: str
+    parser: LR1Parser
+    num_states: int
+    size_bytes: int
+    # Parte de size_bytes que corresponde al parser (el resto son extras)
+    parser_bytes: int = 0
+    visualizer: Optional[Any] = None  # Se crea bajo demanda
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+
+class ParserRegistry:
+    """
+    Caché LRU de parsers indexada por grammar_id
+
+    La expulsión considera el tamaño de cada entrada: se eliminan las menos
+    usadas recientemente hasta respetar el máximo de entradas, de estados y
+    de bytes estimados. Es segura entre threads y una misma gramática
+    pedida en paralelo se construye una sola vez: todos los que la piden
+    reciben su progreso y cada uno puede cancelar solo su propia espera; la
+    construcción se aborta únicamente cuando todos la cancelaron.
+
+    Cada construcción respeta el BuildBudget del registro. Si se excede y
+    fallback está activo, se reintenta con LALR(1) directo (autómata del
+    tamaño del LR(0)) antes de reportar el error.
+
+    BuildBudget.max_memory_bytes se compara con la memoria residente del
+    proceso, que también crece con cualquier otra construcción en curso;
+    para que una gramática no exceda su límite por culpa de otra, cuando el
+    presupuesto lo tiene las construcciones del registro se ejecutan de a
+    una (con el GIL tampoco correrían en paralelo). Las demás asignaciones
+    del proceso (peticiones, vistas) sí cuentan.
+
+    Con kernel_only los parsers guardan solo el kernel de cada estado y
+    recalculan las clausuras al mostrarlas (ver parser/state_store.py).
+
+    Con keep_canonical los parsers LALR(1) conservan el autómata LR(1)
+    previo a la fusión, para que build(previous=...) reutilice sus estados;
+    sin él ocupan la mitad y la reconstrucción reutiliza solo FIRST/FOLLOW.
+
+    Con shared_dir las tablas de cada parser construido se publican en ese
+    directorio (un archivo por grammar_id) y el parser pasa a leerlas de ahí;
+    otros procesos con el mismo shared_dir (los workers de gunicorn) las
+    mapean en modo solo lectura en vez de construir la gramática de nuevo,
+    también al buscar un grammar_id que no está en su propio registro. El
+    directorio se limita a shared_max_bytes: al publicar se borran los
+    archivos usados hace más tiempo (cargar uno actualiza su fecha). Los
+    procesos que ya lo tenían mapeado lo siguen usando.
+
+    Si se indica prepare, se llama con cada entrada recién construida o
+    cargada de shared_dir (en el mismo thread, antes de publicarla) para precalcular
+    datos derivados en entry.extras; retorna los bytes adicionales que esos
+    datos ocupan, que cuentan para la expulsión.
+    """
+
+    def __init__(self, max_entries: int = 32, max_states: int = 50000,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 budget: Optional[BuildBudget] = None, fallback: bool = True,
+                 prepare: Optional[Callable[[RegistryEntry], int]] = None,
+                 kernel_only: bool = False, shared_dir: Optional[str] = None,
+                 shared_max_bytes: int = 256 * 1024 * 1024, keep_canonical: bool = False):
+        self.max_entries = max_entries
+        self.max_states = max_states
+        self.max_bytes = max_bytes
+        self.budget = budget
+        self.fallback = fallback
+        self.prepare = prepare
+        self.kernel_only = kernel_only
+        self.keep_canonical = keep_canonical
+        self.shared_dir = shared_dir
+        self.shared_max_bytes = shared_max_bytes
+        if shared_dir is not None:
+            os.makedirs(shared_dir, exist_ok=True)
+
+        self._entries: 'OrderedDict[str, RegistryEntry]' = OrderedDict()
+        self._building: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        # Turno de las construcciones con límite de memoria (ver _build_slot)
+        self._memory_slot = threading.Lock()
+
+        self.total_states = 0
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, grammar_id: str) -> Optional[RegistryEntry]:
+        """
+        Retorna la entrada de una gramática ya construida (o None)
+
+        Si no está en el registro pero otro proceso publicó sus tablas en
+        shared_dir, se cargan de ahí.
+        """
+        with self._lock:
+            entry = self._entries.get(grammar_id)
+            if entry is not None:
+                self._entries.move_to_end(grammar_id)
+                return entry
+
+        entry = self._attach(grammar_id)
+        if entry is None:
+            return None
+        if self.prepare is not None:
+            entry.size_bytes += self.prepare(entry) or 0
+
+        with self._lock:
+            # Otro thread pudo cargarla o construirla mientras tanto
+            existing = self._entries.get(grammar_id)
+            if existing is not None:
+                self._entries.move_to_end(grammar_id)
+                return existing
+            self._insert(entry)
+        return entry
+
+    def build(self, grammar_text: str, parser_type: str = 'LR1',
+              progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+              fallback: Optional[bool] = None,
+              previous: Optional[LR1Parser] = None,
+              cancelled: Optional[Callable[[], bool]] = None) -> Tuple[RegistryEntry, bool]:
+        """
+        Obtiene el parser de una gramática, construyéndolo si no está en caché
+
+        Args:
+            grammar_text: Texto de la gramática
+            parser_type: 'LR0', 'SLR1', 'LALR1', 'LR1', 'LR1LAZY' o 'AUTO'
+            progress_callback: Recibe (fase, datos) de la construcción, también
+                si la está haciendo otro thread; no debe lanzar excepciones
+            fallback: Reemplaza la configuración de fallback del registro
+            previous: Parser de una versión anterior de la gramática; si hay
+                que construir, se reconstruye incrementalmente a partir de él
+            cancelled: Retorna True cuando quien llama ya no quiere el resultado
+
+        Returns:
+            Tupla (entrada, cached) donde cached indica si ya estaba construido
+
+        Raises:
+            BuildCancelled: Si cancelled() pasó a True antes de tener el
+                resultado. La construcción compartida solo se aborta si
+                todos los que la esperan la cancelaron; si no, termina y
+                queda en el registro para los demás.
+        """
+        parser_type = normalize_parser_type(parser_type)
+        key = grammar_id(grammar_text, parser_type)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry, True
+
+            self.misses += 1
+            inflight = self._building.get(key)
+            owner = inflight is None
+            if owner:
+                inflight = _InFlight()
+                self._building[key] = inflight
+            if progress_callback is not None:
+                inflight.callbacks.append(progress_callback)
+            inflight.cancel_checks.append(cancelled)
+            last_progress = inflight.last_progress
+
+        # Otro thread ya está construyendo la misma gramática
+        if not owner:
+            if last_progress is not None and progress_callback is not None:
+                progress_callback(*last_progress)
+            return self._wait(inflight, cancelled), True
+
+        def report(phase: str, data: Dict[str, Any]):
+            with self._lock:
+                inflight.last_progress = (phase, data)
+                callbacks = list(inflight.callbacks)
+                abort = all(check is not None and check() for check in inflight.cancel_checks)
+                if abort:
+                    # Quien pida la gramática desde ahora inicia otra construcción
+                    self._release(key, inflight)
+            if abort:
+                raise BuildCancelled()
+            for callback in callbacks:
+                callback(phase, data)
+
+        try:
+            if fallback is None:
+                fallback = self.fallback
+            entry = self._attach(key)
+            if entry is None:
+                with self._build_slot(report):
+                    entry = self._construct(key, grammar_text, parser_type, report, fallback, previous)
+                self._share(entry, grammar_text)
+            if self.prepare is not None:
+                entry.size_bytes += self.prepare(entry) or 0
+        except BaseException as e:
+            with self._lock:
+                self._release(key, inflight)
+            inflight.future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._release(key, inflight)
+            self._insert(entry)
+        inflight.future.set_result(entry)
+
+        # Los demás ya tienen el resultado; quien lo canceló no lo quiere
+        if cancelled is not None and cancelled():
+            raise BuildCancelled()
+        return entry, False
+
+    def _wait(self, inflight: _InFlight, cancelled: Optional[Callable[[], bool]]) -> RegistryEntry:
+        """Espera la construcción de otro thread (dejando de esperar si se cancela)"""
+        if cancelled is None:
+            return inflight.future.result()
+        while True:
+            try:
+                return inflight.future.result(timeout=_CANCEL_POLL_SECONDS)
+            except FutureTimeout:
+                if cancelled():
+                    raise BuildCancelled()
+
+    def _release(self, key: str, inflight: _InFlight):
+        """Quita una construcción en curso, si todavía es la registrada (requiere el lock)"""
+        if self._building.get(key) is inflight:
+            del self._building[key]
+
+    @contextmanager
+    def _build_slot(self, report: Callable[[str, Dict[str, Any]], None]):
+        """
+        Turno para construir: exclusivo si el presupuesto limita la memoria
+
+        Mientras espera reporta la fase 'queued', lo que permite cancelar la
+        espera (report lanza BuildCancelled si todos los interesados cancelaron).
+        """
+        if self.budget is None or self.budget.max_memory_bytes is None:
+            yield
+            return
+
+        while not self._memory_slot.acquire(timeout=_CANCEL_POLL_SECONDS):
+            report('queued', {})
+        try:
+            yield
+        finally:
+            self._memory_slot.release()
+
+    def _construct(self, key: str, grammar_text: str, parser_type: str,
+                   progress_callback, fallback: bool, previous: Optional[LR1Parser] = None) -> RegistryEntry:
+        """Construye el parser respetando el presupuesto (con fallback opcional)"""
+        def configure(candidate: LR1Parser):
+            candidate.budget = self.budget
+            candidate.progress_callback = progress_callback
+            candidate.kernel_only = self.kernel_only
+            if isinstance(candidate, LALR1Parser):
+                candidate.keep_canonical = self.keep_canonical
+
+        fallback_info = None
+        auto_info = None
+
+        try:
+            if parser_type == 'AUTO':
+                parser, auto_info = build_cheapest_parser(grammar_text, configure, previous)
+            else:
+                parser = create_parser(parser_type)
+                configure(parser)
+                parser.parse_grammar(grammar_text, previous=previous)
+        except BudgetExceeded as e:
+            if not fallback:
+                raise
+            fallback_info = {'from': parser_type, 'to': 'LALR1', 'reason': e.to_dict()}
+
+            parser = LALR1Parser(direct=True)
+            configure(parser)
+            parser.parse_grammar(grammar_text)
+
+        parser.progress_callback = None
+        parser_bytes = estimate_parser_bytes(parser)
+        entry = RegistryEntry(
+            grammar_id=key,
+            parser_type=parser_type,
+            parser=parser,
+            num_states=len(parser.states),
+            size_bytes=parser_bytes,
+            parser_bytes=parser_bytes
+        )
+        if fallback_info is not None:
+            entry.extras['fallback'] = fallback_info
+        if auto_info is not None:
+            entry.extras['auto'] = auto_info
+        return entry
+
+    def _shared_path(self, key: str) -> Optional[str]:
+        """
+        Archivo de tablas compartidas de una gramática
+
+        Returns:
+            None sin shared_dir o si key no es un grammar_id (llega desde la
+            petición y no debe poder salir del directorio)
+        """
+        if self.shared_dir is None or not _GRAMMAR_ID_RE.fullmatch(key):
+            return None
+        return os.path.join(self.shared_dir, f'{key}.tables')
+
+    def _share(self, entry: RegistryEntry, grammar_text: str):
+        """Publica las tablas de un parser recién construido y las usa desde el archivo"""
+        path = self._shared_path(entry.grammar_id)
+        # Las tablas del parser perezoso crecen al analizar
+        if path is None or entry.parser.lazy or not isinstance(grammar_text, str):
+            return
+
+        header = {
+            'grammar_id': entry.grammar_id,
+            'grammar': grammar_text,
+            'registry_type': entry.parser_type,
+            'parser_type': parser_class_type(entry.parser),
+            'extras': {name: entry.extras[name] for name in ('fallback', 'auto') if name in entry.extras}
+        }
+        try:
+            write_tables(entry.parser, path, header)
+            tables = SharedTables(path)
+        except (OSError, ValueError) as e:
+            # Compartir es una optimización: sin el archivo el parser usa sus propias tablas
+            entry.extras['shared'] = {'error': str(e)}
+            return
+
+        tables.install(entry.parser)
+        entry.size_bytes = entry.parser_bytes = estimate_parser_bytes(entry.parser)
+        entry.extras['shared'] = {'bytes': tables.size_bytes, 'attached': False}
+        self._prune_shared(keep=path)
+
+    def _prune_shared(self, keep: str):
+        """Borra los archivos compartidos usados hace más tiempo hasta respetar shared_max_bytes"""
+        now = time.time()
+        files = []
+        for path in glob.glob(os.path.join(self.shared_dir, '*')):
+            try:
+                stat = os.stat(path)
+                if path.endswith('.tables'):
+                    files.append((stat.st_mtime, stat.st_size, path))
+                elif path.endswith('.tmp') and now - stat.st_mtime > _SHARED_TEMP_MAX_AGE:
+                    os.remove(path)
+            except OSError:
+                # Otro proceso lo borró o reemplazó mientras tanto
+                continue
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.shared_max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def _attach(self, key: str) -> Optional[RegistryEntry]:
+        """Carga una gramática desde las tablas que publicó otro proceso (o None)"""
+        path = self._shared_path(key)
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            tables = SharedTables(path)
+            header = tables.header
+            if header['grammar_id'] != key:
+                return None
+            parser = create_parser(header['parser_type'])
+            parser.load_shared(header['grammar'], tables)
+            # La fecha marca el último uso para _prune_shared
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            # Archivo de otra versión, de otra gramática o borrado: se construye de nuevo
+            return None
+
+        parser_bytes = estimate_parser_bytes(parser)
+        entry = RegistryEntry(
+            grammar_id=key,
+            parser_type=header['registry_type'],
+            parser=parser,
+            num_states=len(parser.states),
+            size_bytes=parser_bytes,
+            parser_bytes=parser_bytes
+        )
+        entry.extras.update(header['extras'])
+        entry.extras['shared'] = {'bytes': tables.size_bytes, 'attached': True}
+        return entry
+
+    def _insert(self, entry: RegistryEntry):
+        """Inserta una entrada y expulsa las menos usadas (requiere el lock)"""
+        self._entries[entry.grammar_id] = entry
+        self.total_states += entry.num_states
+        self.total_bytes += entry.size_bytes
+        self._evict()
+
+    def charge(self, entry: RegistryEntry, size_bytes: int) -> bool:
+        """
+        Suma (o resta) bytes de datos que una entrada ya publicada guarda en
+        entry.extras, para que cuenten en la expulsión
+
+        Returns:
+            False si la entrada ya no está en el registro (no se cuenta nada)
+        """
+        with self._lock:
+            if self._entries.get(entry.grammar_id) is not entry:
+                return False
+            entry.size_bytes += size_bytes
+            self.total_bytes += size_bytes
+            self._evict()
+            return True
+
+    def track_growth(self, entry: RegistryEntry) -> bool:
+        """
+        Vuelve a estimar el parser de una entrada perezosa
+
+        LazyLR1Parser agrega clausuras, kernels y filas de la tabla con cada
+        análisis; la diferencia de estados y bytes respecto de la estimación
+        anterior se suma a la entrada para que cuente en la expulsión.
+
+        Returns:
+            False si el parser no es perezoso o la entrada ya no está en el registro
+        """
+        parser = entry.parser
+        if not parser.lazy:
+            return False
+        num_states = len(parser.states)
+        parser_bytes = estimate_parser_bytes(parser)
+
+        with self._lock:
+            if self._entries.get(entry.grammar_id) is not entry:
+                return False
+            delta_bytes = parser_bytes - entry.parser_bytes
+            self.total_states += num_states - entry.num_states
+            self.total_bytes += delta_bytes
+            entry.num_states = num_states
+            entry.parser_bytes = parser_bytes
+            entry.size_bytes += delta_bytes
+            self._evict()
+            return True
+
+    def _evict(self):
+        """Expulsa las entradas menos usadas hasta respetar los límites (requiere el lock)"""
+        # Nunca se expulsa la entrada más reciente
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or
+                self.total_states > self.max_states or
+                self.total_bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.total_states -= evicted.num_states
+            self.total_bytes -= evicted.size_bytes
+
+    def in_flight(self) -> int:
+        """Número de construcciones en curso (síncronas o de trabajos en segundo plano)"""
+        with self._lock:
+            return len(self._building)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas de uso del registro"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_states': self.total_states,
+                'total_bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
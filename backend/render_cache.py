@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Caché de renderizados de Graphviz direccionada por contenido
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+MIME_TYPES = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+    'pdf': 'application/pdf',
+    'dot': 'text/vnd.graphviz'
+}
+
+
+class RenderCache:
+    """
+    Caché LRU de salidas de Graphviz indexada por (render_id, formato)
+
+    El render_id es el hash del código DOT, así que dos autómatas idénticos
+    comparten la misma imagen y una URL por render_id nunca cambia de
+    contenido (se puede cachear indefinidamente). El propio código DOT se
+    guarda con formato 'dot' para poder renderizar otros formatos bajo
+    demanda a partir del render_id.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def render_id(source: str) -> str:
+        """Identificador de contenido de un código DOT"""
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+    def register(self, source: str) -> str:
+        """Guarda un código DOT y retorna su render_id"""
+        render_id = self.render_id(source)
+        with self._lock:
+            if (render_id, 'dot') in self._data:
+                self._data.move_to_end((render_id, 'dot'))
+            else:
+                self._store((render_id, 'dot'), source.encode('utf-8'))
+        return render_id
+
+    def get(self, render_id: str, output_format: str,
+            renderer: Callable[[str, str], bytes]) -> Optional[bytes]:
+        """
+        Retorna la salida renderizada, renderizándola si no está en caché
+
+        Args:
+            render_id: Identificador retornado por register
+            output_format: 'svg', 'png', 'pdf' o 'dot'
+            renderer: Función (codigo_dot, formato) -> bytes
+
+        Returns:
+            Los bytes renderizados, o None si el render_id es desconocido
+        """
+        key = (render_id, output_format)
+
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return data
+
+            self.misses += 1
+            source = self._data.get((render_id, 'dot'))
+
+        if source is None:
+            return None
+
+        # Renderizar fuera del lock: dot puede tardar
+        data = renderer(source.decode('utf-8'), output_format)
+
+        with self._lock:
+            if key not in self._data:
+                self._store(key, data)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        """Estadísticas de uso de la caché"""
+        with self._lock:
+            return {
+                'entries': len(self._data),
+                'total_bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _store(self, key: Tuple[str, str], data: bytes):
+        """Inserta y expulsa las entradas menos usadas (requiere el lock)"""
+        self._data[key] = data
+        self.total_bytes += len(data)
+
+        while len(self._data) > 1 and self.total_bytes > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self.total_bytes -= len(evicted)
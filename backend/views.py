@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Vistas serializables del parser: estados y tabla ACTION/GOTO por páginas
+y respuestas JSON precalculadas con ETag
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Campos seleccionables con el parámetro "fields"
+STATE_ITEM_FIELDS = ('production', 'left', 'right', 'lookahead')
+TABLE_FIELDS = ('action', 'goto')
+
+# Versión del formato de las vistas: forma parte del ETag, así que cambiarla
+# invalida las copias que los clientes tengan en caché
+VIEWS_VERSION = 1
+
+# Respuestas más chicas no se comprimen (el encabezado gzip no compensa)
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass
+class EncodedView:
+    """Respuesta JSON ya serializada, con su ETag y su versión comprimida"""
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+
+    @property
+    def size_bytes(self) -> int:
+        """Memoria ocupada por los bytes guardados"""
+        return len(self.body) + len(self.gzip_body or b'')
+
+    def plain_body(self) -> bytes:
+        """Cuerpo sin comprimir (se descomprime si solo se guardó la versión gzip)"""
+        if not self.body and self.gzip_body is not None:
+            return gzip.decompress(self.gzip_body)
+        return self.body
+
+
+def encode_view(payload: Any, tag: str = '', compress: bool = True,
+                keep_plain: bool = True) -> EncodedView:
+    """
+    Serializa una vista una sola vez
+
+    Args:
+        payload: Datos de la respuesta
+        tag: Prefijo del ETag (por ejemplo, grammar_id y nombre de la vista)
+        compress: Si es True y el cuerpo es grande, guarda también la versión gzip
+        keep_plain: Si es False y hay versión gzip, no guarda el cuerpo sin
+            comprimir (ocupa menos; se descomprime para clientes sin gzip)
+
+    Returns:
+        EncodedView con ETag fuerte: mismo contenido, mismo ETag
+    """
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    etag = f'{tag}-v{VIEWS_VERSION}-{digest}' if tag else f'v{VIEWS_VERSION}-{digest}'
+
+    gzip_body = None
+    if compress and len(body) >= GZIP_MIN_BYTES:
+        gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+        if not keep_plain:
+            body = b''
+
+    return EncodedView(body, etag, gzip_body)
+
+
+def parse_fields(value: Optional[str], allowed: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Interpreta una lista de campos separada por comas ('' o None = todos)
+
+    Raises:
+        ValueError: Si algún campo no está en allowed
+    """
+    if not value:
+        return tuple(allowed)
+
+    fields = tuple(field.strip() for field in value.split(',') if field.strip())
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Campos no válidos: {', '.join(unknown)}. Opciones: {', '.join(allowed)}")
+    return fields
+
+
+def page_bounds(total: int, start: int = 0, limit: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Rango [start, end) de estados de una página, acotado a [0, total]
+
+    Args:
+        total: Cantidad de estados
+        start: Primer estado de la página
+        limit: Máximo de estados (None = hasta el final)
+    """
+    if start < 0 or (limit is not None and limit < 0):
+        raise ValueError("start y limit deben ser no negativos")
+
+    start = min(start, total)
+    end = total if limit is None else min(total, start + limit)
+    return start, end
+
+
+def page_info(total: int, start: int, end: int) -> Dict:
+    """Metadatos de paginación: rango devuelto y el start de la página siguiente"""
+    return {
+        'num_states': total,
+        'start': start,
+        'end': end,
+        'next': end if end < total else None
+    }
+
+
+def states_page(parser, start: int, end: int,
+                fields: Sequence[str] = STATE_ITEM_FIELDS) -> List[Dict]:
+    """Estados [start, end) con sus items ordenados, solo con los campos pedidos"""
+    states_info = []
+
+    for idx in range(start, end):
+        items = []
+        for item in sorted(parser.states[idx], key=lambda x: (x.production, x.dot_position, x.lookahead)):
+            prod = parser.grammar[item.production]
+            right = list(prod.right)
+            right.insert(item.dot_position, '•')
+
+            values = {
+                'production': item.production,
+                'left': prod.left,
+                'right': ' '.join(right),
+                'lookahead': item.lookahead
+            }
+            items.append({field: values[field] for field in fields})
+
+        states_info.append({
+            'id': idx,
+            'items': items
+        })
+
+    return states_info
+
+
+def table_rows(parser) -> Tuple[List[Dict[str, str]], List[Dict[str, int]]]:
+    """
+    Filas de ACTION y GOTO por estado, en una sola pasada sobre las tablas
+
+    Las tablas del parser están indexadas por (estado, símbolo); agruparlas
+    por estado permite servir cualquier rango de filas sin recorrerlas enteras.
+    """
+    num_states = len(parser.states)
+    action_rows: List[Dict[str, str]] = [{} for _ in range(num_states)]
+    goto_rows: List[Dict[str, int]] = [{} for _ in range(num_states)]
+
+    for (state, terminal), action in parser.action_table.items():
+        action_rows[state][terminal] = action
+    for (state, non_terminal), target in parser.goto_table.items():
+        # Excluir S' de la tabla GOTO (es símbolo aumentado)
+        if non_terminal != parser.augmented_start:
+            goto_rows[state][non_terminal] = target
+
+    return action_rows, goto_rows
+
+
+def parsing_table_page(parser, rows, start: int, end: int, sparse: bool = False,
+                       fields: Sequence[str] = TABLE_FIELDS) -> Dict:
+    """
+    Tabla ACTION/GOTO de los estados [start, end)
+
+    Args:
+        parser: Parser construido
+        rows: Resultado de table_rows(parser)
+        sparse: Si es True solo se incluyen las celdas no vacías; si no, cada
+            fila trae todos los símbolos con '' en las celdas vacías
+        fields: Tablas a incluir ('action', 'goto')
+    """
+    # Obtener terminales y no terminales (sin S')
+    terminals = sorted(parser.terminals)
+    non_terminals = sorted(nt for nt in parser.non_terminals if nt != parser.augmented_start)
+    action_rows, goto_rows = rows
+
+    result = {
+        'terminals': terminals,
+        'non_terminals': non_terminals,
+        'sparse': sparse
+    }
+
+    for field, symbols, all_rows in (('action', terminals, action_rows),
+                                     ('goto', non_terminals, goto_rows)):
+        if field not in fields:
+            continue
+        if sparse:
+            result[field] = {idx: all_rows[idx] for idx in range(start, end)}
+        else:
+            result[field] = {idx: {symbol: all_rows[idx].get(symbol, '') for symbol in symbols}
+                             for idx in range(start, end)}
+
+    return result
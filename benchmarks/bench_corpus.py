@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmark de construcción y análisis sobre un corpus de gramáticas realistas
+
+Para cada gramática de benchmarks/corpus (JSON, subconjunto de SQL, lenguaje
+tipo C y subconjunto de Pascal en formato "A -> x"; un subconjunto de C en
+bison y un formato de configuración en Lark, importados con
+parser/grammar_import.py) y cada parser mide el tiempo por fase de la
+construcción, estados y transiciones, bytes de las tablas ACTION/GOTO y
+tokens por segundo al analizar su archivo de entrada.
+
+Uso:
+    python benchmarks/bench_corpus.py [--grammars json sql] [--parsers LR1 LALR1]
+                                      [--output resultados.json] [--compare anterior.json]
+
+Con --compare se contrastan los resultados con los de otra ejecución (por
+ejemplo, la del commit anterior) y se marcan las regresiones.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.lr0_parser import SLR1Parser
+from parser.lazy_lr1_parser import LazyLR1Parser
+from parser.token_stream import iter_mmap_tokens
+from parser.grammar_import import IMPORTERS, import_grammar_file
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'corpus')
+
+# Parsers medidos: nombre -> constructor
+PARSERS = {
+    'LR1': LR1Parser,
+    'LALR1': LALR1Parser,
+    'LALR1-directo': lambda: LALR1Parser(direct=True),
+    'SLR1': SLR1Parser,
+    'LR1-perezoso': LazyLR1Parser
+}
+
+# Formato del archivo de resultados (cambiarlo si cambian los campos)
+RESULTS_VERSION = 1
+
+
+# Extensiones de las gramáticas del corpus: formato propio y formatos importados
+GRAMMAR_EXTENSIONS = ('.grammar',) + tuple(IMPORTERS)
+
+
+def corpus_names():
+    """Nombres de las gramáticas del corpus (.grammar, .y o .lark)"""
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(CORPUS_DIR)
+                  if os.path.splitext(name)[1] in GRAMMAR_EXTENSIONS)
+
+
+def load_grammar(name):
+    """
+    Gramática del corpus y ruta de su archivo de entrada
+
+    La gramática es el texto de un .grammar o el ImportedGrammar de un .y o
+    .lark; parse_grammar acepta ambos.
+    """
+    for extension in GRAMMAR_EXTENSIONS:
+        path = os.path.join(CORPUS_DIR, f'{name}{extension}')
+        if os.path.exists(path):
+            break
+    else:
+        raise ValueError(f"No existe la gramática {name} en el corpus")
+
+    if extension == '.grammar':
+        with open(path, encoding='utf-8') as f:
+            grammar = f.read()
+    else:
+        grammar = import_grammar_file(path)
+    return grammar, os.path.join(CORPUS_DIR, f'{name}.input')
+
+
+def table_bytes(parser):
+    """
+    Memoria de las tablas ACTION y GOTO (diccionarios, claves y valores)
+
+    Los objetos compartidos (símbolos, acciones repetidas como 'r3') se
+    cuentan una sola vez.
+    """
+    seen = set()
+    total = 0
+
+    def add(obj):
+        nonlocal total
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+
+    for table in (parser.action_table, parser.goto_table):
+        add(table)
+        for key, value in table.items():
+            add(key)
+            for part in key:
+                add(part)
+            add(value)
+    return total
+
+
+def measure_build(parser_factory, grammar_text, repeat):
+    """Construye el parser varias veces y retorna el de menor tiempo total"""
+    best = None
+    best_seconds = float('inf')
+    for _ in range(repeat):
+        parser = parser_factory()
+        parser.parse_grammar(grammar_text)
+        seconds = sum(phase['wall_seconds'] for phase in parser.stats.phases)
+        if seconds < best_seconds:
+            best, best_seconds = parser, seconds
+    return best
+
+
+def measure_parse(parser, tokens, min_seconds):
+    """
+    Analiza los tokens repetidamente durante al menos min_seconds
+
+    Usa parse_tokens (sin traza ni límite de pasos), de modo que se mide
+    solo el autómata y no la tokenización.
+
+    Returns:
+        Tupla (resultado del último análisis, tokens por segundo)
+    """
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        result = parser.parse_tokens(tokens)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+    return result, len(tokens) * runs / elapsed
+
+
+def bench_grammar(name, parser_names, build_repeat=1, parse_seconds=0.2):
+    """Mide una gramática del corpus con cada parser indicado"""
+    grammar_text, input_path = load_grammar(name)
+    tokens = list(iter_mmap_tokens(input_path))
+
+    results = []
+    for parser_name in parser_names:
+        parser = measure_build(PARSERS[parser_name], grammar_text, build_repeat)
+        stats = parser.stats.to_dict()
+        result, tokens_per_second = measure_parse(parser, tokens, parse_seconds)
+
+        results.append({
+            'grammar': name,
+            'parser': parser_name,
+            'build_seconds': stats['total_wall_seconds'],
+            'phases': {phase['name']: phase['wall_seconds'] for phase in stats['phases']},
+            'states': len(parser.states),
+            'transitions': len(parser.transitions),
+            'action_entries': len(parser.action_table),
+            'goto_entries': len(parser.goto_table),
+            'conflicts': len(parser.conflicts),
+            'table_bytes': table_bytes(parser),
+            'peak_memory_bytes': stats['peak_memory_bytes'],
+            'input_tokens': len(tokens),
+            'accepted': result['success'],
+            'tokens_per_second': round(tokens_per_second)
+        })
+    return results
+
+
+def git_commit():
+    """Commit actual del repositorio (None si no se puede determinar)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara con los resultados de otra ejecución
+
+    Una regresión es una construcción más lenta o un análisis con menos
+    tokens por segundo en más de threshold (0.2 = 20%), o un cambio en la
+    cantidad de estados.
+
+    Returns:
+        Lista de mensajes de regresión
+    """
+    previous = {(row['grammar'], row['parser']): row for row in baseline['results']}
+    regressions = []
+
+    print(f"\nComparación con {baseline.get('commit') or 'la ejecución anterior'}:")
+    print(f"{'Gramática':<12}{'Parser':<15}{'Construcción':>14}{'Tokens/s':>12}{'Estados':>10}")
+    print("-" * 63)
+    for row in results:
+        old = previous.get((row['grammar'], row['parser']))
+        if old is None:
+            continue
+
+        build_ratio = row['build_seconds'] / old['build_seconds'] if old['build_seconds'] else 1.0
+        parse_ratio = row['tokens_per_second'] / old['tokens_per_second'] if old['tokens_per_second'] else 1.0
+        states_delta = row['states'] - old['states']
+        print(f"{row['grammar']:<12}{row['parser']:<15}{build_ratio:>13.2f}x{parse_ratio:>11.2f}x{states_delta:>+10}")
+
+        key = f"{row['grammar']}/{row['parser']}"
+        if build_ratio > 1 + threshold:
+            regressions.append(f"{key}: construcción {build_ratio:.2f}x más lenta")
+        if parse_ratio < 1 - threshold:
+            regressions.append(f"{key}: análisis a {parse_ratio:.2f}x de los tokens/s anteriores")
+        if states_delta:
+            regressions.append(f"{key}: {states_delta:+} estados")
+    return regressions
+
+
+def print_table(results):
+    """Imprime los resultados como tabla"""
+    print(f"\n{'Gramática':<12}{'Parser':<15}{'Estados':>9}{'Trans.':>9}{'Tabla (KB)':>12}"
+          f"{'Constr.':>10}{'Autómata':>10}{'Tokens/s':>12}")
+    print("-" * 89)
+    for row in results:
+        print(f"{row['grammar']:<12}{row['parser']:<15}{row['states']:>9}{row['transitions']:>9}"
+              f"{row['table_bytes'] / 1024:>12.1f}{row['build_seconds']:>9.3f}s"
+              f"{row['phases'].get('automaton', 0):>9.3f}s{row['tokens_per_second']:>12,}"
+              f"{'' if row['accepted'] else '  ❌ rechazada'}"
+              f"{'  ⚠️ ' + str(row['conflicts']) + ' conflictos' if row.get('conflicts') else ''}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark del corpus de gramáticas')
+    arg_parser.add_argument('--grammars', nargs='+', choices=corpus_names(), default=corpus_names(),
+                            help='Gramáticas del corpus a medir')
+    arg_parser.add_argument('--parsers', nargs='+', choices=list(PARSERS), default=list(PARSERS),
+                            help='Parsers a medir')
+    arg_parser.add_argument('--build-repeat', type=int, default=1,
+                            help='Construcciones por gramática (se toma la más rápida)')
+    arg_parser.add_argument('--parse-seconds', type=float, default=0.2,
+                            help='Tiempo mínimo de análisis para medir tokens/s')
+    arg_parser.add_argument('--output', help='Archivo JSON para guardar los resultados')
+    arg_parser.add_argument('--compare', help='Resultados JSON de otra ejecución para comparar')
+    arg_parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Variación tolerada antes de marcar una regresión (0.2 = 20%%)')
+    args = arg_parser.parse_args()
+
+    results = []
+    for name in args.grammars:
+        results.extend(bench_grammar(name, args.parsers, args.build_repeat, args.parse_seconds))
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'version': RESULTS_VERSION,
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results
+            }, f, indent=2)
+        print(f"\n[OK] Resultados guardados: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print(f"⚠️ {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
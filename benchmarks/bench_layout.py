@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark del motor de layout integrado contra el binario dot de Graphviz
+
+Uso:
+    python benchmarks/bench_layout.py [--sizes 1000 3000] [--output resultados.json]
+
+Si dot no está instalado solo se mide el motor integrado.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.layout import LayeredLayout
+from parser.visualizer_graphviz import LR1GraphvizVisualizer, render_dot_source, dot_available
+
+SAMPLE_GRAMMARS = {
+    'expresiones': """S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id""",
+    'por_defecto': """S -> q * A * B * C
+A -> a
+A -> b * b * D
+B -> a
+B -> ε
+C -> b
+C -> ε
+D -> C
+D -> ε""",
+    'precedencia': '\n'.join(
+        ["S -> E0"] +
+        [f"E{i} -> E{i} o{i} E{i + 1} | E{i + 1}" for i in range(10)] +
+        ["E10 -> ( E0 ) | id"]
+    )
+}
+
+
+def timed(function, repeat=3):
+    """Mejor tiempo (en segundos) de varias ejecuciones"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def synthetic_automaton(num_states, seed=0):
+    """
+    Grafo con forma de autómata: árbol de avance con ramificación local,
+    transiciones de retorno a estados compartidos y bucles
+    """
+    rnd = random.Random(seed)
+    edges = []
+    for state in range(1, num_states):
+        edges.append((rnd.randrange(max(0, state - 20), state), state, f't{state % 7}'))
+    for _ in range(num_states):
+        source = rnd.randrange(num_states)
+        target = rnd.randrange(min(num_states, 50))
+        edges.append((source, target, f'n{source % 5}'))
+    return edges
+
+
+def synthetic_dot(num_states, edges):
+    """Código DOT equivalente al grafo sintético (vista 'ids')"""
+    lines = ['digraph G {', 'rankdir=LR;', 'node [shape=rectangle];']
+    lines.extend(f'{state} [label="I{state}"];' for state in range(num_states))
+    lines.extend(f'{s} -> {t} [label="{label}"];' for s, t, label in edges)
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def bench_grammars(use_dot):
+    """Vistas de las gramáticas de ejemplo con ambos motores"""
+    results = []
+    for name, grammar in SAMPLE_GRAMMARS.items():
+        for parser_class in (LR1Parser, LALR1Parser):
+            parser = parser_class()
+            parser.parse_grammar(grammar)
+            visualizer = LR1GraphvizVisualizer(parser)
+
+            for view in ('full', 'ids'):
+                builtin_time, _ = timed(lambda: visualizer.render_layout_svg(view))
+                row = {
+                    'grammar': name,
+                    'parser': parser_class.__name__,
+                    'view': view,
+                    'states': len(parser.states),
+                    'builtin_seconds': round(builtin_time, 4)
+                }
+                if use_dot:
+                    source = visualizer.get_dot_source(view)
+                    dot_time, _ = timed(lambda: render_dot_source(source, 'svg'))
+                    row['dot_seconds'] = round(dot_time, 4)
+                results.append(row)
+    return results
+
+
+def bench_synthetic(sizes, use_dot):
+    """Grafos sintéticos de 1k+ estados"""
+    results = []
+    for num_states in sizes:
+        edges = synthetic_automaton(num_states)
+        nodes = {state: (60.0, 35.0) for state in range(num_states)}
+
+        engine = LayeredLayout()
+        builtin_time, _ = timed(lambda: engine.run(nodes, edges), repeat=1)
+        row = {
+            'grammar': f'sintetico_{num_states}',
+            'states': num_states,
+            'transitions': len(edges),
+            'builtin_seconds': round(builtin_time, 4),
+            'crossings': engine.crossings
+        }
+        if use_dot:
+            source = synthetic_dot(num_states, edges)
+            dot_time, _ = timed(lambda: render_dot_source(source, 'svg'), repeat=1)
+            row['dot_seconds'] = round(dot_time, 4)
+        results.append(row)
+    return results
+
+
+def print_table(results):
+    """Imprime los resultados como tabla"""
+    print(f"\n{'Grafo':<26}{'Parser':<14}{'Vista':<8}{'Estados':>9}{'Integrado':>12}{'dot':>12}")
+    print("-" * 81)
+    for row in results:
+        dot_time = f"{row['dot_seconds']:.4f}s" if 'dot_seconds' in row else '-'
+        print(f"{row['grammar']:<26}{row.get('parser', '-'):<14}{row.get('view', 'ids'):<8}"
+              f"{row['states']:>9}{row['builtin_seconds']:>11.4f}s{dot_time:>12}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark de motores de layout')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 3000],
+                            help='Tamaños de los grafos sintéticos')
+    arg_parser.add_argument('--output', help='Archivo JSON para guardar los resultados')
+    args = arg_parser.parse_args()
+
+    use_dot = dot_available()
+    if not use_dot:
+        print("⚠️ dot no está instalado: solo se mide el motor integrado")
+
+    results = bench_grammars(use_dot) + bench_synthetic(args.sizes, use_dot)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'dot_available': use_dot, 'results': results}, f, indent=2)
+        print(f"\n[OK] Resultados guardados: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
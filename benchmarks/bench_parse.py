@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark de análisis con oraciones generadas (carga válida y casi válida)
+
+Para cada gramática del corpus genera oraciones con SentenceGenerator y mide:
+velocidad del generador, tokens por segundo de parse_tokens sobre una
+entrada grande, parse_string sobre oraciones cortas, rechazo de las
+mutaciones de un token y, con --url, peticiones a /api/parse_string de un
+servidor en ejecución.
+
+Uso:
+    python benchmarks/bench_parse.py [--grammars json sql] [--tokens 1000000]
+                                     [--count 200] [--length 100]
+                                     [--url http://127.0.0.1:5001] [--write entrada.txt]
+                                     [--output resultados.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from collections import Counter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from parser.lalr1_parser import LALR1Parser
+from parser.sentence_generator import SentenceGenerator
+from benchmarks.bench_corpus import corpus_names, load_grammar
+
+
+def post_json(url, payload):
+    """POST con cuerpo JSON; retorna la respuesta decodificada"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def percentile(values, fraction):
+    """Percentil de una lista (sin interpolar)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_http(url, grammar_text, sentences):
+    """Envía las oraciones a /api/parse_string y mide latencia y throughput"""
+    built = post_json(f'{url}/api/build_parser', {'grammar': grammar_text, 'parser_type': 'LALR1'})
+    grammar_id = built['grammar_id']
+
+    latencies = []
+    accepted = 0
+    start = time.perf_counter()
+    for tokens in sentences:
+        request_start = time.perf_counter()
+        result = post_json(f'{url}/api/parse_string', {'grammar_id': grammar_id, 'string': ' '.join(tokens)})
+        latencies.append(time.perf_counter() - request_start)
+        accepted += result.get('accepted', False)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests': len(sentences),
+        'accepted': accepted,
+        'requests_per_second': round(len(sentences) / elapsed, 1),
+        'tokens_per_second': round(sum(len(tokens) for tokens in sentences) / elapsed),
+        'latency_p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'latency_p95_ms': round(percentile(latencies, 0.95) * 1000, 3)
+    }
+
+
+def bench_grammar(name, total_tokens, count, length, url=None, write=None, seed=0):
+    """Mide generación y análisis de una gramática del corpus"""
+    grammar_text, _ = load_grammar(name)
+    parser = LALR1Parser(direct=True)
+    parser.parse_grammar(grammar_text)
+
+    start = time.perf_counter()
+    generator = SentenceGenerator(parser, seed=seed)
+    setup_seconds = time.perf_counter() - start
+
+    # Entrada grande: velocidad del generador y de parse_tokens
+    start = time.perf_counter()
+    big = generator.sentence(total_tokens)
+    generate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    big_result = parser.parse_tokens((token, i) for i, token in enumerate(big))
+    parse_seconds = time.perf_counter() - start
+
+    if write:
+        with open(write, 'w') as f:
+            f.write(' '.join(big))
+
+    # Oraciones cortas con parse_string (con traza, como la API)
+    sentences = list(generator.sentences(count, length))
+    start = time.perf_counter()
+    accepted = sum(parser.parse_string(' '.join(tokens))['success'] for tokens in sentences)
+    parse_string_seconds = time.perf_counter() - start
+
+    # Casos negativos: una mutación de un token que el parser rechaza
+    mutations = Counter(generator.negative(length)[1]['kind'] for _ in range(count))
+
+    row = {
+        'grammar': name,
+        'setup_seconds': round(setup_seconds, 4),
+        'generated_tokens': len(big),
+        'generator_tokens_per_second': round(len(big) / generate_seconds),
+        'parse_tokens_per_second': round(len(big) / parse_seconds),
+        'large_input_accepted': big_result['success'],
+        'parse_string_sentences': count,
+        'parse_string_accepted': accepted,
+        'parse_string_tokens_per_second': round(sum(len(t) for t in sentences) / parse_string_seconds),
+        'negative_mutations': dict(mutations)
+    }
+    # La API recibe gramáticas en texto; las importadas se miden solo localmente
+    if url and isinstance(grammar_text, str):
+        row['http'] = bench_http(url, grammar_text, sentences)
+    return row
+
+
+def print_table(results):
+    """Imprime los resultados como tabla"""
+    print(f"\n{'Gramática':<12}{'Generador':>14}{'parse_tokens':>14}{'parse_string':>14}"
+          f"{'Aceptadas':>11}{'HTTP req/s':>12}")
+    print("-" * 77)
+    for row in results:
+        http = f"{row['http']['requests_per_second']:.1f}" if 'http' in row else '-'
+        print(f"{row['grammar']:<12}{row['generator_tokens_per_second']:>14,}"
+              f"{row['parse_tokens_per_second']:>14,}{row['parse_string_tokens_per_second']:>14,}"
+              f"{row['parse_string_accepted']:>6}/{row['parse_string_sentences']:<4}{http:>12}")
+    print("(tokens por segundo)")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark de análisis con oraciones generadas')
+    arg_parser.add_argument('--grammars', nargs='+', choices=corpus_names(), default=corpus_names(),
+                            help='Gramáticas del corpus')
+    arg_parser.add_argument('--tokens', type=int, default=1000000,
+                            help='Tokens de la entrada grande (generador y parse_tokens)')
+    arg_parser.add_argument('--count', type=int, default=200,
+                            help='Oraciones cortas para parse_string, negativos y HTTP')
+    arg_parser.add_argument('--length', type=int, default=100,
+                            help='Tokens de cada oración corta (parse_string corta a los 1000 pasos)')
+    arg_parser.add_argument('--url', help='URL de un backend en ejecución para medir /api/parse_string')
+    arg_parser.add_argument('--write', help='Guarda la entrada grande de la primera gramática (para parse_file)')
+    arg_parser.add_argument('--seed', type=int, default=0, help='Semilla del generador')
+    arg_parser.add_argument('--output', help='Archivo JSON para guardar los resultados')
+    args = arg_parser.parse_args()
+
+    results = []
+    for index, name in enumerate(args.grammars):
+        write = args.write if index == 0 else None
+        results.append(bench_grammar(name, args.tokens, args.count, args.length,
+                                     args.url, write, args.seed))
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+        print(f"\n[OK] Resultados guardados: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
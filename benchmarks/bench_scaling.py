@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Barrido de tamaños con gramáticas sintéticas: LR(1) vs LALR(1)
+
+Para cada familia de benchmarks/grammar_generator.py y cada tamaño mide el
+tiempo de construcción, la memoria asignada (pico de tracemalloc) y la
+cantidad de estados de cada parser.
+
+Uso:
+    python benchmarks/bench_scaling.py [--families precedence lr1_blowup]
+                                       [--sizes 2 4 8 16 32] [--max-seconds 30]
+                                       [--output resultados.json] [--plot escalado.png]
+
+Cuando una construcción supera --max-seconds se deja de aumentar el tamaño
+para ese parser y esa familia. --plot requiere matplotlib.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.budget import BuildBudget, BudgetExceeded
+from benchmarks.grammar_generator import families, generate
+
+PARSERS = {
+    'LR1': LR1Parser,
+    'LALR1': LALR1Parser,
+    'LALR1-directo': lambda: LALR1Parser(direct=True)
+}
+
+
+def measure(parser_factory, grammar_text, max_seconds, memory=True):
+    """
+    Construye una gramática y retorna sus mediciones
+
+    El tiempo se mide sin tracemalloc (que lo distorsiona); si memory es
+    True se construye una segunda vez para obtener el pico de memoria.
+
+    Returns:
+        Diccionario con las mediciones, o None si se excedió max_seconds
+    """
+    parser = parser_factory()
+    parser.budget = BuildBudget(max_seconds=max_seconds)
+    start = time.perf_counter()
+    try:
+        parser.parse_grammar(grammar_text)
+    except BudgetExceeded:
+        return None
+    seconds = time.perf_counter() - start
+
+    row = {
+        'build_seconds': round(seconds, 6),
+        'states': len(parser.states),
+        'transitions': len(parser.transitions),
+        'items': sum(len(state) for state in parser.states),
+        'productions': len(parser.grammar) - 1
+    }
+
+    if memory:
+        tracemalloc.start()
+        try:
+            parser_factory().parse_grammar(grammar_text)
+            row['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return row
+
+
+def sweep(family_names, sizes, parser_names, max_seconds, memory=True):
+    """Mide cada familia en tamaños crecientes hasta que la construcción sea muy lenta"""
+    results = []
+    for family in family_names:
+        for parser_name in parser_names:
+            for n in sorted(sizes):
+                row = measure(PARSERS[parser_name], generate(family, n), max_seconds, memory)
+                if row is None:
+                    print(f"⚠️ {family}/{parser_name}: n={n} superó {max_seconds}s, se omiten tamaños mayores")
+                    break
+                results.append({'family': family, 'parser': parser_name, 'n': n, **row})
+    return results
+
+
+def print_table(results):
+    """Imprime los resultados como tabla"""
+    print(f"\n{'Familia':<14}{'Parser':<15}{'n':>5}{'Prods':>7}{'Estados':>9}{'Items':>9}"
+          f"{'Tiempo':>11}{'Memoria (KB)':>14}")
+    print("-" * 84)
+    for row in results:
+        memory = f"{row['peak_memory_bytes'] / 1024:.0f}" if 'peak_memory_bytes' in row else '-'
+        print(f"{row['family']:<14}{row['parser']:<15}{row['n']:>5}{row['productions']:>7}"
+              f"{row['states']:>9}{row['items']:>9}{row['build_seconds']:>10.4f}s{memory:>14}")
+
+
+def plot(results, filename):
+    """Gráfico de estados y tiempo de construcción vs n, un panel por familia"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️ matplotlib no está instalado: no se genera el gráfico")
+        return
+
+    family_names = list(dict.fromkeys(row['family'] for row in results))
+    fig, axes = plt.subplots(2, len(family_names), figsize=(4 * len(family_names), 7), squeeze=False)
+
+    for column, family in enumerate(family_names):
+        rows = [row for row in results if row['family'] == family]
+        for parser_name in dict.fromkeys(row['parser'] for row in rows):
+            series = [row for row in rows if row['parser'] == parser_name]
+            sizes = [row['n'] for row in series]
+            axes[0][column].plot(sizes, [row['states'] for row in series], marker='o', label=parser_name)
+            axes[1][column].plot(sizes, [row['build_seconds'] for row in series], marker='o', label=parser_name)
+
+        axes[0][column].set_title(family)
+        axes[0][column].set_ylabel('Estados')
+        axes[1][column].set_ylabel('Construcción (s)')
+        axes[1][column].set_xlabel('n')
+        for axis in (axes[0][column], axes[1][column]):
+            axis.set_xscale('log', base=2)
+            axis.set_yscale('log')
+            axis.legend(fontsize=8)
+
+    fig.tight_layout()
+    fig.savefig(filename, dpi=120)
+    print(f"\n[OK] Gráfico guardado: {filename}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Escalado de LR(1) vs LALR(1) con gramáticas sintéticas')
+    arg_parser.add_argument('--families', nargs='+', choices=families(), default=families(),
+                            help='Familias de gramáticas')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[2, 4, 8, 16, 32],
+                            help='Valores de n')
+    arg_parser.add_argument('--parsers', nargs='+', choices=list(PARSERS), default=['LR1', 'LALR1'],
+                            help='Parsers a medir')
+    arg_parser.add_argument('--max-seconds', type=float, default=30.0,
+                            help='Tiempo máximo por construcción antes de cortar el barrido')
+    arg_parser.add_argument('--no-memory', action='store_true',
+                            help='No medir memoria (evita la segunda construcción con tracemalloc)')
+    arg_parser.add_argument('--output', help='Archivo JSON para guardar los resultados')
+    arg_parser.add_argument('--plot', help='Archivo de imagen para el gráfico (requiere matplotlib)')
+    args = arg_parser.parse_args()
+
+    results = sweep(args.families, args.sizes, args.parsers, args.max_seconds, not args.no_memory)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+        print(f"\n[OK] Resultados guardados: {args.output}")
+
+    if args.plot:
+        plot(results, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Memoria por estado con clausuras completas y solo con kernels
+
+Para cada gramática del corpus y cada parser construye dos veces (con
+parser.kernel_only en False y en True), mide los bytes que ocupan los
+estados guardados (parser/state_store.py: contenedores e items) y el tiempo
+de recalcular todas las clausuras para mostrarlas (get_states_info).
+
+Uso:
+    python benchmarks/bench_state_memory.py [--grammars sql pascal]
+                                            [--parsers LR1 LALR1] [--output memoria.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from parser.state_store import states_memory_bytes
+from benchmarks.bench_corpus import PARSERS, corpus_names, load_grammar
+
+
+def stored_states_bytes(parser) -> int:
+    """Bytes de los estados del parser (LALR(1) suma el autómata LR(1) que conserva)"""
+    total = states_memory_bytes(parser.states)
+    if getattr(parser, 'lr1_states', None):
+        total += states_memory_bytes(parser.lr1_states)
+    return total
+
+
+def bench_state_memory(name, parser_names):
+    """Compara la memoria de los estados de una gramática en ambos modos"""
+    grammar_text, _ = load_grammar(name)
+
+    results = []
+    for parser_name in parser_names:
+        full = PARSERS[parser_name]()
+        full.parse_grammar(grammar_text)
+        compact = PARSERS[parser_name]()
+        compact.kernel_only = True
+        compact.parse_grammar(grammar_text)
+
+        start = time.perf_counter()
+        compact.get_states_info()
+        display_seconds = time.perf_counter() - start
+
+        num_states = len(full.states)
+        full_bytes = stored_states_bytes(full)
+        kernel_bytes = stored_states_bytes(compact)
+        results.append({
+            'grammar': name,
+            'parser': parser_name,
+            'states': num_states,
+            'full_bytes_per_state': round(full_bytes / num_states),
+            'kernel_bytes_per_state': round(kernel_bytes / num_states),
+            'saving': round(1 - kernel_bytes / full_bytes, 3),
+            'display_seconds': round(display_seconds, 4)
+        })
+    return results
+
+
+def print_table(results):
+    """Imprime los resultados como tabla"""
+    print(f"\n{'Gramática':<12}{'Parser':<15}{'Estados':>9}{'B/estado':>11}{'B/kernel':>11}"
+          f"{'Ahorro':>9}{'Mostrar':>10}")
+    print("-" * 77)
+    for row in results:
+        print(f"{row['grammar']:<12}{row['parser']:<15}{row['states']:>9}"
+              f"{row['full_bytes_per_state']:>11,}{row['kernel_bytes_per_state']:>11,}"
+              f"{row['saving']:>8.0%}{row['display_seconds']:>9.3f}s")
+
+
+def main():
+    # El LR(1) perezoso no tiene todos sus estados al construir
+    parser_names = [name for name in PARSERS if name != 'LR1-perezoso']
+
+    arg_parser = argparse.ArgumentParser(description='Memoria de los estados: clausuras vs kernels')
+    arg_parser.add_argument('--grammars', nargs='+', choices=corpus_names(), default=corpus_names(),
+                            help='Gramáticas del corpus a medir')
+    arg_parser.add_argument('--parsers', nargs='+', choices=parser_names, default=parser_names,
+                            help='Parsers a medir')
+    arg_parser.add_argument('--output', help='Archivo JSON para guardar los resultados')
+    args = arg_parser.parse_args()
+
+    results = []
+    for name in args.grammars:
+        results.extend(bench_state_memory(name, args.parsers))
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+        print(f"\n[OK] Resultados guardados: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
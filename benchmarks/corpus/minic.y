@@ -0,0 +1,155 @@
+/*
+ * Subconjunto de C en formato bison: expresiones ambiguas resueltas con
+ * %left/%right/%nonassoc y el "dangling else" con %prec
+ */
+
+%{
+#include <stdio.h>
+int yylex(void);
+void yyerror(const char *s);
+%}
+
+%union {
+    int ival;
+    char *sval;
+}
+
+%token <sval> ID
+%token <ival> NUM
+%token INT CHAR VOID
+%token IF ELSE WHILE FOR RETURN BREAK CONTINUE
+%token EQ "==" NE "!=" LE "<=" GE ">="
+%token AND "&&" OR "||"
+%token INC "++" DEC "--"
+
+%right '='
+%left OR
+%left AND
+%left EQ NE
+%left '<' '>' LE GE
+%left '+' '-'
+%left '*' '/' '%'
+%right '!' UMINUS
+%left INC DEC
+
+%nonassoc LOWER_THAN_ELSE
+%nonassoc ELSE
+
+%start program
+
+%%
+
+program
+    : %empty
+    | program external
+    ;
+
+external
+    : declaration
+    | function
+    ;
+
+type
+    : INT
+    | CHAR
+    | VOID
+    ;
+
+declaration
+    : type declarators ';'
+    ;
+
+declarators
+    : declarator
+    | declarators ',' declarator
+    ;
+
+declarator
+    : ID
+    | ID '=' expr
+    | ID '[' NUM ']'
+    ;
+
+function
+    : type ID '(' params ')' block
+    | type ID '(' ')' block
+    ;
+
+params
+    : param
+    | params ',' param
+    ;
+
+param
+    : type ID
+    | type ID '[' ']'
+    ;
+
+block
+    : '{' items '}'
+    ;
+
+items
+    : %empty
+    | items item
+    ;
+
+item
+    : declaration
+    | stmt
+    ;
+
+stmt
+    : block
+    | expr ';'              { /* expresión */ }
+    | ';'
+    | IF '(' expr ')' stmt %prec LOWER_THAN_ELSE
+    | IF '(' expr ')' stmt ELSE stmt
+    | WHILE '(' expr ')' stmt
+    | FOR '(' opt_expr ';' opt_expr ';' opt_expr ')' stmt
+    | RETURN opt_expr ';'
+    | BREAK ';'
+    | CONTINUE ';'
+    ;
+
+opt_expr
+    : %empty
+    | expr
+    ;
+
+expr
+    : ID '=' expr
+    | ID '[' expr ']' '=' expr
+    | expr OR expr
+    | expr AND expr
+    | expr EQ expr
+    | expr NE expr
+    | expr '<' expr
+    | expr '>' expr
+    | expr LE expr
+    | expr GE expr
+    | expr '+' expr         { $$ = $1 + $3; }
+    | expr '-' expr         { $$ = $1 - $3; }
+    | expr '*' expr         { $$ = $1 * $3; }
+    | expr '/' expr
+    | expr '%' expr
+    | '!' expr
+    | '-' expr %prec UMINUS
+    | ID INC
+    | ID DEC
+    | ID '(' args ')'
+    | ID '(' ')'
+    | ID '[' expr ']'
+    | '(' expr ')'
+    | ID
+    | NUM
+    ;
+
+args
+    : expr
+    | args ',' expr
+    ;
+
+%%
+
+void yyerror(const char *s) { fprintf(stderr, "%s\n", s); }
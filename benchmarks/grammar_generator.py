@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Generador de gramáticas sintéticas de tamaño y forma controlados
+
+Cada familia recibe un tamaño n y retorna el texto de la gramática en el
+formato del parser (una producción por línea, alternativas con |, ε para
+la cadena vacía). Los no terminales empiezan con mayúscula y los terminales
+con minúscula, por lo que los nombres generados son del tipo E3, k3, o3.
+
+Familias:
+    precedence: n niveles de operadores binarios (E0 -> E0 o0 E1 | E1 ...)
+    statements: n tipos de sentencia con formas distintas dentro de bloques
+    nullable: cadena de n no terminales anulables (FIRST y lookaheads grandes)
+    lr1_blowup: una misma subgramática de expresiones usada en n contextos
+        con distinto terminal de cierre; LR(1) la duplica por contexto y
+        LALR(1) la comparte, así que LR(1) crece ~n veces más que LALR(1)
+
+Todas las gramáticas generadas son LR(1) y LALR(1) sin conflictos.
+"""
+
+from typing import Callable, Dict, List
+
+
+def precedence(n: int) -> str:
+    """n niveles de precedencia con operadores asociativos a izquierda"""
+    lines = ["S -> E0"]
+    lines += [f"E{i} -> E{i} o{i} E{i + 1} | E{i + 1}" for i in range(n)]
+    lines.append(f"E{n} -> ( E0 ) | id")
+    return '\n'.join(lines)
+
+
+def statements(n: int) -> str:
+    """
+    n tipos de sentencia, cada uno con su palabra clave
+
+    Las formas se alternan entre asignación, expresión, sentencia con
+    condición y bloque, para que los estados no sean todos iguales.
+    """
+    shapes = [
+        "k{i} id = Expr ;",
+        "k{i} Expr ;",
+        "k{i} ( Expr ) Block",
+        "k{i} Block"
+    ]
+    lines = [
+        "Program -> Stmts",
+        "Stmts -> Stmts Stmt | ε",
+        "Stmt -> " + ' | '.join(f"Stmt{i}" for i in range(n)),
+    ]
+    lines += [f"Stmt{i} -> " + shapes[i % len(shapes)].format(i=i) for i in range(n)]
+    lines += [
+        "Block -> { Stmts }",
+        "Expr -> Expr + Term | Term",
+        "Term -> id | number | ( Expr )"
+    ]
+    return '\n'.join(lines)
+
+
+def nullable(n: int) -> str:
+    """
+    Cadena de n no terminales anulables: A0 -> B0 A1, B_i -> b_i | ε
+
+    FIRST(A0) tiene n + 1 terminales y cada item de la clausura arrastra
+    conjuntos de lookahead de ese tamaño.
+    """
+    lines = ["S -> A0"]
+    lines += [f"A{i} -> B{i} A{i + 1}" for i in range(n)]
+    lines.append(f"A{n} -> end")
+    lines += [f"B{i} -> b{i} | ε" for i in range(n)]
+    return '\n'.join(lines)
+
+
+def lr1_blowup(n: int, levels: int = 3) -> str:
+    """
+    Subgramática de expresiones de levels niveles usada en n contextos
+
+    S -> c_i E0 d_i: el lookahead de cada item dentro de E depende del
+    contexto (d_i), así que el LR(1) canónico tiene una copia de los
+    estados de E por contexto mientras que LALR(1) los fusiona.
+    """
+    lines = ["S -> " + ' | '.join(f"c{i} E0 d{i}" for i in range(n))]
+    lines += [f"E{i} -> E{i} o{i} E{i + 1} | E{i + 1}" for i in range(levels)]
+    lines.append(f"E{levels} -> ( E0 ) | id")
+    return '\n'.join(lines)
+
+
+GENERATORS: Dict[str, Callable[[int], str]] = {
+    'precedence': precedence,
+    'statements': statements,
+    'nullable': nullable,
+    'lr1_blowup': lr1_blowup
+}
+
+
+def generate(family: str, n: int) -> str:
+    """
+    Gramática de la familia indicada con tamaño n
+
+    Raises:
+        ValueError: Si la familia no existe o n < 1
+    """
+    if family not in GENERATORS:
+        raise ValueError(f"Familia no válida: {family}. Opciones: {', '.join(GENERATORS)}")
+    if n < 1:
+        raise ValueError("El tamaño debe ser al menos 1")
+    return GENERATORS[family](n)
+
+
+def families() -> List[str]:
+    """Nombres de las familias disponibles"""
+    return list(GENERATORS)
@@ -13,6 +13,7 @@ function App() {
   const [automatonInfo, setAutomatonInfo] = useState(null)
   const [parserDetails, setParserDetails] = useState(null)
   const [parserType, setParserType] = useState('LR1')
+  const [grammarId, setGrammarId] = useState(null)
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState(null)
 
@@ -34,6 +35,7 @@ function App() {
           productions: response.data.productions
         })
         setParserType(response.data.parser_type || selectedParserType)
+        setGrammarId(response.data.grammar_id)
         setParserBuilt(true)
       } else {
         setError(response.data.error)
@@ -59,8 +61,8 @@ function App() {
           {parserBuilt && (
             <>
               <AutomatonInfo info={automatonInfo} />
-              <VisualizationTabs details={parserDetails} />
-              <StringParser />
+              <VisualizationTabs key={grammarId} details={parserDetails} grammarId={grammarId} />
+              <StringParser grammarId={grammarId} />
             </>
           )}
         </main>
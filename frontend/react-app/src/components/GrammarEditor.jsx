@@ -10,6 +10,15 @@ C -> ε
 D -> C
 D -> ε`
 
+const PARSER_LABELS = {
+  LR1: 'LR(1)',
+  LALR1: 'LALR(1)',
+  SLR1: 'SLR(1)',
+  LR0: 'LR(0)',
+  LR1LAZY: 'LR(1) perezoso',
+  AUTO: 'automático'
+}
+
 function GrammarEditor({ onBuild, loading, error }) {
   const [grammar, setGrammar] = useState(DEFAULT_GRAMMAR)
   const [parserType, setParserType] = useState('LR1')
@@ -43,6 +52,10 @@ function GrammarEditor({ onBuild, loading, error }) {
         >
           <option value="LR1">LR(1)</option>
           <option value="LALR1">LALR(1)</option>
+          <option value="SLR1">SLR(1)</option>
+          <option value="LR0">LR(0)</option>
+          <option value="LR1LAZY">LR(1) perezoso (estados bajo demanda)</option>
+          <option value="AUTO">Automático (más barato sin conflictos)</option>
         </select>
       </div>
 
@@ -52,7 +65,7 @@ function GrammarEditor({ onBuild, loading, error }) {
           onClick={handleBuild}
           disabled={loading}
         >
-          {loading ? 'Construyendo...' : `Construir Parser ${parserType === 'LR1' ? 'LR(1)' : 'LALR(1)'}`}
+          {loading ? 'Construyendo...' : `Construir Parser ${PARSER_LABELS[parserType]}`}
         </button>
         <button
           className="btn btn-info"
@@ -3,7 +3,7 @@ import axios from 'axios'
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5001/api'
 
-function StringParser() {
+function StringParser({ grammarId }) {
   const [inputString, setInputString] = useState('')
   const [result, setResult] = useState(null)
   const [loading, setLoading] = useState(false)
@@ -12,6 +12,7 @@ function StringParser() {
     setLoading(true)
     try {
       const response = await axios.post(`${API_URL}/parse_string`, {
+        grammar_id: grammarId,
         string: inputString
       })
 
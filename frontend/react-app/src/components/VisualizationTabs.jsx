@@ -3,7 +3,10 @@ import axios from 'axios'
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5001/api'
 
-function VisualizationTabs({ details }) {
+// Filas de la tabla ACTION/GOTO que se piden por página
+const TABLE_PAGE_SIZE = 100
+
+function VisualizationTabs({ details, grammarId }) {
   const [activeTab, setActiveTab] = useState('graphviz')
   const [graphvizSvg, setGraphvizSvg] = useState(null)
   const [parsingTable, setParsingTable] = useState(null)
@@ -21,7 +24,7 @@ function VisualizationTabs({ details }) {
     setLoading(true)
     setError(null)
     try {
-      const response = await axios.post(`${API_URL}/generate_graphviz`)
+      const response = await axios.post(`${API_URL}/generate_graphviz`, { grammar_id: grammarId })
       if (response.data.success) {
         setGraphvizSvg(response.data.svg)
         // Resetear zoom al generar nuevo gráfico
@@ -70,13 +73,22 @@ function VisualizationTabs({ details }) {
   }
 
 
-  const loadParsingTable = async () => {
+  // Carga una página de filas (formato sparse) y la agrega a las ya cargadas
+  const loadParsingTable = async (start = 0) => {
     setLoading(true)
     setError(null)
     try {
-      const response = await axios.get(`${API_URL}/get_parsing_table`)
+      const response = await axios.get(`${API_URL}/get_parsing_table`, {
+        params: { grammar_id: grammarId, start, limit: TABLE_PAGE_SIZE, sparse: 1 }
+      })
       if (response.data.success) {
-        setParsingTable(response.data)
+        const page = response.data
+        setParsingTable(prev => (start === 0 || !prev) ? page : {
+          ...page,
+          start: prev.start,
+          action: { ...prev.action, ...page.action },
+          goto: { ...prev.goto, ...page.goto }
+        })
       } else {
         setError(response.data.error)
       }
@@ -87,6 +99,15 @@ function VisualizationTabs({ details }) {
     }
   }
 
+  // Al acercarse al final del scroll se pide la página siguiente
+  const handleTableScroll = (e) => {
+    const { scrollTop, scrollHeight, clientHeight } = e.currentTarget
+    if (!loading && parsingTable && parsingTable.next !== null &&
+        scrollHeight - scrollTop - clientHeight < 200) {
+      loadParsingTable(parsingTable.next)
+    }
+  }
+
   const renderParsingTable = () => {
     if (!parsingTable) {
       return (
@@ -97,49 +118,56 @@ function VisualizationTabs({ details }) {
     }
 
     return (
-      <div style={{ marginTop: '20px', overflowX: 'auto' }}>
-        <table className="parsing-table">
-          <thead>
-            <tr>
-              <th className="state-header" rowSpan={2}>Estado</th>
-              <th className="action-header" colSpan={parsingTable.terminals.length}>ACTION</th>
-              <th className="goto-header" colSpan={parsingTable.non_terminals.length}>GOTO</th>
-            </tr>
-            <tr>
-              {parsingTable.terminals.map(t => (
-                <th key={t} className="action-header">{t}</th>
-              ))}
-              {parsingTable.non_terminals.map(nt => (
-                <th key={nt} className="goto-header">{nt}</th>
-              ))}
-            </tr>
-          </thead>
-          <tbody>
-            {Array.from({ length: parsingTable.num_states }).map((_, i) => (
-              <tr key={i}>
-                <td className="state-header"><strong>I{i}</strong></td>
-                {parsingTable.terminals.map(t => {
-                  const action = parsingTable.action[i][t] || ''
-                  let className = 'empty'
-                  let content = action
+      <div style={{ marginTop: '20px' }}>
+        <div style={{ overflow: 'auto', maxHeight: '600px' }} onScroll={handleTableScroll}>
+          <table className="parsing-table">
+            <thead>
+              <tr>
+                <th className="state-header" rowSpan={2}>Estado</th>
+                <th className="action-header" colSpan={parsingTable.terminals.length}>ACTION</th>
+                <th className="goto-header" colSpan={parsingTable.non_terminals.length}>GOTO</th>
+              </tr>
+              <tr>
+                {parsingTable.terminals.map(t => (
+                  <th key={t} className="action-header">{t}</th>
+                ))}
+                {parsingTable.non_terminals.map(nt => (
+                  <th key={nt} className="goto-header">{nt}</th>
+                ))}
+              </tr>
+            </thead>
+            <tbody>
+              {Array.from({ length: parsingTable.end }).map((_, i) => (
+                <tr key={i}>
+                  <td className="state-header"><strong>I{i}</strong></td>
+                  {parsingTable.terminals.map(t => {
+                    const action = (parsingTable.action[i] || {})[t] || ''
+                    let className = 'empty'
+                    let content = action
 
-                  if (action.startsWith('s')) className = 'shift'
-                  else if (action.startsWith('r')) className = 'reduce'
-                  else if (action === 'accept') {
-                    className = 'accept'
-                    content = 'ACC'
-                  }
+                    if (action.startsWith('s')) className = 'shift'
+                    else if (action.startsWith('r')) className = 'reduce'
+                    else if (action === 'accept') {
+                      className = 'accept'
+                      content = 'ACC'
+                    }
 
-                  return <td key={t} className={className}>{content}</td>
-                })}
-                {parsingTable.non_terminals.map(nt => {
-                  const goto = parsingTable.goto[i][nt] || ''
-                  return <td key={nt} className={goto ? 'goto' : 'empty'}>{goto}</td>
-                })}
-              </tr>
-            ))}
-          </tbody>
-        </table>
+                    return <td key={t} className={className}>{content}</td>
+                  })}
+                  {parsingTable.non_terminals.map(nt => {
+                    const goto = (parsingTable.goto[i] || {})[nt] || ''
+                    return <td key={nt} className={goto ? 'goto' : 'empty'}>{goto}</td>
+                  })}
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+        {parsingTable.next !== null && (
+          <p className="loading">
+            Mostrando {parsingTable.end} de {parsingTable.num_states} estados (desplázate para cargar más)
+          </p>
+        )}
 
         <div style={{ marginTop: '20px', padding: '15px', background: '#f8f9fa', borderRadius: '8px' }}>
           <h4>Leyenda:</h4>
@@ -228,7 +256,7 @@ function VisualizationTabs({ details }) {
 
       {activeTab === 'table' && (
         <div className="tab-content active">
-          <button className="btn btn-success" onClick={loadParsingTable} disabled={loading}>
+          <button className="btn btn-success" onClick={() => loadParsingTable(0)} disabled={loading}>
             {loading ? 'Cargando...' : 'Cargar Tabla de Parsing'}
           </button>
           {error && <div className="alert alert-error">{error}</div>}
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Selección automática de la clase de parser más barata sin conflictos
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Se prueba en orden de costo LR(0) -> SLR(1) -> LALR(1) -> LR(1) y se queda
+con el primero cuya tabla no tiene conflictos (los que resuelve la
+precedencia no cuentan). Cada intento reutiliza FIRST/FOLLOW del anterior
+(ver parser/incremental.py) y SLR(1) además el autómata LR(0) del intento
+LR(0) (solo rehace la tabla), así que probar las clases baratas cuesta poco
+más que construir el autómata LR(0) una vez.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Importar desde el mismo directorio si se ejecuta directamente
+try:
+    from parser.lr1_parser import LR1Parser
+    from parser.lalr1_parser import LALR1Parser
+    from parser.lr0_parser import LR0Parser, SLR1Parser
+except ModuleNotFoundError:
+    from lr1_parser import LR1Parser
+    from lalr1_parser import LALR1Parser
+    from lr0_parser import LR0Parser, SLR1Parser
+
+# (tipo, fábrica) de la clase más barata a la más cara; LALR(1) se construye
+# directamente (mismas tablas que fusionar el LR(1), sin materializarlo)
+PARSER_LADDER: List[Tuple[str, Callable[[], LR1Parser]]] = [
+    ('LR0', LR0Parser),
+    ('SLR1', SLR1Parser),
+    ('LALR1', lambda: LALR1Parser(direct=True)),
+    ('LR1', LR1Parser),
+]
+
+
+def build_cheapest_parser(grammar_text, configure: Optional[Callable[[LR1Parser], None]] = None,
+                          previous: Optional[LR1Parser] = None) -> Tuple[LR1Parser, Dict[str, Any]]:
+    """
+    Construye la clase de parser más barata que admite la gramática
+
+    Args:
+        grammar_text: Texto de la gramática o ImportedGrammar
+        configure: Se llama con cada parser antes de construirlo (presupuesto,
+            callback de progreso)
+        previous: Parser de una versión anterior de la gramática (se pasa
+            al primer intento)
+
+    Returns:
+        Tupla (parser, info) con info = {'selected': tipo, 'tried': [{'type',
+        'states', 'conflicts'}, ...]}; si ninguna clase está libre de
+        conflictos se retorna el LR(1) con sus conflictos
+    """
+    tried = []
+    parser = None
+    for parser_type, factory in PARSER_LADDER:
+        candidate = factory()
+        if configure is not None:
+            configure(candidate)
+        candidate.parse_grammar(grammar_text, previous=parser if parser is not None else previous)
+        parser = candidate
+        tried.append({
+            'type': parser_type,
+            'states': len(parser.states),
+            'conflicts': len(parser.conflicts)
+        })
+        if not parser.conflicts:
+            break
+
+    return parser, {'selected': tried[-1]['type'], 'tried': tried}
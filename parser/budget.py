@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Límites de recursos para la construcción del autómata
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# Cada cuántas verificaciones se mide la memoria (leer /proc tiene costo)
+_MEMORY_CHECK_INTERVAL = 16
+
+
+def current_memory_bytes() -> int:
+    """Memoria residente (RSS) actual del proceso en bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Sin /proc (macOS, Windows): usar el pico de memoria como aproximación
+        try:
+            import resource
+        except ImportError:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class BuildBudget:
+    """
+    Límites para la construcción de un parser (None = sin límite)
+
+    Attributes:
+        max_states: Máximo de estados del autómata
+        max_items: Máximo de items sumando todos los estados
+        max_seconds: Tiempo máximo de construcción (wall time)
+        max_memory_bytes: Memoria adicional máxima respecto al inicio de la
+            construcción. Se mide con la RSS del proceso, así que incluye lo
+            que asignen otros threads; ParserRegistry ejecuta de a una las
+            construcciones con este límite
+    """
+    max_states: Optional[int] = None
+    max_items: Optional[int] = None
+    max_seconds: Optional[float] = None
+    max_memory_bytes: Optional[int] = None
+
+
+class BudgetExceeded(Exception):
+    """La construcción superó uno de los límites de su BuildBudget"""
+
+    def __init__(self, resource: str, limit: float, value: float, stats: Dict[str, Any]):
+        self.resource = resource
+        self.limit = limit
+        self.value = value
+        self.stats = stats
+        super().__init__(
+            f'Límite de construcción excedido: {resource} = {value} (máximo {limit})'
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Error estructurado con las estadísticas parciales de la construcción"""
+        return {
+            'resource': self.resource,
+            'limit': self.limit,
+            'value': self.value,
+            'stats': self.stats
+        }
+
+
+class BudgetTracker:
+    """Lleva la cuenta de los recursos usados y verifica el BuildBudget"""
+
+    def __init__(self, budget: BuildBudget):
+        self.budget = budget
+        self.start = time.monotonic()
+        self.memory_start = current_memory_bytes() if budget.max_memory_bytes is not None else 0
+        self.memory = 0
+        self.states = 0
+        self.items = 0
+        self.queue = 0
+        self.phase = ''
+        self._checks = 0
+
+    def add_state(self, num_items: int, queue: int = 0):
+        """Registra un nuevo estado del autómata y verifica los límites"""
+        self.states += 1
+        self.items += num_items
+        self.queue = queue
+        self.check()
+
+    def check(self, pending_items: int = 0):
+        """
+        Verifica los límites; lanza BudgetExceeded si alguno se superó
+
+        Args:
+            pending_items: Items aún no registrados (por ejemplo, de una clausura en curso)
+        """
+        budget = self.budget
+
+        if budget.max_states is not None and self.states > budget.max_states:
+            self._exceeded('states', budget.max_states, self.states)
+
+        items = self.items + pending_items
+        if budget.max_items is not None and items > budget.max_items:
+            self._exceeded('items', budget.max_items, items)
+
+        if budget.max_seconds is not None:
+            elapsed = time.monotonic() - self.start
+            if elapsed > budget.max_seconds:
+                self._exceeded('seconds', budget.max_seconds, round(elapsed, 3))
+
+        self._checks += 1
+        if budget.max_memory_bytes is not None and self._checks % _MEMORY_CHECK_INTERVAL == 0:
+            self.memory = current_memory_bytes() - self.memory_start
+            if self.memory > budget.max_memory_bytes:
+                self._exceeded('memory_bytes', budget.max_memory_bytes, self.memory)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas parciales de la construcción"""
+        return {
+            'phase': self.phase,
+            'states': self.states,
+            'items': self.items,
+            'queue': self.queue,
+            'elapsed': round(time.monotonic() - self.start, 3),
+            'memory_bytes': self.memory
+        }
+
+    def _exceeded(self, resource: str, limit: float, value: float):
+        raise BudgetExceeded(resource, limit, value, self.stats())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Estadísticas de construcción del parser: tiempos por fase y contadores
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from parser.budget import current_memory_bytes
+except ModuleNotFoundError:
+    from budget import current_memory_bytes
+
+
+class BuildStats:
+    """
+    Instrumentación de parse_grammar
+
+    Las fases son secuenciales: enter(fase) cierra la fase en curso y abre
+    la siguiente, midiendo tiempo real (wall) y de CPU de cada una. La CPU
+    es la del thread que construye (time.thread_time): los demás threads
+    del proceso (otras construcciones, peticiones) no se le cargan. Los
+    contadores los incrementa directamente el parser en sus bucles.
+
+    Attributes:
+        first_iterations: Pasadas del punto fijo de FIRST
+        follow_iterations: Pasadas del punto fijo de FOLLOW
+        closure_calls: Llamadas a _closure
+        closure_iterations: Pasadas del punto fijo dentro de las clausuras
+        items_generated: Items producidos por todas las clausuras
+        state_map_hits: Gotos que llegaron a un estado ya existente
+        state_map_misses: Gotos que crearon un estado nuevo
+        states_reused: Estados tomados de la construcción anterior (incremental)
+        peak_memory_bytes: Máximo crecimiento de la memoria residente (RSS)
+            respecto al inicio de la construcción, muestreado en cada cambio
+            de fase y en los reportes de progreso. La RSS es del proceso: con
+            construcciones simultáneas incluye también lo que asignan las demás
+    """
+
+    def __init__(self):
+        self.phases: List[Dict[str, Any]] = []
+        self.first_iterations = 0
+        self.follow_iterations = 0
+        self.closure_calls = 0
+        self.closure_iterations = 0
+        self.items_generated = 0
+        self.state_map_hits = 0
+        self.state_map_misses = 0
+        self.states_reused = 0
+        self.peak_memory_bytes = 0
+        self.states = 0
+        self.transitions = 0
+
+        self._phase: Optional[str] = None
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._memory_start: Optional[int] = None
+
+    def enter(self, phase: str):
+        """Comienza una fase (cerrando la anterior); repetir la fase actual solo muestrea memoria"""
+        self.sample_memory()
+        if phase == self._phase:
+            return
+
+        self._close_phase()
+        self._phase = phase
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+
+    def finish(self, states: int = 0, transitions: int = 0):
+        """Cierra la última fase y registra el tamaño del autómata"""
+        self.sample_memory()
+        self._close_phase()
+        self._phase = None
+        self.states = states
+        self.transitions = transitions
+
+    def sample_memory(self):
+        """Actualiza el pico con el crecimiento de la RSS desde la primera muestra"""
+        memory = current_memory_bytes()
+        if self._memory_start is None:
+            self._memory_start = memory
+        growth = memory - self._memory_start
+        if growth > self.peak_memory_bytes:
+            self.peak_memory_bytes = growth
+
+    def phase_seconds(self, phase: str) -> float:
+        """Tiempo real acumulado de una fase (0 si no se ejecutó)"""
+        return sum(p['wall_seconds'] for p in self.phases if p['name'] == phase)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Estadísticas como diccionario serializable a JSON"""
+        return {
+            'phases': [dict(p) for p in self.phases],
+            'total_wall_seconds': round(sum(p['wall_seconds'] for p in self.phases), 6),
+            'total_cpu_seconds': round(sum(p['cpu_seconds'] for p in self.phases), 6),
+            'first_iterations': self.first_iterations,
+            'follow_iterations': self.follow_iterations,
+            'closure_calls': self.closure_calls,
+            'closure_iterations': self.closure_iterations,
+            'items_generated': self.items_generated,
+            'state_map_hits': self.state_map_hits,
+            'state_map_misses': self.state_map_misses,
+            'states_reused': self.states_reused,
+            'peak_memory_bytes': self.peak_memory_bytes,
+            'states': self.states,
+            'transitions': self.transitions
+        }
+
+    def _close_phase(self):
+        """Registra la duración de la fase en curso (si hay una)"""
+        if self._phase is None:
+            return
+        self.phases.append({
+            'name': self._phase,
+            'wall_seconds': round(time.perf_counter() - self._wall_start, 6),
+            'cpu_seconds': round(time.thread_time() - self._cpu_start, 6)
+        })
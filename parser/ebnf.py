@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Sintaxis EBNF en las gramáticas: repeticiones, opcionales y grupos
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Los operadores van pegados al símbolo o al paréntesis que cierra el grupo,
+para no chocar con los terminales habituales del formato:
+
+    Program -> Stmt*                 cero o más
+    Block -> { Stmt+ }               una o más
+    If -> if Expr then Stmt (else Stmt)?
+    Args -> Expr (, Expr)*
+    Value -> (string | number)
+
+Un "(" o ")" separado por espacios, o un operador suelto (E -> E + T,
+T -> T * F), sigue siendo un terminal. Los operadores solo se aplican
+directamente a símbolos con forma de identificador; para repetir un
+terminal de puntuación se usa un grupo: (;)*.
+
+Cada construcción se traduce a un no terminal auxiliar con reglas
+recursivas a izquierda (la pila no crece al analizar listas largas):
+
+    X*      Star[X] -> Star[X] X | ε
+    X+      Plus[X] -> Plus[X] X | X
+    X?      Opt[X] -> X | ε
+    (a | b) Group[a/b] -> a | b
+
+Los auxiliares se comparten por estructura (hash-consing): la misma
+subexpresión en distintas reglas usa un único no terminal.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+OPERATORS = '*+?'
+
+# Nombre de cada operador en el no terminal auxiliar (None = grupo sin operador)
+_HELPER_KINDS = {'*': 'Star', '+': 'Plus', '?': 'Opt', None: 'Group'}
+
+# Token: "(" de apertura, núcleo, operador pegado y cierres ")" con operador
+_TOKEN_RE = re.compile(r'^(?P<open>\(*)(?P<core>[^()\s]+?)(?P<op>[*+?]?)(?P<close>(?:\)[*+?]?)*)$')
+_CLOSE_RE = re.compile(r'\)([*+?]?)')
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][\w']*$")
+
+_EPSILON = ('ε', 'epsilon')
+
+# Alternativas de un grupo: tupla de secuencias de símbolos
+Alternatives = Tuple[Tuple[str, ...], ...]
+
+
+def _lexemes(token: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Descompone un token del lado derecho
+
+    Returns:
+        Lista de (tipo, valor): ('open', None), ('symbol', nombre),
+        ('op', operador), ('close', operador o None) o ('bar', None)
+    """
+    if token == '|':
+        return [('bar', None)]
+
+    match = _TOKEN_RE.match(token)
+    if match is None:
+        # "(" y ")" sueltos son terminales; ")*", "))" y similares cierran grupos
+        if token != ')' and set(token) <= set(')' + OPERATORS) and token.startswith(')'):
+            return [('close', op or None) for op in _CLOSE_RE.findall(token)]
+        return [('symbol', token)]
+
+    core, op = match.group('core'), match.group('op')
+    if op and not _IDENTIFIER_RE.match(core):
+        # "++", "+=", "**": el operador es parte del terminal
+        core, op = core + op, ''
+
+    lexemes = [('open', None)] * len(match.group('open'))
+    lexemes.append(('symbol', core))
+    if op:
+        lexemes.append(('op', op))
+    lexemes.extend(('close', op or None) for op in _CLOSE_RE.findall(match.group('close')))
+    return lexemes
+
+
+def _tokenize(right: str) -> List[Tuple[str, Optional[str]]]:
+    """Lexemas de un lado derecho completo (el | puede ir pegado a los símbolos)"""
+    lexemes = []
+    for token in right.split():
+        for part in re.split(r'(\|)', token):
+            if part:
+                lexemes.extend(_lexemes(part))
+    return lexemes
+
+
+def uses_ebnf(right: str) -> bool:
+    """Indica si el lado derecho de una regla usa alguna construcción EBNF"""
+    return any(kind in ('open', 'op', 'close') for kind, _ in _tokenize(right))
+
+
+class EbnfDesugarer:
+    """
+    Traduce lados derechos EBNF a alternativas de símbolos simples
+
+    Mantiene los no terminales auxiliares creados para toda la gramática:
+    productions tiene sus reglas (en orden de creación) y sources el texto
+    EBNF que representa cada uno.
+    """
+
+    def __init__(self):
+        self.productions: List[Tuple[str, List[str]]] = []
+        self.sources: Dict[str, str] = {}
+        self._helpers: Dict[Tuple[Optional[str], Alternatives], str] = {}
+
+    def alternatives(self, right: str) -> List[List[str]]:
+        """
+        Alternativas (listas de símbolos) de un lado derecho con EBNF
+
+        Raises:
+            ValueError: Si los paréntesis no están balanceados o un
+                operador no sigue a un símbolo o grupo
+        """
+        return self.alternatives_from_lexemes(_tokenize(right))
+
+    def alternatives_from_lexemes(self, lexemes: List[Tuple[str, Optional[str]]]) -> List[List[str]]:
+        """
+        Igual que alternatives, a partir de lexemas ya separados
+
+        Permite traducir sintaxis EBNF de otros formatos (por ejemplo Lark,
+        donde los terminales van entre comillas) con los mismos auxiliares.
+        """
+        alternatives, _ = self._parse_alternatives(lexemes, 0, depth=0)
+        return [list(alternative) for alternative in alternatives]
+
+    def _parse_alternatives(self, lexemes, position: int, depth: int) -> Tuple[Alternatives, int]:
+        """alternativas := secuencia ('|' secuencia)*; se detiene en un cierre"""
+        alternatives = []
+        sequence: List[str] = []
+
+        while position < len(lexemes):
+            kind, value = lexemes[position]
+
+            if kind == 'bar':
+                alternatives.append(tuple(sequence))
+                sequence = []
+                position += 1
+            elif kind == 'close':
+                if depth == 0:
+                    raise ValueError("Hay un ) sin su ( de apertura")
+                break
+            elif kind == 'open':
+                inner, position = self._parse_alternatives(lexemes, position + 1, depth + 1)
+                if position >= len(lexemes):
+                    raise ValueError("Falta cerrar un grupo con )")
+                operator = lexemes[position][1]
+                position += 1
+                sequence.extend(self._apply(operator, inner))
+            elif kind == 'symbol':
+                position += 1
+                if value in _EPSILON:
+                    continue
+                operator = None
+                if position < len(lexemes) and lexemes[position][0] == 'op':
+                    operator = lexemes[position][1]
+                    position += 1
+                sequence.extend(self._apply(operator, ((value,),)))
+            else:
+                raise ValueError(f"Operador {value} sin símbolo al que aplicarse")
+
+        alternatives.append(tuple(sequence))
+        return tuple(alternatives), position
+
+    def _apply(self, operator: Optional[str], alternatives: Alternatives) -> List[str]:
+        """Símbolos que reemplazan a un grupo (o símbolo) con su operador"""
+        if operator is None and len(alternatives) == 1:
+            return list(alternatives[0])
+        return [self._helper(operator, alternatives)]
+
+    def _helper(self, operator: Optional[str], alternatives: Alternatives) -> str:
+        """No terminal auxiliar de una construcción, creándolo la primera vez"""
+        key = (operator, alternatives)
+        name = self._helpers.get(key)
+        if name is not None:
+            return name
+
+        inner = '/'.join('_'.join(alternative) or 'ε' for alternative in alternatives)
+        name = f"{_HELPER_KINDS[operator]}[{inner}]"
+        while name in self.sources:
+            name += "'"
+        self._helpers[key] = name
+
+        if len(alternatives) == 1 and len(alternatives[0]) == 1:
+            source = alternatives[0][0]
+        else:
+            source = '(' + ' | '.join(' '.join(alternative) or 'ε' for alternative in alternatives) + ')'
+        self.sources[name] = source + (operator or '')
+
+        if operator == '*':
+            self.productions.extend((name, [name, *alternative]) for alternative in alternatives)
+            self.productions.append((name, []))
+        elif operator == '+':
+            self.productions.extend((name, [name, *alternative]) for alternative in alternatives)
+            self.productions.extend((name, list(alternative)) for alternative in alternatives)
+        elif operator == '?':
+            self.productions.extend((name, list(alternative)) for alternative in alternatives)
+            self.productions.append((name, []))
+        else:
+            self.productions.extend((name, list(alternative)) for alternative in alternatives)
+        return name
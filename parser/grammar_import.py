@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Importación de gramáticas en formato yacc/bison (.y) y Lark (.lark)
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Cada importador recorre el archivo una sola vez y produce un ImportedGrammar
+con las producciones (modelo Production del parser), los terminales y no
+terminales y las declaraciones de precedencia, que parse_grammar acepta en
+lugar del texto "A -> x y | z":
+
+    parser = LALR1Parser(direct=True)
+    parser.parse_grammar(import_grammar_file('c.y'))
+
+En las gramáticas importadas los nombres se conservan tal cual (los no
+terminales de bison y Lark van en minúscula), así que los no terminales se
+declaran explícitamente en vez de usar la convención de mayúscula inicial.
+Las acciones semánticas se descartan; las acciones en medio de una regla no
+generan el no terminal vacío que introduce bison.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Importar desde el mismo directorio si se ejecuta directamente
+try:
+    from parser.lr1_parser import Production
+    from parser.ebnf import EbnfDesugarer
+except ModuleNotFoundError:
+    from lr1_parser import Production
+    from ebnf import EbnfDesugarer
+
+
+@dataclass
+class ImportedGrammar:
+    """
+    Gramática importada lista para LR1Parser.parse_grammar
+
+    Attributes:
+        format: Formato de origen ('bison' o 'lark')
+        start_symbol: Símbolo inicial (%start, start o la primera regla)
+        productions: Producciones en el orden del archivo, numeradas desde 0
+        non_terminals: Símbolos con reglas (incluidos los auxiliares de EBNF)
+        terminals: Símbolos usados en las reglas que no son no terminales
+        precedence: terminal -> (nivel, asociatividad) de %left, %right,
+            %nonassoc y %precedence; los niveles crecen con cada línea
+        ebnf_helpers: No terminales auxiliares de los operadores EBNF (Lark)
+    """
+    format: str
+    start_symbol: str
+    productions: List[Production] = field(default_factory=list)
+    non_terminals: Set[str] = field(default_factory=set)
+    terminals: Set[str] = field(default_factory=set)
+    precedence: Dict[str, Tuple[int, str]] = field(default_factory=dict)
+    ebnf_helpers: Dict[str, str] = field(default_factory=dict)
+
+
+def _finish(format: str, start_symbol: Optional[str], rules: List[Tuple[str, List[str], Optional[str]]],
+            precedence: Dict[str, Tuple[int, str]], ebnf_helpers: Dict[str, str]) -> ImportedGrammar:
+    """Arma el ImportedGrammar a partir de las reglas (izquierda, derecha, %prec)"""
+    if not rules:
+        raise ValueError("El archivo no tiene reglas")
+
+    non_terminals = {left for left, _, _ in rules}
+    start_symbol = start_symbol or rules[0][0]
+    if start_symbol not in non_terminals:
+        raise ValueError(f"El símbolo inicial {start_symbol} no tiene reglas")
+
+    return ImportedGrammar(
+        format=format,
+        start_symbol=start_symbol,
+        productions=[Production(left, right, number, prec)
+                     for number, (left, right, prec) in enumerate(rules)],
+        non_terminals=non_terminals,
+        terminals={symbol for _, right, _ in rules for symbol in right
+                   if symbol not in non_terminals},
+        precedence=precedence,
+        ebnf_helpers=ebnf_helpers
+    )
+
+
+# ---------------------------------------------------------------------------
+# yacc / bison
+# ---------------------------------------------------------------------------
+
+_BISON_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>/\*.*?\*/|//[^\n]*)
+  | (?P<prologue>%\{.*?%\})
+  | (?P<separator>%%)
+  | (?P<directive>%[A-Za-z_][\w-]*)
+  | (?P<rule>[A-Za-z_.][\w.-]*)(?=\s*:(?!:))
+  | (?P<name>[A-Za-z_.][\w.-]*)
+  | (?P<char>'(?:\\.|[^'\\])+')
+  | (?P<string>"(?:\\.|[^"\\])*")
+  | (?P<tag><[^>\n]*>)
+  | (?P<number>\d+)
+  | (?P<punct>[:|;])
+  | (?P<brace>\{)
+""", re.VERBOSE | re.DOTALL)
+
+_ASSOCIATIVITY = {'%left': 'left', '%right': 'right', '%nonassoc': 'nonassoc',
+                  '%precedence': 'precedence'}
+
+
+def _skip_braces(text: str, position: int) -> int:
+    """Posición después de la llave que cierra la abierta en position"""
+    depth = 0
+    pattern = re.compile(r"""[{}]|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*.*?\*/|//[^\n]*""", re.DOTALL)
+    for match in pattern.finditer(text, position):
+        if match.group() == '{':
+            depth += 1
+        elif match.group() == '}':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError(f"Llave sin cerrar en la línea {text.count(chr(10), 0, position) + 1}")
+
+
+def _bison_tokens(text: str) -> Iterator[Tuple[str, str, int]]:
+    """Tokens (tipo, texto, línea) de un archivo bison; las acciones { } se saltan"""
+    position = 0
+    line = 1
+    while position < len(text):
+        match = _BISON_TOKEN_RE.match(text, position)
+        if match is None:
+            raise ValueError(f"Carácter inesperado {text[position]!r} en la línea {line}")
+        kind = match.lastgroup
+        if kind == 'brace':
+            end = _skip_braces(text, position)
+            yield 'action', '', line
+        else:
+            end = match.end()
+            if kind == 'separator':
+                yield kind, match.group(), line
+            elif kind not in ('space', 'comment', 'prologue'):
+                yield kind, match.group(), line
+        line += text.count('\n', position, end)
+        position = end
+
+
+def _unquote(literal: str) -> str:
+    """Contenido de un literal '+' o "<=" (las secuencias de escape se conservan)"""
+    body = literal[1:-1]
+    return "'" if body == "\\'" else '"' if body == '\\"' else body
+
+
+def import_bison(text: str) -> ImportedGrammar:
+    """
+    Importa una gramática yacc/bison
+
+    Reconoce las declaraciones %token (con alias "literal"), %left, %right,
+    %nonassoc, %precedence y %start, y las reglas con %empty y %prec. El
+    resto de las declaraciones y el epílogo se ignoran.
+
+    Raises:
+        ValueError: Si el archivo no tiene la forma de una gramática bison
+    """
+    aliases: Dict[str, str] = {}
+    precedence: Dict[str, Tuple[int, str]] = {}
+    rules: List[Tuple[str, List[str], Optional[str]]] = []
+    start_symbol: Optional[str] = None
+
+    section = 'declarations'
+    directive: Optional[str] = None
+    level = 0
+    last_token: Optional[str] = None
+
+    left: Optional[str] = None
+    right: List[str] = []
+    prec: Optional[str] = None
+    expect_prec = False
+
+    def symbol_of(kind: str, value: str) -> str:
+        if kind == 'char':
+            return _unquote(value)
+        if kind == 'string':
+            return aliases.get(value, _unquote(value))
+        return value
+
+    def close_alternative():
+        if left is not None:
+            rules.append((left, right, prec))
+
+    for kind, value, line in _bison_tokens(text):
+        if kind == 'separator':
+            if section == 'rules':
+                break  # El resto es el epílogo
+            section = 'rules'
+            continue
+
+        if section == 'declarations':
+            if kind == 'directive':
+                directive = value
+                last_token = None
+                if value in _ASSOCIATIVITY:
+                    level += 1
+            elif kind == 'rule' or kind == 'name' or kind == 'char':
+                symbol = symbol_of(kind, value)
+                if directive == '%start':
+                    start_symbol = symbol
+                elif directive in _ASSOCIATIVITY:
+                    precedence[symbol] = (level, _ASSOCIATIVITY[directive])
+                last_token = symbol if directive in ('%token', '%left', '%right', '%nonassoc',
+                                                     '%precedence') else None
+            elif kind == 'string':
+                if last_token is not None:
+                    aliases[value] = last_token
+                    last_token = None
+                elif directive in _ASSOCIATIVITY:
+                    precedence[symbol_of(kind, value)] = (level, _ASSOCIATIVITY[directive])
+            continue
+
+        # Sección de reglas
+        if kind == 'rule':
+            close_alternative()
+            left, right, prec = value, [], None
+        elif left is None:
+            if kind not in ('punct', 'action') or value == '|':
+                raise ValueError(f"Se esperaba el nombre de una regla en la línea {line}")
+        elif kind == 'punct' and value == ':':
+            continue
+        elif kind == 'punct' and value == '|':
+            close_alternative()
+            right, prec = [], None
+        elif kind == 'punct' and value == ';':
+            close_alternative()
+            left, right, prec = None, [], None
+        elif kind == 'directive':
+            if value == '%prec':
+                expect_prec = True
+            elif value not in ('%empty', '%dprec', '%merge', '%expect', '%expect-rr'):
+                raise ValueError(f"Directiva {value} no soportada en la línea {line}")
+        elif kind in ('name', 'char', 'string'):
+            symbol = symbol_of(kind, value)
+            if expect_prec:
+                prec, expect_prec = symbol, False
+            else:
+                right.append(symbol)
+        # Acciones, <tipos> y números (%dprec 2) no forman parte de la regla
+
+    close_alternative()
+    if section != 'rules':
+        raise ValueError("Falta el separador %% antes de las reglas")
+    return _finish('bison', start_symbol, rules, precedence, {})
+
+
+# ---------------------------------------------------------------------------
+# Lark
+# ---------------------------------------------------------------------------
+
+_LARK_TOKEN_RE = re.compile(r"""
+    (?P<newline>\n)
+  | (?P<space>[ \t\r]+)
+  | (?P<comment>//[^\n]*)
+  | (?P<directive>%[a-z]+)
+  | (?P<definition>[?!]?[A-Za-z_]\w*(?:\.-?\d+)?)(?=[ \t]*:)
+  | (?P<name>[A-Za-z_][\w.]*)
+  | (?P<string>"(?:\\.|[^"\\])*"i?)
+  | (?P<regexp>/(?:\\.|[^/\\\n])+/[imslux]*)
+  | (?P<arrow>->)
+  | (?P<range>\.\.)
+  | (?P<number>\d+)
+  | (?P<punct>[:|()\[\]*+?~,{}])
+""", re.VERBOSE)
+
+
+def _lark_tokens(text: str) -> Iterator[Tuple[str, str, int]]:
+    """Tokens (tipo, texto, línea) de un archivo Lark"""
+    position = 0
+    line = 1
+    while position < len(text):
+        match = _LARK_TOKEN_RE.match(text, position)
+        if match is None:
+            raise ValueError(f"Carácter inesperado {text[position]!r} en la línea {line}")
+        kind = match.lastgroup
+        if kind not in ('space', 'comment'):
+            yield kind, match.group(), line
+        if kind == 'newline':
+            line += 1
+        position = match.end()
+
+
+def import_lark(text: str) -> ImportedGrammar:
+    """
+    Importa una gramática Lark
+
+    Las reglas (nombres en minúscula, con o sin ?, ! y prioridad) admiten
+    X*, X+, X?, [X] y grupos, que se traducen con los auxiliares compartidos
+    de parser/ebnf.py. Las definiciones de terminales (MAYÚSCULAS) solo
+    aportan el nombre: un literal "+" en una regla usa el nombre del
+    terminal definido exactamente como "+". %import y %declare declaran
+    terminales; %ignore se descarta. Lark no tiene declaraciones de
+    precedencia, así que precedence queda vacío.
+
+    Raises:
+        ValueError: Si usa plantillas de reglas, repeticiones con ~ o un
+            paréntesis no balanceado
+    """
+    desugarer = EbnfDesugarer()
+    rules: List[Tuple[str, List[str], Optional[str]]] = []
+    literal_names: Dict[str, str] = {}
+
+    current: Optional[str] = None       # Regla cuyo cuerpo se está leyendo
+    terminal: Optional[str] = None      # Terminal cuyo cuerpo se está leyendo
+    terminal_body: List[Tuple[str, str]] = []
+    lexemes: List[Tuple[str, Optional[str]]] = []
+    directive: Optional[str] = None
+    skip_alias = False
+
+    def close_definition():
+        if current is not None:
+            for alternative in desugarer.alternatives_from_lexemes(lexemes):
+                rules.append((current, alternative, None))
+        if terminal is not None and len(terminal_body) == 1 and terminal_body[0][0] == 'string':
+            literal_names.setdefault(terminal_body[0][1], terminal)
+
+    for kind, value, line in _lark_tokens(text):
+        if directive is not None:
+            if kind == 'newline':
+                directive = None
+            continue
+
+        if kind == 'directive':
+            if value not in ('%import', '%ignore', '%declare', '%override', '%extend'):
+                raise ValueError(f"Directiva {value} no soportada en la línea {line}")
+            directive = value
+            continue
+
+        if kind == 'definition':
+            close_definition()
+            name = value.lstrip('?!').split('.')[0]
+            current = terminal = None
+            lexemes, terminal_body = [], []
+            if name.lstrip('_')[:1].isupper():
+                terminal = name
+            else:
+                current = name
+            continue
+
+        if kind == 'newline' or (kind == 'punct' and value == ':'):
+            continue
+
+        if terminal is not None:
+            terminal_body.append((kind, _unquote(value.rstrip('i')) if kind == 'string' else value))
+            continue
+        if current is None:
+            raise ValueError(f"Se esperaba una definición en la línea {line}")
+
+        if skip_alias:
+            skip_alias = False
+            if kind == 'name':
+                continue
+        if kind == 'arrow':
+            skip_alias = True
+        elif kind == 'name':
+            lexemes.append(('symbol', value))
+        elif kind == 'string':
+            lexemes.append(('symbol', _unquote(value.rstrip('i'))))
+        elif kind == 'regexp':
+            lexemes.append(('symbol', value))
+        elif value == '|':
+            lexemes.append(('bar', None))
+        elif value in '([':
+            lexemes.append(('open', None))
+        elif value == ')':
+            lexemes.append(('close', None))
+        elif value == ']':
+            lexemes.append(('close', '?'))
+        elif value in '*+?':
+            # El operador se aplica al símbolo o al grupo recién cerrado
+            if lexemes and lexemes[-1] == ('close', None):
+                lexemes[-1] = ('close', value)
+            else:
+                lexemes.append(('op', value))
+        elif value == '~':
+            raise ValueError(f"Repeticiones con ~ no soportadas (línea {line})")
+        elif value == '{':
+            raise ValueError(f"Plantillas de reglas no soportadas (línea {line})")
+        else:
+            raise ValueError(f"Símbolo inesperado {value!r} en la línea {line}")
+
+    close_definition()
+
+    # Los literales anónimos toman el nombre del terminal definido igual
+    rules = [(left, [literal_names.get(symbol, symbol) for symbol in right], None)
+             for left, right, _ in rules]
+    helper_rules = [(left, [literal_names.get(symbol, symbol) for symbol in right], None)
+                    for left, right in desugarer.productions]
+
+    start_symbol = 'start' if any(left == 'start' for left, _, _ in rules) else None
+    return _finish('lark', start_symbol, rules + helper_rules, {}, dict(desugarer.sources))
+
+
+# ---------------------------------------------------------------------------
+
+# Importador por extensión de archivo
+IMPORTERS: Dict[str, Callable[[str], ImportedGrammar]] = {
+    '.y': import_bison,
+    '.yy': import_bison,
+    '.lark': import_lark
+}
+
+
+def import_grammar_file(path: str) -> ImportedGrammar:
+    """
+    Importa una gramática según la extensión del archivo
+
+    Raises:
+        ValueError: Si la extensión no tiene importador o el archivo no es válido
+    """
+    extension = os.path.splitext(path)[1]
+    if extension not in IMPORTERS:
+        raise ValueError(f"Formato no soportado: {extension} (se aceptan {', '.join(IMPORTERS)})")
+    with open(path, encoding='utf-8') as f:
+        return IMPORTERS[extension](f.read())
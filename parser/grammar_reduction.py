@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Reducción de gramáticas: elimina producciones duplicadas, improductivas e inalcanzables
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+
+@dataclass
+class ReductionReport:
+    """
+    Qué se eliminó de la gramática antes de construir el autómata
+
+    Los números de producción son los originales: la posición de la
+    alternativa en el texto, contando desde 1 como en la gramática aumentada
+    sin reducir (la 0 es S' -> S).
+
+    Attributes:
+        duplicates: Alternativas repetidas, con el número de la que se conserva
+        undefined: Símbolos usados como no terminales que no tienen producciones
+        unproductive: No terminales que no derivan ninguna cadena de terminales
+        unreachable: No terminales que no se alcanzan desde el símbolo inicial
+        removed: Todas las producciones eliminadas con el motivo
+    """
+    duplicates: List[Dict[str, Any]] = field(default_factory=list)
+    undefined: List[str] = field(default_factory=list)
+    unproductive: List[str] = field(default_factory=list)
+    unreachable: List[str] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """Indica si se eliminó alguna producción"""
+        return bool(self.removed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Reporte como diccionario serializable a JSON"""
+        return {
+            'duplicates': [dict(d) for d in self.duplicates],
+            'undefined': list(self.undefined),
+            'unproductive': list(self.unproductive),
+            'unreachable': list(self.unreachable),
+            'removed': [dict(r) for r in self.removed]
+        }
+
+
+def _text(prod) -> str:
+    return f"{prod.left} -> {' '.join(prod.right) if prod.right else 'ε'}"
+
+
+def reduce_grammar(productions: List, start_symbol: str,
+                   is_non_terminal: Callable[[str], bool]) -> Tuple[List, ReductionReport]:
+    """
+    Elimina las producciones que no aportan al lenguaje
+
+    En orden: alternativas duplicadas, producciones con símbolos
+    improductivos (incluidos no terminales sin definir) y producciones de
+    no terminales inalcanzables desde el inicial. Primero improductivos y
+    después inalcanzables: al revés podrían quedar símbolos inalcanzables.
+
+    Args:
+        productions: Producciones antes de aumentar la gramática, con su
+            number igual a la posición en el texto (0, 1, ...)
+        start_symbol: Símbolo inicial
+        is_non_terminal: Criterio del parser para distinguir no terminales
+
+    Returns:
+        Tupla (producciones conservadas en su orden original, reporte)
+
+    Raises:
+        ValueError: Si el símbolo inicial no deriva ninguna cadena
+    """
+    report = ReductionReport()
+    removed: Dict[int, str] = {}
+
+    # 1. Duplicados: misma parte izquierda y misma secuencia derecha
+    first_seen: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+    for prod in productions:
+        key = (prod.left, tuple(prod.right))
+        if key in first_seen:
+            removed[prod.number] = 'duplicate'
+            report.duplicates.append({'number': prod.number + 1, 'production': _text(prod),
+                                      'duplicate_of': first_seen[key] + 1})
+        else:
+            first_seen[key] = prod.number
+    remaining = [prod for prod in productions if prod.number not in removed]
+
+    # 2. Improductivos: punto fijo de los no terminales que derivan terminales
+    defined = {prod.left for prod in remaining}
+    report.undefined = sorted({symbol for prod in remaining for symbol in prod.right
+                               if is_non_terminal(symbol) and symbol not in defined})
+
+    productive: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for prod in remaining:
+            if prod.left not in productive and all(
+                    symbol in productive or not is_non_terminal(symbol) for symbol in prod.right):
+                productive.add(prod.left)
+                changed = True
+
+    if start_symbol not in productive:
+        raise ValueError(f"La gramática no genera ninguna cadena: {start_symbol} es improductivo")
+
+    report.unproductive = sorted(defined - productive)
+    for prod in remaining:
+        if prod.left not in productive or any(
+                is_non_terminal(symbol) and symbol not in productive for symbol in prod.right):
+            removed[prod.number] = 'unproductive'
+    remaining = [prod for prod in remaining if prod.number not in removed]
+
+    # 3. Inalcanzables desde el símbolo inicial
+    by_left: Dict[str, List] = {}
+    for prod in remaining:
+        by_left.setdefault(prod.left, []).append(prod)
+
+    reachable = {start_symbol}
+    pending = [start_symbol]
+    while pending:
+        for prod in by_left.get(pending.pop(), []):
+            for symbol in prod.right:
+                if is_non_terminal(symbol) and symbol not in reachable:
+                    reachable.add(symbol)
+                    pending.append(symbol)
+
+    report.unreachable = sorted(set(by_left) - reachable)
+    for prod in remaining:
+        if prod.left not in reachable:
+            removed[prod.number] = 'unreachable'
+
+    report.removed = [{'number': prod.number + 1, 'production': _text(prod), 'reason': removed[prod.number]}
+                      for prod in productions if prod.number in removed]
+    return [prod for prod in productions if prod.number not in removed], report
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Reconstrucción incremental: diferencias entre dos versiones de una gramática
+Compiladores - UTEC - Puntos Extras Examen 2
+
+parse_grammar(texto, previous=parser_anterior) compara las producciones
+nuevas con las del parser anterior y reutiliza todo lo que no cambió:
+
+- FIRST solo se recalcula para los no terminales que dependen (directa o
+  transitivamente) de uno cuyas producciones cambiaron.
+- FOLLOW solo para los no terminales que aparecen en producciones
+  agregadas o quitadas, junto a un símbolo cuyo FIRST cambió, o que
+  heredan el FOLLOW de alguno de ellos.
+- Un estado LR(1) anterior se reutiliza (sin recalcular su clausura ni sus
+  gotos) si ninguno de sus items expande un no terminal modificado ni
+  depende de un FIRST que cambió.
+"""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class GrammarDiff:
+    """
+    Diferencia entre las gramáticas aumentadas de dos construcciones
+
+    Attributes:
+        production_map: Número anterior -> número nuevo de cada producción conservada
+        added: Números (nuevos) de las producciones agregadas
+        removed: Números (anteriores) de las producciones quitadas
+        changed: No terminales cuyo conjunto de producciones cambió
+        first_changed: Símbolos cuyo FIRST cambió (se completa al calcular FIRST)
+        first_recomputed: No terminales cuyo FIRST se recalculó
+        follow_recomputed: No terminales cuyo FOLLOW se recalculó
+        states_reused: Estados LR(1) tomados de la construcción anterior
+    """
+    production_map: Dict[int, int] = field(default_factory=dict)
+    added: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    changed: Set[str] = field(default_factory=set)
+    first_changed: Set[str] = field(default_factory=set)
+    first_recomputed: Set[str] = field(default_factory=set)
+    follow_recomputed: Set[str] = field(default_factory=set)
+    states_reused: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumen serializable a JSON"""
+        return {
+            'added': len(self.added),
+            'removed': len(self.removed),
+            'changed': sorted(self.changed),
+            'first_recomputed': len(self.first_recomputed),
+            'follow_recomputed': len(self.follow_recomputed),
+            'states_reused': self.states_reused
+        }
+
+
+@dataclass
+class BuildSnapshot:
+    """
+    Lo que se reutiliza de una construcción anterior
+
+    Copias superficiales: permiten pasar como previous al mismo parser que
+    se reconstruye (parse_grammar vacía sus contenedores al empezar).
+    states y transitions son las del autómata LR(1) canónico, o None si el
+    parser no lo conserva (LALR(1) directo); lr0_states y lr0_transitions,
+    las del autómata LR(0) de los parsers LR(0)/SLR(1) (None en los demás).
+    """
+    grammar: List
+    non_terminals: Set[str]
+    first_sets: Dict[str, Set[str]]
+    follow_sets: Dict[str, Set[str]]
+    states: Optional[List[Set]]
+    transitions: Optional[Dict[Tuple[int, str], int]]
+    lr0_states: Optional[List[Set]] = None
+    lr0_transitions: Optional[Dict[Tuple[int, str], int]] = None
+
+    @classmethod
+    def of(cls, parser) -> Optional['BuildSnapshot']:
+        """Snapshot de un parser ya construido (None si no tiene gramática)"""
+        if not parser.grammar or not parser.states:
+            return None
+        automaton = parser._canonical_automaton()
+        states, transitions = automaton if automaton is not None else (None, None)
+        lr0_automaton = parser._lr0_automaton()
+        lr0_states, lr0_transitions = lr0_automaton if lr0_automaton is not None else (None, None)
+        return cls(
+            grammar=list(parser.grammar),
+            non_terminals=set(parser.non_terminals),
+            first_sets={symbol: set(first) for symbol, first in parser.first_sets.items()},
+            follow_sets={symbol: set(follow) for symbol, follow in parser.follow_sets.items()},
+            states=list(states) if states is not None else None,
+            transitions=dict(transitions) if transitions is not None else None,
+            lr0_states=list(lr0_states) if lr0_states is not None else None,
+            lr0_transitions=dict(lr0_transitions) if lr0_transitions is not None else None
+        )
+
+
+def _key(prod) -> Tuple:
+    return prod.left, tuple(prod.right), prod.precedence
+
+
+def diff_grammars(old_grammar: List, new_grammar: List) -> GrammarDiff:
+    """
+    Empareja las producciones de dos gramáticas aumentadas
+
+    Las producciones iguales (misma parte izquierda, derecha y %prec) se
+    emparejan en orden; las restantes son agregadas o quitadas.
+    """
+    diff = GrammarDiff()
+    pending: Dict[Tuple, deque] = defaultdict(deque)
+    for prod in old_grammar:
+        pending[_key(prod)].append(prod.number)
+
+    for prod in new_grammar:
+        candidates = pending.get(_key(prod))
+        if candidates:
+            diff.production_map[candidates.popleft()] = prod.number
+        else:
+            diff.added.append(prod.number)
+            diff.changed.add(prod.left)
+
+    for prod in old_grammar:
+        if prod.number not in diff.production_map:
+            diff.removed.append(prod.number)
+            diff.changed.add(prod.left)
+    return diff
+
+
+def _nullable(grammar: List) -> Set[str]:
+    """No terminales que derivan ε (punto fijo simple)"""
+    nullable: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for prod in grammar:
+            if prod.left not in nullable and all(symbol in nullable for symbol in prod.right):
+                nullable.add(prod.left)
+                changed = True
+    return nullable
+
+
+def first_affected(grammar: List, non_terminals: Set[str], changed: Set[str]) -> Set[str]:
+    """
+    No terminales cuyo FIRST puede cambiar
+
+    FIRST(A) depende de B si B aparece en una producción de A precedido
+    solo por símbolos anulables; se propaga hacia atrás desde los cambiados.
+    """
+    nullable = _nullable(grammar)
+    users: Dict[str, Set[str]] = defaultdict(set)
+    for prod in grammar:
+        for symbol in prod.right:
+            if symbol in non_terminals:
+                users[symbol].add(prod.left)
+            if symbol not in nullable:
+                break
+
+    affected = {symbol for symbol in changed if symbol in non_terminals}
+    pending = list(affected)
+    while pending:
+        for user in users[pending.pop()]:
+            if user not in affected:
+                affected.add(user)
+                pending.append(user)
+    return affected
+
+
+def follow_affected(grammar: List, non_terminals: Set[str], diff: GrammarDiff,
+                    old_grammar: List, nullable_of) -> Set[str]:
+    """
+    No terminales cuyo FOLLOW puede cambiar
+
+    Semillas: los que aparecen en producciones agregadas o quitadas y los
+    que aparecen antes de un símbolo cuyo FIRST cambió. Se propaga a los
+    que heredan FOLLOW (B al final, salvo anulables, de una producción de A).
+    """
+    seeds: Set[str] = set()
+    for number in diff.added:
+        seeds.update(s for s in grammar[number].right if s in non_terminals)
+    for number in diff.removed:
+        seeds.update(s for s in old_grammar[number].right if s in non_terminals)
+    if diff.first_changed:
+        for prod in grammar:
+            for i, symbol in enumerate(prod.right):
+                if symbol in non_terminals and any(s in diff.first_changed for s in prod.right[i + 1:]):
+                    seeds.add(symbol)
+
+    inherits: Dict[str, Set[str]] = defaultdict(set)
+    for prod in grammar:
+        for symbol in reversed(prod.right):
+            if symbol in non_terminals:
+                inherits[prod.left].add(symbol)
+            if not nullable_of(symbol):
+                break
+
+    affected = set(seeds)
+    pending = list(seeds)
+    while pending:
+        for heir in inherits[pending.pop()]:
+            if heir not in affected:
+                affected.add(heir)
+                pending.append(heir)
+    return affected
@@ -10,27 +10,140 @@ from typing import List, Set, Dict, Tuple, Any
 # Importar desde el mismo directorio si se ejecuta directamente
 try:
     from parser.lr1_parser import LR1Parser, LR1Item, Production
+    from parser.state_store import KernelStates, kernel_of
 except ModuleNotFoundError:
     from lr1_parser import LR1Parser, LR1Item, Production
+    from state_store import KernelStates, kernel_of
 
 
 class LALR1Parser(LR1Parser):
     """Parser LALR(1) que fusiona estados LR(1) con el mismo núcleo"""
 
-    def __init__(self):
+    parser_type_name = 'LALR(1)'
+
+    def __init__(self, direct: bool = False):
+        """
+        Inicializa el parser
+
+        Args:
+            direct: Si es True, construye los estados LALR(1) directamente
+                fusionando por núcleo durante la exploración, sin materializar
+                el autómata LR(1) canónico (mucho más barato en gramáticas grandes)
+        """
         super().__init__()
+        self.direct = direct
         self.lr1_to_lalr_map: Dict[int, int] = {}  # Mapeo de estados LR(1) a LALR(1)
         self.lalr_states: List[Set[LR1Item]] = []  # Estados LALR(1) fusionados
         self.lalr_transitions: Dict[Tuple[int, str], int] = {}
 
+        # Autómata LR(1) canónico previo a la fusión, base de las
+        # reconstrucciones incrementales. Ocupa tanto como el LALR(1), así que
+        # solo se conserva con keep_canonical (nunca en modo directo); sin él,
+        # reconstruir con previous=este parser reutiliza solo FIRST/FOLLOW
+        self.keep_canonical = False
+        self.lr1_states: List[Set[LR1Item]] = []
+        self.lr1_transitions: Dict[Tuple[int, str], int] = {}
+
+    def _canonical_automaton(self):
+        """Autómata LR(1) canónico conservado antes de fusionar (None en modo directo)"""
+        if not self.lr1_states:
+            return None
+        return self.lr1_states, self.lr1_transitions
+
     def _build_lr1_automaton(self):
         """Construye el autómata LR(1) y luego lo convierte a LALR(1)"""
+        if self.direct:
+            self._build_lalr1_automaton_direct()
+            return
+
         # Primero construir autómata LR(1) completo
         super()._build_lr1_automaton()
 
         # Luego fusionar estados con el mismo núcleo
+        self._report_progress('merge_states', states=len(self.states))
         self._merge_states_with_same_core()
 
+    def _build_lalr1_automaton_direct(self):
+        """
+        Construye el autómata LALR(1) fusionando estados por núcleo al vuelo
+
+        Cada estado se identifica por el núcleo de su kernel. Cuando un goto
+        llega a un núcleo ya existente con lookaheads nuevos, se agregan al
+        kernel y el estado se vuelve a procesar para propagarlos. El resultado
+        es el mismo autómata que fusionar el LR(1) canónico, pero el número de
+        estados explorados es el del autómata LR(0).
+        """
+        kernels: List[Set[LR1Item]] = [{LR1Item(0, 0, '$')}]
+        core_map: Dict[frozenset, int] = {self._get_core(kernels[0]): 0}
+        self.states = [set()]
+        self.transitions = {}
+
+        state_queue = deque([0])
+        queued = {0}
+
+        tracker = self._budget_tracker
+        if tracker is not None:
+            tracker.add_state(len(kernels[0]))
+
+        while state_queue:
+            current_state_num = state_queue.popleft()
+            queued.discard(current_state_num)
+
+            current_state = self._closure(kernels[current_state_num])
+            self.states[current_state_num] = current_state
+
+            # Agrupar items por símbolo después del punto
+            symbol_groups = defaultdict(set)
+
+            for item in current_state:
+                if item.dot_position < len(self.grammar[item.production].right):
+                    next_symbol = self.grammar[item.production].right[item.dot_position]
+                    new_item = LR1Item(item.production, item.dot_position + 1, item.lookahead)
+                    symbol_groups[next_symbol].add(new_item)
+
+            for symbol, kernel in symbol_groups.items():
+                core = self._get_core(kernel)
+                target = core_map.get(core)
+
+                if target is None:
+                    # Nuevo núcleo: nuevo estado
+                    self.stats.state_map_misses += 1
+                    target = len(kernels)
+                    kernels.append(set(kernel))
+                    self.states.append(set())
+                    core_map[core] = target
+                    state_queue.append(target)
+                    queued.add(target)
+
+                    if tracker is not None:
+                        tracker.add_state(len(kernel), len(state_queue))
+
+                else:
+                    self.stats.state_map_hits += 1
+
+                    if not kernel <= kernels[target]:
+                        # Núcleo conocido con lookaheads nuevos: propagarlos
+                        kernels[target].update(kernel)
+                        if target not in queued:
+                            state_queue.append(target)
+                            queued.add(target)
+
+                self.transitions[(current_state_num, symbol)] = target
+
+            if current_state_num % 32 == 0:
+                self._report_progress('automaton', states=len(self.states),
+                                      queue=len(state_queue))
+
+        self.lalr_states = self.states
+        self.lalr_transitions = self.transitions
+
+    def _compact_states(self):
+        """Compacta los estados LALR(1) y también el autómata LR(1) conservado"""
+        super()._compact_states()
+        if self.lr1_states:
+            self.lr1_states = KernelStates([kernel_of(state) for state in self.lr1_states],
+                                           self._closure_of_kernel)
+
     def _get_core(self, state: Set[LR1Item]) -> frozenset:
         """
         Obtiene el núcleo de un estado (items sin considerar lookahead)
@@ -87,7 +200,15 @@ class LALR1Parser(LR1Parser):
             else:
                 self.lalr_transitions[(from_lalr, symbol)] = to_lalr
 
-        # Reemplazar estados y transiciones con versiones LALR
+        # Reemplazar estados y transiciones con versiones LALR (el LR(1) se
+        # conserva solo si se esperan reconstrucciones incrementales)
+        if self.keep_canonical:
+            self.lr1_states = self.states
+            self.lr1_transitions = self.transitions
+        else:
+            self.lr1_states = []
+            self.lr1_transitions = {}
+            self.lr1_to_lalr_map = {}
         self.states = self.lalr_states
         self.transitions = self.lalr_transitions
 
@@ -98,6 +219,8 @@ class LALR1Parser(LR1Parser):
         """Construye la tabla de parsing ACTION/GOTO para LALR(1)"""
         self.action_table.clear()
         self.goto_table.clear()
+        self._precedence_errors = set()
+        self.conflicts = []
 
         for state_num, state in enumerate(self.states):
             for item in state:
@@ -117,9 +240,10 @@ class LALR1Parser(LR1Parser):
                                 # Verificar conflictos shift/reduce o shift/shift
                                 existing = self.action_table[key]
                                 new_action = f's{next_state}'
-                                if existing != new_action:
+                                if existing != new_action and not self._resolve_conflict(key, existing, new_action):
                                     # Conflicto detectado en LALR(1)
                                     # Por ahora preferir shift sobre reduce
+                                    self._record_conflict(key, existing, new_action)
                                     if not existing.startswith('s'):
                                         self.action_table[key] = new_action
                             else:
@@ -140,9 +264,10 @@ class LALR1Parser(LR1Parser):
                             # Conflicto shift/reduce o reduce/reduce
                             existing = self.action_table[key]
                             new_action = f'r{item.production}'
-                            if existing != new_action:
+                            if existing != new_action and not self._resolve_conflict(key, existing, new_action):
                                 # Conflicto en LALR(1)
                                 # Preferir shift sobre reduce (por defecto)
+                                self._record_conflict(key, existing, new_action)
                                 if not existing.startswith('s'):
                                     # Si ambos son reduce, tomar el de menor número
                                     if existing.startswith('r') and new_action.startswith('r'):
@@ -153,6 +278,8 @@ class LALR1Parser(LR1Parser):
                         else:
                             self.action_table[key] = f'r{item.production}'
 
+        self._drop_precedence_errors()
+
     def get_comparison_info(self) -> Dict[str, Any]:
         """Retorna información comparativa entre LR(1) y LALR(1)"""
         return {
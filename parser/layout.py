@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Motor de layout por capas (Sugiyama) en Python puro
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Alternativa al binario dot de Graphviz: calcula coordenadas de nodos y
+aristas en el mismo proceso y puede generar SVG o JSON para el frontend.
+"""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterator, List, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+# Métricas aproximadas de una fuente monoespaciada de 12px
+CHAR_WIDTH = 7.2
+LINE_HEIGHT = 15.0
+NODE_PADDING = 10.0
+
+# Direcciones de las capas (las mismas de Graphviz)
+RANKDIRS = ('LR', 'TB', 'RL', 'BT')
+
+
+def text_size(lines: Sequence[str]) -> Tuple[float, float]:
+    """Ancho y alto de un bloque de texto monoespaciado con padding"""
+    longest = max((len(line) for line in lines), default=0)
+    return (longest * CHAR_WIDTH + 2 * NODE_PADDING,
+            max(len(lines), 1) * LINE_HEIGHT + 2 * NODE_PADDING)
+
+
+@dataclass
+class LayoutEdge:
+    """Arista del layout: secuencia de puntos desde el origen hasta el destino"""
+    source: Hashable
+    target: Hashable
+    label: str = ''
+    points: List[Tuple[float, float]] = field(default_factory=list)
+
+
+class LayeredLayout:
+    """
+    Layout jerárquico por capas (algoritmo de Sugiyama)
+
+    Fases:
+        1. Capas por distancia BFS desde las fuentes (para un autómata, la
+           distancia desde el estado inicial). Las aristas hacia una capa
+           anterior quedan invertidas, lo que elimina los ciclos sin un paso
+           aparte, y las aristas hacia adelante cruzan exactamente una capa.
+        2. Nodos ficticios para las aristas invertidas de hasta max_span
+           capas; las más largas se dibujan directas para que el número de
+           nodos ficticios no crezca con la profundidad del grafo
+        3. Reducción de cruces con barycenter (barridos alternos) y conteo
+           de cruces O(E log V) para quedarse con el mejor orden
+        4. Coordenadas: empaquetado por capa y refinamiento hacia la posición
+           promedio de los vecinos respetando el orden y la separación
+    """
+
+    def __init__(self, rankdir: str = 'LR', node_sep: float = 20.0,
+                 rank_sep: float = 60.0, iterations: int = 12, max_span: int = 8):
+        """
+        Args:
+            rankdir: 'LR' (capas de izquierda a derecha), 'TB' (de arriba a abajo),
+                'RL' o 'BT' (las mismas en sentido inverso)
+            node_sep: Separación mínima entre nodos de la misma capa
+            rank_sep: Separación entre capas
+            iterations: Máximo de barridos de reducción de cruces
+            max_span: Máximo de capas que cruza una arista con nodos ficticios
+        """
+        if rankdir not in RANKDIRS:
+            raise ValueError(f"rankdir no válido: {rankdir}. Opciones: {', '.join(RANKDIRS)}")
+
+        self.rankdir = rankdir
+        self._horizontal = rankdir in ('LR', 'RL')
+        self._reversed = rankdir in ('RL', 'BT')
+        self.node_sep = node_sep
+        self.rank_sep = rank_sep
+        self.iterations = iterations
+        self.max_span = max_span
+
+        self.crossings = 0  # Cruces del orden final (sin contar aristas directas)
+
+    def run(self, nodes: Dict[Hashable, Tuple[float, float]],
+            edges: Sequence[Tuple[Hashable, Hashable, str]]
+            ) -> Tuple[Dict[Hashable, Tuple[float, float]], List[LayoutEdge]]:
+        """
+        Calcula el layout
+
+        Args:
+            nodes: id -> (ancho, alto), en el orden preferido
+            edges: Lista de (origen, destino, etiqueta)
+
+        Returns:
+            Tupla (centros, aristas): centros es id -> (x, y) y cada arista
+            trae su polilínea recortada al borde de los nodos
+        """
+        self._sizes = dict(nodes)
+
+        # Aristas paralelas se fusionan en una sola con las etiquetas unidas
+        merged: Dict[Tuple[Hashable, Hashable], List[str]] = {}
+        for source, target, label in edges:
+            merged.setdefault((source, target), []).append(label)
+        edge_list = [(s, t, ', '.join(l for l in labels if l))
+                     for (s, t), labels in merged.items()]
+
+        self._assign_layers(list(nodes), [(s, t) for s, t, _ in edge_list if s != t])
+        chains = self._insert_dummies([(s, t) for s, t, _ in edge_list if s != t])
+        order = self._order_layers()
+        positions = self._assign_coordinates(order)
+
+        layout_edges = []
+        for source, target, label in edge_list:
+            if source == target:
+                points = self._loop_points(positions[source], source)
+            elif self._layer[source] == self._layer[target]:
+                points = self._clip(self._flat_points(positions, source, target), source, target)
+            else:
+                points = [positions[n] for n in chains[(source, target)]]
+                points = self._clip(points, source, target)
+            layout_edges.append(LayoutEdge(source, target, label, points))
+
+        centers = {node: positions[node] for node in nodes}
+        return centers, layout_edges
+
+    # ------------------------------------------------------------------
+    # Fase 1: capas
+    # ------------------------------------------------------------------
+
+    def _assign_layers(self, nodes, edges):
+        """Capa de cada nodo por BFS desde las fuentes (o el primer nodo pendiente)"""
+        successors = defaultdict(list)
+        indegree = {node: 0 for node in nodes}
+        for source, target in edges:
+            successors[source].append(target)
+            indegree[target] += 1
+
+        layer: Dict[Hashable, int] = {}
+        queue = deque()
+        for node in nodes:
+            if indegree[node] == 0:
+                layer[node] = 0
+                queue.append(node)
+
+        # Componentes sin fuentes (solo ciclos): se parte del primer nodo pendiente
+        pending = iter(nodes)
+        while True:
+            while queue:
+                node = queue.popleft()
+                for child in successors[node]:
+                    if child not in layer:
+                        layer[child] = layer[node] + 1
+                        queue.append(child)
+
+            root = next((node for node in pending if node not in layer), None)
+            if root is None:
+                break
+            layer[root] = 0
+            queue.append(root)
+
+        self._layer = layer
+
+    # ------------------------------------------------------------------
+    # Fase 2: nodos ficticios
+    # ------------------------------------------------------------------
+
+    def _insert_dummies(self, edges):
+        """Divide las aristas largas en cadenas de aristas entre capas consecutivas"""
+        self._down = defaultdict(list)  # vecinos en la capa siguiente
+        self._up = defaultdict(list)    # vecinos en la capa anterior
+        chains = {}
+        dummy_count = 0
+
+        for source, target in edges:
+            upper, lower = (source, target) if self._layer[source] < self._layer[target] else (target, source)
+            span = self._layer[lower] - self._layer[upper]
+            if span == 0:
+                continue
+
+            chain = [upper]
+            if span <= self.max_span:
+                for step in range(self._layer[upper] + 1, self._layer[lower]):
+                    dummy = ('__dummy__', dummy_count)
+                    dummy_count += 1
+                    self._layer[dummy] = step
+                    self._sizes[dummy] = (0.0, 0.0)
+                    chain.append(dummy)
+            chain.append(lower)
+
+            # Las aristas directas (más largas que max_span) no participan en el orden
+            if len(chain) == span + 1:
+                for a, b in zip(chain, chain[1:]):
+                    self._down[a].append(b)
+                    self._up[b].append(a)
+
+            chains[(source, target)] = chain if upper == source else chain[::-1]
+
+        return chains
+
+    # ------------------------------------------------------------------
+    # Fase 3: orden dentro de cada capa
+    # ------------------------------------------------------------------
+
+    def _order_layers(self) -> List[List[Hashable]]:
+        """Orden inicial por DFS y barridos barycenter conservando el mejor"""
+        num_layers = max(self._layer.values(), default=-1) + 1
+        order: List[List[Hashable]] = [[] for _ in range(num_layers)]
+
+        # Orden inicial: recorrido en profundidad desde las fuentes
+        visited = set()
+        for node in self._layer:
+            if node in visited or self._up[node]:
+                continue
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                if current in visited:
+                    continue
+                visited.add(current)
+                order[self._layer[current]].append(current)
+                stack.extend(reversed(self._down[current]))
+        for node in self._layer:
+            if node not in visited:
+                order[self._layer[node]].append(node)
+
+        best = [list(layer) for layer in order]
+        best_crossings = self._count_crossings(order)
+
+        stale = 0
+        for iteration in range(self.iterations):
+            if best_crossings == 0 or stale >= 4:
+                break
+
+            if iteration % 2 == 0:
+                for i in range(1, num_layers):
+                    self._sort_by_barycenter(order, i, order[i - 1], self._up)
+            else:
+                for i in range(num_layers - 2, -1, -1):
+                    self._sort_by_barycenter(order, i, order[i + 1], self._down)
+
+            crossings = self._count_crossings(order)
+            if crossings < best_crossings:
+                best_crossings = crossings
+                best = [list(layer) for layer in order]
+                stale = 0
+            else:
+                stale += 1
+
+        self.crossings = best_crossings
+        return best
+
+    def _sort_by_barycenter(self, order, i, fixed_layer, neighbors):
+        """Reordena la capa i según la posición media de sus vecinos en la capa fija"""
+        fixed_pos = {node: pos for pos, node in enumerate(fixed_layer)}
+        keyed = []
+        for pos, node in enumerate(order[i]):
+            adjacent = [fixed_pos[n] for n in neighbors[node] if n in fixed_pos]
+            barycenter = sum(adjacent) / len(adjacent) if adjacent else pos
+            keyed.append((barycenter, pos, node))
+        keyed.sort(key=lambda k: (k[0], k[1]))
+        order[i] = [node for _, _, node in keyed]
+
+    def _count_crossings(self, order) -> int:
+        """Cruces totales: inversiones entre capas consecutivas (árbol de Fenwick)"""
+        total = 0
+        for upper, lower in zip(order, order[1:]):
+            lower_pos = {node: pos for pos, node in enumerate(lower)}
+            targets = []
+            for node in upper:
+                targets.extend(sorted(lower_pos[n] for n in self._down[node] if n in lower_pos))
+
+            tree = [0] * (len(lower) + 1)
+            seen = 0
+            for target in targets:
+                # Cantidad de aristas ya vistas con destino mayor que target
+                index, smaller_or_equal = target + 1, 0
+                while index > 0:
+                    smaller_or_equal += tree[index]
+                    index -= index & -index
+                total += seen - smaller_or_equal
+
+                index = target + 1
+                while index <= len(lower):
+                    tree[index] += 1
+                    index += index & -index
+                seen += 1
+        return total
+
+    # ------------------------------------------------------------------
+    # Fase 4: coordenadas
+    # ------------------------------------------------------------------
+
+    def _breadth(self, node) -> float:
+        """Tamaño del nodo a lo largo de la capa"""
+        width, height = self._sizes[node]
+        return height if self._horizontal else width
+
+    def _depth(self, node) -> float:
+        """Tamaño del nodo en la dirección entre capas"""
+        width, height = self._sizes[node]
+        return width if self._horizontal else height
+
+    def _assign_coordinates(self, order) -> Dict[Hashable, Tuple[float, float]]:
+        """Posiciones dentro de la capa (refinadas hacia los vecinos) y entre capas"""
+        along: Dict[Hashable, float] = {}
+        for layer in order:
+            pos = 0.0
+            for node in layer:
+                half = self._breadth(node) / 2
+                along[node] = pos + half
+                pos += 2 * half + self.node_sep
+
+        for sweep in range(4):
+            layer_indices = range(len(order)) if sweep % 2 == 0 else range(len(order) - 1, -1, -1)
+            for i in layer_indices:
+                layer = order[i]
+                desired = []
+                for node in layer:
+                    adjacent = [along[n] for n in self._up[node]] + [along[n] for n in self._down[node]]
+                    desired.append(sum(adjacent) / len(adjacent) if adjacent else along[node])
+
+                # Respetar el orden y la separación mínima (pasada ida y vuelta)
+                for k in range(1, len(layer)):
+                    gap = (self._breadth(layer[k - 1]) + self._breadth(layer[k])) / 2 + self.node_sep
+                    desired[k] = max(desired[k], desired[k - 1] + gap)
+                for k in range(len(layer) - 2, -1, -1):
+                    gap = (self._breadth(layer[k]) + self._breadth(layer[k + 1])) / 2 + self.node_sep
+                    desired[k] = min(desired[k], desired[k + 1] - gap)
+
+                for node, value in zip(layer, desired):
+                    along[node] = value
+
+        # Normalizar para que todo quede en coordenadas positivas
+        min_along = min((along[n] - self._breadth(n) / 2 for n in along), default=0.0)
+
+        centers = []
+        offset = self.rank_sep / 2
+        for layer in order:
+            depth = max((self._depth(n) for n in layer), default=0.0)
+            centers.append(offset + depth / 2)
+            offset += depth + self.rank_sep
+
+        # RL y BT: las capas se recorren desde el extremo opuesto
+        if self._reversed:
+            centers = [offset - self.rank_sep / 2 - c for c in centers]
+
+        positions = {}
+        for layer, center in zip(order, centers):
+            for node in layer:
+                value = along[node] - min_along + self.node_sep
+                positions[node] = (center, value) if self._horizontal else (value, center)
+
+        return positions
+
+    # ------------------------------------------------------------------
+    # Aristas
+    # ------------------------------------------------------------------
+
+    def _clip(self, points, source, target):
+        """Recorta los extremos de la polilínea al borde de los rectángulos"""
+        if len(points) < 2:
+            return points
+        points = list(points)
+        points[0] = self._border_point(points[0], points[1], self._sizes[source])
+        points[-1] = self._border_point(points[-1], points[-2], self._sizes[target])
+        return points
+
+    @staticmethod
+    def _border_point(center, toward, size):
+        """Intersección del segmento center->toward con el borde del rectángulo"""
+        cx, cy = center
+        dx, dy = toward[0] - cx, toward[1] - cy
+        half_w, half_h = size[0] / 2, size[1] / 2
+        if (dx == 0 and dy == 0) or (half_w == 0 and half_h == 0):
+            return center
+        scale = min(half_w / abs(dx) if dx else float('inf'),
+                    half_h / abs(dy) if dy else float('inf'))
+        return (cx + dx * scale, cy + dy * scale)
+
+    def _flat_points(self, positions, source, target):
+        """Arista entre nodos de la misma capa: un codo hacia el espacio entre capas"""
+        (x1, y1), (x2, y2) = positions[source], positions[target]
+        offset = max(self._depth(source), self._depth(target)) / 2 + self.rank_sep / 2
+        if self._reversed:
+            offset = -offset
+        if self._horizontal:
+            bend = ((x1 + x2) / 2 + offset, (y1 + y2) / 2)
+        else:
+            bend = ((x1 + x2) / 2, (y1 + y2) / 2 + offset)
+        return [positions[source], bend, positions[target]]
+
+    def _loop_points(self, center, node):
+        """Bucle sobre el borde superior del nodo para aristas a sí mismo"""
+        width, height = self._sizes[node]
+        cx, top = center[0], center[1] - height / 2
+        return [(cx - 10, top), (cx - 15, top - 25), (cx + 15, top - 25), (cx + 10, top)]
+
+
+def iter_layout_svg(layout: Dict) -> Iterator[str]:
+    """
+    Genera SVG línea por línea a partir del resultado de un layout serializado
+
+    Args:
+        layout: Diccionario con 'width', 'height', 'nodes' (con x, y, width,
+            height, lines, color y shape) y 'edges' (con points y label)
+
+    Yields:
+        Una línea por elemento SVG, terminada en '\\n'
+    """
+    width, height = layout['width'], layout['height']
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+           f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="Courier, monospace" font-size="12">\n')
+    yield ('<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+           'markerHeight="8" orient="auto-start-reverse"><path d="M 0 0 L 10 5 L 0 10 z"/></marker></defs>\n')
+
+    for edge in layout['edges']:
+        points = edge['points']
+        if len(points) < 2:
+            continue
+        path = ' '.join(f'{x:.1f},{y:.1f}' for x, y in points)
+        color = edge.get('color', 'black')
+        yield f'<polyline points="{path}" fill="none" stroke="{color}" marker-end="url(#arrow)"/>\n'
+        if edge.get('label'):
+            middle = len(points) // 2
+            (x1, y1), (x2, y2) = points[middle - 1], points[middle]
+            yield (f'<text x="{(x1 + x2) / 2:.1f}" y="{(y1 + y2) / 2 - 3:.1f}" fill="blue" '
+                   f'text-anchor="middle">{escape(edge["label"])}</text>\n')
+
+    for node in layout['nodes']:
+        x, y, width, height = node['x'], node['y'], node['width'], node['height']
+        color = node.get('color', 'white')
+        if node.get('shape') == 'point':
+            yield f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3" fill="black"/>\n'
+            continue
+        if node.get('shape') == 'doublecircle':
+            radius = width / 2
+            yield f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius:.1f}" fill="{color}" stroke="black"/>\n'
+            yield f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius - 4:.1f}" fill="none" stroke="black"/>\n'
+        else:
+            dash = ' stroke-dasharray="5,3"' if node.get('dashed') else ''
+            yield (f'<rect x="{x - width / 2:.1f}" y="{y - height / 2:.1f}" width="{width:.1f}" '
+                   f'height="{height:.1f}" rx="6" fill="{color}" stroke="black"{dash}/>\n')
+
+        lines = node.get('lines', [])
+        top = y - (len(lines) * LINE_HEIGHT) / 2 + LINE_HEIGHT * 0.75
+        for k, line in enumerate(lines):
+            weight = ' font-weight="bold"' if k == 0 else ''
+            anchor = 'middle' if k == 0 or node.get('shape') == 'doublecircle' else 'start'
+            text_x = x if anchor == 'middle' else x - width / 2 + NODE_PADDING
+            yield (f'<text x="{text_x:.1f}" y="{top + k * LINE_HEIGHT:.1f}" '
+                   f'text-anchor="{anchor}"{weight}>{escape(line)}</text>\n')
+
+    yield '</svg>\n'
+
+
+def layout_to_svg(layout: Dict) -> str:
+    """SVG completo de un layout serializado (ver iter_layout_svg)"""
+    return ''.join(iter_layout_svg(layout))
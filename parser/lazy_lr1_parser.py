@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Parser LR(1) perezoso - Estados y filas de la tabla construidos bajo demanda
+Compiladores - UTEC - Puntos Extras Examen 2
+
+En gramáticas grandes la mayoría de los estados LR(1) canónicos nunca se
+visitan con entradas reales. LazyLR1Parser solo construye el estado
+inicial; la primera vez que el analizador consulta ACTION o GOTO de un
+estado se calcula su clausura, se numeran sus sucesores (que quedan solo
+con su kernel) y se llena su fila. El arranque es casi inmediato y la
+memoria crece con la parte del lenguaje que realmente se ejercita.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, List, Set
+
+# Importar desde el mismo directorio si se ejecuta directamente
+try:
+    from parser.lr1_parser import LR1Parser, LR1Item
+except ModuleNotFoundError:
+    from lr1_parser import LR1Parser, LR1Item
+
+
+class LazyTable(dict):
+    """
+    Tabla ACTION o GOTO que completa la fila de un estado al consultarla
+
+    Solo get dispara la expansión (es lo que usan parse_string y
+    ParseSession); recorrer la tabla muestra las filas ya calculadas.
+    """
+
+    def __init__(self, expand: Callable[[int], bool]):
+        super().__init__()
+        self._expand = expand
+
+    def get(self, key, default=None):
+        value = dict.get(self, key)
+        if value is None and self._expand(key[0]):
+            value = dict.get(self, key)
+        return default if value is None else value
+
+
+class LazyLR1Parser(LR1Parser):
+    """Parser LR(1) canónico que construye el autómata a medida que se usa"""
+
+    lazy = True
+
+    def __init__(self):
+        super().__init__()
+        self.action_table = LazyTable(self._expand_row)
+        self.goto_table = LazyTable(self._expand_row)
+
+        # Kernel de cada estado descubierto; los no expandidos guardan solo
+        # su kernel en states
+        self._kernels: List[FrozenSet[LR1Item]] = []
+        self._kernel_map: Dict[FrozenSet[LR1Item], int] = {}
+        self._expanded: Set[int] = set()
+
+        # Varias sesiones pueden compartir el parser y expandir a la vez
+        self._expand_lock = threading.Lock()
+
+    @property
+    def expanded_states(self) -> int:
+        """Estados cuya clausura y fila de la tabla ya se calcularon"""
+        return len(self._expanded)
+
+    @property
+    def kernel_items(self) -> int:
+        """Items guardados en los kernels de los estados descubiertos"""
+        return sum(len(kernel) for kernel in list(self._kernels))
+
+    def _canonical_automaton(self):
+        """El autómata está incompleto: solo se reutilizan FIRST/FOLLOW"""
+        return None
+
+    def _build_lr1_automaton(self):
+        """Registra el estado inicial; el resto se descubre al analizar"""
+        initial_kernel = frozenset({LR1Item(0, 0, '$')})
+        self._kernels = [initial_kernel]
+        self._kernel_map = {initial_kernel: 0}
+        self._expanded = set()
+        self.states = [set(initial_kernel)]
+        self.transitions = {}
+
+    def _build_parsing_table(self):
+        """Calcula solo la fila del estado inicial"""
+        self._precedence_errors = set()
+        self.conflicts = []
+        self._expand_row(0)
+
+    def materialize(self):
+        """Expande todos los estados alcanzables (el autómata LR(1) completo)"""
+        state = 0
+        while state < len(self._kernels):
+            self._expand_row(state)
+            state += 1
+
+    def _expand_row(self, state: int) -> bool:
+        """
+        Expande un estado si aún no lo está
+
+        Returns:
+            True si la fila quedó recién calculada (vale la pena volver a
+            consultar la tabla), False si ya estaba o el estado no existe
+        """
+        if state in self._expanded or not 0 <= state < len(self._kernels):
+            return False
+        with self._expand_lock:
+            if state not in self._expanded:
+                self._expand_state(state)
+        return True
+
+    def _expand_state(self, state_num: int):
+        """Clausura, sucesores y fila ACTION/GOTO de un estado (requiere el lock)"""
+        state = self._closure(set(self._kernels[state_num]))
+
+        # Agrupar items por símbolo después del punto
+        symbol_groups = defaultdict(set)
+        for item in state:
+            right = self.grammar[item.production].right
+            if item.dot_position < len(right):
+                symbol_groups[right[item.dot_position]].add(
+                    LR1Item(item.production, item.dot_position + 1, item.lookahead))
+
+        # La fila se arma aparte y se publica completa: otras sesiones leen
+        # la tabla sin el lock
+        actions: Dict[str, str] = {}
+        gotos: Dict[str, int] = {}
+        for symbol, items in symbol_groups.items():
+            kernel = frozenset(items)
+            target = self._kernel_map.get(kernel)
+            if target is None:
+                self.stats.state_map_misses += 1
+                target = len(self._kernels)
+                self._kernels.append(kernel)
+                self._kernel_map[kernel] = target
+                self.states.append(set(kernel))
+            else:
+                self.stats.state_map_hits += 1
+
+            self.transitions[(state_num, symbol)] = target
+            if symbol in self.terminals:
+                actions[symbol] = f's{target}'
+            else:
+                gotos[symbol] = target
+
+        errors = set()
+        for item in state:
+            if item.dot_position < len(self.grammar[item.production].right):
+                continue
+            if item.production == 0:  # S' -> S•
+                actions['$'] = 'acc'
+                continue
+
+            action = f'r{item.production}'
+            existing = actions.get(item.lookahead)
+            if existing is None or existing == action:
+                actions[item.lookahead] = action
+                continue
+            # Mismo criterio que _set_action: precedencia y, si no alcanza, gana la última
+            resolved = self._resolve_by_precedence(item.lookahead, existing, action)
+            if resolved is None:
+                self._record_conflict((state_num, item.lookahead), existing, action)
+                actions[item.lookahead] = action
+            elif resolved:
+                actions[item.lookahead] = resolved
+            else:
+                errors.add(item.lookahead)
+
+        for symbol in errors:
+            actions.pop(symbol, None)
+
+        self.states[state_num] = state
+        for symbol, action in actions.items():
+            dict.__setitem__(self.action_table, (state_num, symbol), action)
+        for symbol, target in gotos.items():
+            dict.__setitem__(self.goto_table, (state_num, symbol), target)
+        self._expanded.add(state_num)
+
+
+def main():
+    """Función principal para pruebas"""
+    grammar = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+    parser = LazyLR1Parser()
+    parser.parse_grammar(grammar)
+    print(f"Tras construir: {parser.expanded_states} estado(s) expandido(s)")
+
+    for text in ("id", "id + id", "( id + id ) * id"):
+        status = "[ACEPTADA]" if parser.parse_string(text)['success'] else "[RECHAZADA]"
+        print(f"  '{text}' -> {status}, {parser.expanded_states} estados expandidos")
+
+    parser.materialize()
+    print(f"Autómata completo: {parser.expanded_states} estados")
+
+
+if __name__ == "__main__":
+    main()
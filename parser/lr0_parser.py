@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Parsers LR(0) y SLR(1) - Autómata de items LR(0) con tablas sin lookahead
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Ambos usan el autómata LR(0) (el de menos estados) y solo difieren en los
+terminales sobre los que reducen: LR(0) reduce sobre cualquier terminal y
+SLR(1) sobre FOLLOW de la parte izquierda. Son las tablas más baratas de
+construir para las gramáticas que las admiten.
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+# Importar desde el mismo directorio si se ejecuta directamente
+try:
+    from parser.lr1_parser import LR1Parser, LR1Item
+except ModuleNotFoundError:
+    from lr1_parser import LR1Parser, LR1Item
+
+# Los items LR(0) se guardan como LR1Item sin lookahead
+NO_LOOKAHEAD = ''
+
+
+class LR0Parser(LR1Parser):
+    """Parser LR(0): autómata LR(0) y reducciones sobre cualquier terminal"""
+
+    parser_type_name = 'LR(0)'
+
+    def __init__(self):
+        super().__init__()
+        # Producciones de cada no terminal (también para recalcular clausuras
+        # cuando los estados se guardan solo con su kernel)
+        self._productions_of: Dict[str, List[int]] = {}
+
+    def _canonical_automaton(self):
+        """No hay autómata LR(1) que reutilizar (solo FIRST/FOLLOW)"""
+        return None
+
+    def _lr0_automaton(self):
+        """Autómata LR(0) construido (lo reutiliza el siguiente intento LR(0)/SLR(1))"""
+        return self.states, self.transitions
+
+    def _reusable_lr0_automaton(self) -> bool:
+        """
+        True si la construcción anterior dejó un autómata LR(0) de la misma gramática
+
+        El autómata LR(0) solo depende de las producciones: con la misma
+        gramática (y la misma numeración) vale tal cual, y LR(0) y SLR(1)
+        difieren solo en la tabla.
+        """
+        previous, diff = self._previous, self.diff
+        if previous is None or previous.lr0_states is None or diff is None:
+            return False
+        return (not diff.added and not diff.removed
+                and all(old == new for old, new in diff.production_map.items()))
+
+    def _index_productions(self) -> Dict[str, List[int]]:
+        """Agrupa los números de producción por no terminal"""
+        productions_of: Dict[str, List[int]] = defaultdict(list)
+        for prod in self.grammar:
+            productions_of[prod.left].append(prod.number)
+        self._productions_of = productions_of
+        return productions_of
+
+    def _closure_lr0(self, kernel: Iterable[Tuple[int, int]],
+                     productions_of: Dict[str, List[int]]) -> FrozenSet[Tuple[int, int]]:
+        """Clausura de un conjunto de items LR(0) (pares producción, punto)"""
+        self.stats.closure_calls += 1
+        result = set(kernel)
+        pending = list(result)
+        expanded: Set[str] = set()
+
+        while pending:
+            production, dot = pending.pop()
+            right = self.grammar[production].right
+            if dot < len(right) and right[dot] in self.non_terminals and right[dot] not in expanded:
+                expanded.add(right[dot])
+                self.stats.closure_iterations += 1
+                for prod_num in productions_of[right[dot]]:
+                    if (prod_num, 0) not in result:
+                        result.add((prod_num, 0))
+                        pending.append((prod_num, 0))
+
+        if self._budget_tracker is not None:
+            self._budget_tracker.check(len(result))
+        self.stats.items_generated += len(result)
+        return frozenset(result)
+
+    def _build_lr1_automaton(self):
+        """Construye el autómata LR(0) (los estados no llevan lookahead)"""
+        productions_of = self._index_productions()
+
+        if self._reusable_lr0_automaton():
+            self._reuse_lr0_automaton()
+            return
+
+        initial_kernel = frozenset({(0, 0)})
+        closures = [self._closure_lr0(initial_kernel, productions_of)]
+        state_map = {initial_kernel: 0}
+        self.transitions = {}
+        state_queue = deque([0])
+
+        tracker = self._budget_tracker
+        if tracker is not None:
+            tracker.add_state(len(closures[0]))
+
+        while state_queue:
+            current_state_num = state_queue.popleft()
+
+            if current_state_num % 32 == 0:
+                self._report_progress('automaton', states=len(closures),
+                                      queue=len(state_queue))
+
+            # Agrupar items por símbolo después del punto
+            symbol_groups = defaultdict(set)
+            for production, dot in closures[current_state_num]:
+                right = self.grammar[production].right
+                if dot < len(right):
+                    symbol_groups[right[dot]].add((production, dot + 1))
+
+            for symbol, kernel in symbol_groups.items():
+                kernel = frozenset(kernel)
+                target = state_map.get(kernel)
+
+                if target is None:
+                    self.stats.state_map_misses += 1
+                    target = len(closures)
+                    closures.append(self._closure_lr0(kernel, productions_of))
+                    state_map[kernel] = target
+                    state_queue.append(target)
+
+                    if tracker is not None:
+                        tracker.add_state(len(closures[target]), len(state_queue))
+                else:
+                    self.stats.state_map_hits += 1
+
+                self.transitions[(current_state_num, symbol)] = target
+
+        self.states = [{LR1Item(production, dot, NO_LOOKAHEAD) for production, dot in closure}
+                       for closure in closures]
+
+    def _reuse_lr0_automaton(self):
+        """Toma los estados y transiciones LR(0) de la construcción anterior"""
+        previous = self._previous
+        self.states = list(previous.lr0_states)
+        self.transitions = dict(previous.lr0_transitions)
+
+        tracker = self._budget_tracker
+        if tracker is not None:
+            for state in self.states:
+                tracker.add_state(len(state))
+        self.diff.states_reused = len(self.states)
+        self.stats.states_reused = len(self.states)
+
+    def _closure_of_kernel(self, kernel: FrozenSet[LR1Item]) -> Set[LR1Item]:
+        """Clausura LR(0) de un kernel (estados compactados)"""
+        # Un parser cargado de tablas compartidas no construyó el autómata
+        if not self._productions_of:
+            self._index_productions()
+        closure = self._closure_lr0({(item.production, item.dot_position) for item in kernel},
+                                    self._productions_of)
+        return {LR1Item(production, dot, NO_LOOKAHEAD) for production, dot in closure}
+
+    def _reduce_lookaheads(self, item: LR1Item) -> Iterable[str]:
+        """LR(0) reduce sin mirar la entrada: sobre todos los terminales y $"""
+        return sorted(self.terminals | {'$'})
+
+    def get_comparison_info(self) -> Dict[str, object]:
+        """Retorna información del autómata para comparar con LR(1)/LALR(1)"""
+        return {
+            'states': len(self.states),
+            'transitions': len(self.transitions),
+            'conflicts': len(self.conflicts),
+            'parser_type': self.parser_type_name
+        }
+
+
+class SLR1Parser(LR0Parser):
+    """Parser SLR(1): autómata LR(0) y reducciones sobre FOLLOW"""
+
+    parser_type_name = 'SLR(1)'
+
+    def _reduce_lookaheads(self, item: LR1Item) -> Iterable[str]:
+        """SLR(1) reduce A -> α• sobre FOLLOW(A)"""
+        return sorted(self.follow_sets[self.grammar[item.production].left])
+
+
+def main():
+    """Función principal para pruebas"""
+    grammar = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+    for parser in (LR0Parser(), SLR1Parser()):
+        parser.parse_grammar(grammar)
+        print(f"{parser.parser_type_name}: {len(parser.states)} estados, "
+              f"{len(parser.conflicts)} conflictos")
+        for conflict in parser.conflicts:
+            print(f"  estado {conflict['state']}, '{conflict['symbol']}': "
+                  f"{conflict['type']} {conflict['actions']}")
+        if not parser.conflicts:
+            for text in ("id + id * id", "( id + id ) * id", "id + * id"):
+                status = "[ACEPTADA]" if parser.parse_string(text)['success'] else "[RECHAZADA]"
+                print(f"  '{text}' -> {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,29 @@ Compiladores - UTEC - Puntos Extras Examen 2
 
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import List, Set, Dict, Tuple, Optional, Any
+from typing import List, Set, FrozenSet, Dict, Tuple, Optional, Any, Iterable, Callable
 import json
+import os
+
+# Importar desde el mismo directorio si se ejecuta directamente
+try:
+    from parser.token_stream import iter_mmap_tokens
+    from parser.parse_session import ParseSession
+    from parser.budget import BuildBudget, BudgetTracker
+    from parser.build_stats import BuildStats
+    from parser.grammar_reduction import ReductionReport, reduce_grammar
+    from parser.ebnf import EbnfDesugarer, uses_ebnf
+    from parser.incremental import BuildSnapshot, GrammarDiff, diff_grammars, first_affected, follow_affected
+    from parser.state_store import KernelStates, kernel_of
+except ModuleNotFoundError:
+    from token_stream import iter_mmap_tokens
+    from parse_session import ParseSession
+    from budget import BuildBudget, BudgetTracker
+    from build_stats import BuildStats
+    from grammar_reduction import ReductionReport, reduce_grammar
+    from ebnf import EbnfDesugarer, uses_ebnf
+    from incremental import BuildSnapshot, GrammarDiff, diff_grammars, first_affected, follow_affected
+    from state_store import KernelStates, kernel_of
 
 @dataclass
 class Production:
@@ -15,6 +36,7 @@ class Production:
     left: str
     right: List[str]
     number: int = 0
+    precedence: Optional[str] = None  # Terminal de %prec (gramáticas importadas)
     
     def __str__(self):
         right_str = ' '.join(self.right) if self.right else 'ε'
@@ -40,6 +62,11 @@ class LR1Item:
 
 class LR1Parser:
     """Parser LR(1) completo con generación de autómata y tabla de parsing"""
+
+    parser_type_name = 'LR(1)'
+
+    # True si las tablas se completan bajo demanda (LazyLR1Parser)
+    lazy = False
     
     def __init__(self):
         self.grammar: List[Production] = []
@@ -62,16 +89,127 @@ class LR1Parser:
         
         # Para visualización
         self.parsing_trace: List[str] = []
+
+        # Callback opcional de progreso: callback(fase, datos)
+        # Puede lanzar una excepción para cancelar la construcción
+        self.progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+
+        # Límites opcionales de recursos; al superarlos se lanza BudgetExceeded
+        self.budget: Optional[BuildBudget] = None
+        self._budget_tracker: Optional[BudgetTracker] = None
+
+        # Tiempos por fase y contadores de la última construcción
+        self.stats = BuildStats()
+
+        # Eliminar producciones duplicadas, improductivas e inalcanzables antes
+        # de construir; production_origin[i] es el número original (en la
+        # gramática aumentada sin reducir) de la producción i
+        self.reduce_grammar = True
+        self.reduction: Optional[ReductionReport] = None
+        self.production_origin: List[int] = []
+
+        # No terminales auxiliares creados al traducir la sintaxis EBNF
+        # (X*, X+, X?, grupos) y el texto EBNF que representa cada uno
+        self.ebnf_helpers: Dict[str, str] = {}
+
+        # Precedencia de terminales para resolver conflictos shift/reduce
+        # como yacc: terminal -> (nivel, 'left' | 'right' | 'nonassoc' | 'precedence')
+        self.precedence: Dict[str, Tuple[int, str]] = {}
+        self._precedence_errors: Set[Tuple[int, str]] = set()
+
+        # Conflictos de la tabla que la precedencia no resolvió:
+        # {'state', 'symbol', 'type': 'shift/reduce' | 'reduce/reduce', 'actions'}
+        self.conflicts: List[Dict[str, Any]] = []
+
+        # No terminales declarados explícitamente (gramáticas importadas, donde
+        # no rige la convención de mayúscula inicial)
+        self._declared_non_terminals: Optional[Set[str]] = None
+
+        # Reconstrucción incremental: diferencia con la construcción anterior
+        # (None si se construyó desde cero) y lo que se reutiliza de ella
+        self.diff: Optional[GrammarDiff] = None
+        self._previous: Optional[BuildSnapshot] = None
+
+        # Guardar solo el kernel de cada estado una vez construidas las
+        # tablas; las clausuras se recalculan al mostrarlas (state_store.py)
+        self.kernel_only = False
     
-    def parse_grammar(self, grammar_text: str):
-        """Analiza la gramática de entrada y construye el parser LR(1)"""
+    def parse_grammar(self, grammar_text, previous: Optional['LR1Parser'] = None):
+        """
+        Analiza la gramática de entrada y construye el parser LR(1)
+
+        Args:
+            grammar_text: Texto en formato "A -> x y | z" o una gramática ya
+                importada (ImportedGrammar de parser/grammar_import.py)
+            previous: Parser ya construido con una versión anterior de la
+                gramática (puede ser este mismo); se reutilizan los FIRST,
+                FOLLOW y estados LR(1) que la edición no afecta
+        """
+        self._previous = BuildSnapshot.of(previous) if previous is not None else None
+        self._prepare_grammar(grammar_text)
+        self._report_progress('automaton')
+        self._build_lr1_automaton()
+        self._report_progress('parsing_table', states=len(self.states))
+        self._build_parsing_table()
+        if self.kernel_only and not self.lazy:
+            self._report_progress('compact_states')
+            self._compact_states()
+        self.stats.finish(len(self.states), len(self.transitions))
+        self._report_progress('done', states=len(self.states))
+        self._budget_tracker = None
+        self._previous = None
+
+    def load_shared(self, grammar_text, tables):
+        """
+        Carga el parser desde tablas ya construidas por otro proceso
+
+        Solo se procesa la gramática y se calculan FIRST/FOLLOW; el autómata
+        y las tablas se leen del archivo compartido (ver parser/shared_tables.py)
+        y los estados quedan guardados solo con su kernel.
+
+        Args:
+            grammar_text: Gramática con la que se construyeron las tablas
+            tables: SharedTables abierto sobre el archivo compartido
+        """
+        self._previous = None
+        self._prepare_grammar(grammar_text)
+        self._report_progress('attach')
+        tables.attach(self)
+        self.stats.finish(len(self.states), len(self.transitions))
+        self._report_progress('done', states=len(self.states))
+        self._budget_tracker = None
+
+    def _prepare_grammar(self, grammar_text):
+        """Procesa la gramática y calcula FIRST/FOLLOW (todo lo previo al autómata)"""
+        self.diff = None
         self._clear_data()
-        self._parse_grammar_text(grammar_text)
+        self.stats = BuildStats()
+        self._budget_tracker = BudgetTracker(self.budget) if self.budget is not None else None
+        self._report_progress('parse_grammar')
+        if isinstance(grammar_text, str):
+            self._parse_grammar_text(grammar_text)
+        else:
+            self._load_imported_grammar(grammar_text)
+        self._report_progress('reduce')
+        self._reduce_grammar()
+        self._report_progress('augment')
         self._create_augmented_grammar()
+        if self._previous is not None:
+            self._report_progress('diff')
+            self.diff = diff_grammars(self._previous.grammar, self.grammar)
+        self._report_progress('first_sets')
         self._compute_first_sets()
+        self._report_progress('follow_sets')
         self._compute_follow_sets()
-        self._build_lr1_automaton()
-        self._build_parsing_table()
+
+    def _report_progress(self, phase: str, **data):
+        """Notifica el avance de la construcción al callback (si existe)"""
+        if phase != 'done':
+            self.stats.enter(phase)
+        if self._budget_tracker is not None:
+            self._budget_tracker.phase = phase
+        if self.progress_callback is not None:
+            self.progress_callback(phase, data)
     
     def _clear_data(self):
         """Limpia todos los datos del parser"""
@@ -82,16 +220,24 @@ class LR1Parser:
         self.augmented_start = ""
         self.first_sets.clear()
         self.follow_sets.clear()
-        self.states.clear()
+        self.states = []
+        # Las tablas compartidas entre procesos son de solo lectura: se reemplazan
+        if not isinstance(self.action_table, dict):
+            self.transitions, self.action_table, self.goto_table = {}, {}, {}
         self.transitions.clear()
         self.action_table.clear()
         self.goto_table.clear()
         self.parsing_trace.clear()
+        self.ebnf_helpers = {}
+        self.precedence = {}
+        self.conflicts = []
+        self._declared_non_terminals = None
     
     def _parse_grammar_text(self, text: str):
         """Parsea el texto de la gramática"""
         lines = text.strip().split('\n')
         prod_number = 0
+        ebnf = EbnfDesugarer()
 
         for line in lines:
             line = line.strip()
@@ -112,17 +258,20 @@ class LR1Parser:
             self.non_terminals.add(left)
 
             # Soportar múltiples producciones separadas por |
-            alternatives = right.split('|')
+            if uses_ebnf(right):
+                alternatives = ebnf.alternatives(right)
+            else:
+                alternatives = []
+                for alternative in right.split('|'):
+                    alternative = alternative.strip()
 
-            for alternative in alternatives:
-                alternative = alternative.strip()
-
-                # Procesar lado derecho
-                if alternative == 'ε' or alternative == 'epsilon' or alternative == '' or not alternative:
-                    right_symbols = []
-                else:
-                    right_symbols = alternative.split()
+                    # Procesar lado derecho
+                    if alternative == 'ε' or alternative == 'epsilon' or alternative == '' or not alternative:
+                        alternatives.append([])
+                    else:
+                        alternatives.append(alternative.split())
 
+            for right_symbols in alternatives:
                 production = Production(left, right_symbols, prod_number)
                 self.grammar.append(production)
                 prod_number += 1
@@ -132,11 +281,50 @@ class LR1Parser:
                     if not self._is_non_terminal(symbol):
                         self.terminals.add(symbol)
 
+        # Reglas auxiliares de EBNF al final, compartidas entre todas las reglas
+        for left, right_symbols in ebnf.productions:
+            self.non_terminals.add(left)
+            self.grammar.append(Production(left, right_symbols, prod_number))
+            prod_number += 1
+            for symbol in right_symbols:
+                if not self._is_non_terminal(symbol):
+                    self.terminals.add(symbol)
+        self.ebnf_helpers = dict(ebnf.sources)
+
         # Agregar $ como terminal
         self.terminals.add('$')
     
+    def _load_imported_grammar(self, imported):
+        """Carga las producciones, símbolos y precedencias de una gramática importada"""
+        self.start_symbol = imported.start_symbol
+        self._declared_non_terminals = set(imported.non_terminals)
+        self.non_terminals = set(imported.non_terminals)
+        self.terminals = set(imported.terminals)
+        self.terminals.add('$')
+        self.precedence = dict(imported.precedence)
+        self.ebnf_helpers = dict(imported.ebnf_helpers)
+        self.grammar = [Production(prod.left, list(prod.right), number, prod.precedence)
+                        for number, prod in enumerate(imported.productions)]
+
+    def _reduce_grammar(self):
+        """Quita las producciones inútiles y registra el número original de las restantes"""
+        self.reduction = None
+        if self.reduce_grammar:
+            kept, self.reduction = reduce_grammar(self.grammar, self.start_symbol, self._is_non_terminal)
+            if self.reduction.changed:
+                self.grammar = kept
+                self.non_terminals = {prod.left for prod in kept}
+                self.terminals = {symbol for prod in kept for symbol in prod.right
+                                  if not self._is_non_terminal(symbol)}
+                self.terminals.add('$')
+
+        # Antes de aumentar, number es la posición en el texto
+        self.production_origin = [0] + [prod.number + 1 for prod in self.grammar]
+
     def _is_non_terminal(self, symbol: str) -> bool:
         """Determina si un símbolo es no terminal"""
+        if self._declared_non_terminals is not None:
+            return symbol in self._declared_non_terminals
         return symbol[0].isupper() if symbol else False
     
     def _create_augmented_grammar(self):
@@ -160,16 +348,28 @@ class LR1Parser:
         for terminal in self.terminals:
             self.first_sets[terminal].add(terminal)
 
-        # inicializar first de no terminales como conjunto vacio
-        for non_terminal in self.non_terminals:
+        # inicializar first de no terminales como conjunto vacio; en una
+        # reconstrucción incremental solo los que la edición puede afectar
+        recompute = self.non_terminals
+        if self.diff is not None:
+            previous = self._previous
+            recompute = first_affected(self.grammar, self.non_terminals, self.diff.changed)
+            recompute |= self.non_terminals - previous.non_terminals
+            for non_terminal in self.non_terminals - recompute:
+                self.first_sets[non_terminal] = set(previous.first_sets[non_terminal])
+            self.diff.first_recomputed = recompute
+        productions = [prod for prod in self.grammar if prod.left in recompute]
+
+        for non_terminal in recompute:
             self.first_sets[non_terminal] = set()
 
         # algoritmo de punto fijo: iterar hasta que no haya cambios
         changed = True
         while changed:
             changed = False
+            self.stats.first_iterations += 1
 
-            for prod in self.grammar:
+            for prod in productions:
                 first_before = len(self.first_sets[prod.left])
 
                 if not prod.right:  # produccion vacia: A -> epsilon
@@ -182,6 +382,12 @@ class LR1Parser:
                 # detectar si hubo cambios para seguir iterando
                 if len(self.first_sets[prod.left]) > first_before:
                     changed = True
+
+        if self.diff is not None:
+            previous = self._previous
+            self.diff.first_changed = {non_terminal for non_terminal in recompute
+                                       if self.first_sets[non_terminal] != previous.first_sets.get(non_terminal)}
+            self.diff.first_changed |= previous.non_terminals - self.non_terminals
     
     def _first_of_sequence(self, sequence: List[str]) -> Set[str]:
         """Calcula FIRST de una secuencia de símbolos"""
@@ -209,9 +415,22 @@ class LR1Parser:
     
     def _compute_follow_sets(self):
         """Calcula los conjuntos FOLLOW"""
-        # inicializar follow de todos los no terminales
-        for non_terminal in self.non_terminals:
+        # inicializar follow de los no terminales; en una reconstrucción
+        # incremental se conservan los que la edición no puede afectar
+        recompute = self.non_terminals
+        if self.diff is not None:
+            previous = self._previous
+            recompute = follow_affected(self.grammar, self.non_terminals, self.diff, previous.grammar,
+                                        lambda symbol: 'ε' in self.first_sets.get(symbol, ()))
+            recompute |= self.non_terminals - previous.non_terminals
+            recompute.add(self.augmented_start)
+            for non_terminal in self.non_terminals - recompute:
+                self.follow_sets[non_terminal] = set(previous.follow_sets[non_terminal])
+            self.diff.follow_recomputed = recompute
+
+        for non_terminal in recompute:
             self.follow_sets[non_terminal] = set()
+        productions = [prod for prod in self.grammar if any(symbol in recompute for symbol in prod.right)]
 
         # el simbolo inicial siempre tiene $ en su follow
         self.follow_sets[self.augmented_start].add('$')
@@ -220,11 +439,12 @@ class LR1Parser:
         changed = True
         while changed:
             changed = False
+            self.stats.follow_iterations += 1
 
-            for prod in self.grammar:
+            for prod in productions:
                 # examinar cada simbolo del lado derecho
                 for i, symbol in enumerate(prod.right):
-                    if symbol in self.non_terminals:
+                    if symbol in recompute:
                         follow_before = len(self.follow_sets[symbol])
 
                         # beta son los simbolos que siguen al no terminal
@@ -241,8 +461,20 @@ class LR1Parser:
                         if len(self.follow_sets[symbol]) > follow_before:
                             changed = True
     
+    def _canonical_automaton(self) -> Optional[Tuple[List[Set[LR1Item]], Dict[Tuple[int, str], int]]]:
+        """Estados y transiciones del autómata LR(1) canónico construido"""
+        return self.states, self.transitions
+
+    def _lr0_automaton(self) -> Optional[Tuple[List[Set[LR1Item]], Dict[Tuple[int, str], int]]]:
+        """Estados y transiciones del autómata LR(0) (solo los parsers LR(0)/SLR(1))"""
+        return None
+
     def _build_lr1_automaton(self):
         """Construye el autómata LR(1)"""
+        if self._previous is not None and self._previous.states is not None:
+            self._build_lr1_automaton_incremental()
+            return
+
         # Estado inicial
         initial_item = LR1Item(0, 0, '$')
         initial_state = self._closure({initial_item})
@@ -250,10 +482,18 @@ class LR1Parser:
         self.states = [initial_state]
         state_queue = deque([0])
         state_map = {self._state_key(initial_state): 0}
+
+        tracker = self._budget_tracker
+        if tracker is not None:
+            tracker.add_state(len(initial_state))
         
         while state_queue:
             current_state_num = state_queue.popleft()
             current_state = self.states[current_state_num]
+
+            if current_state_num % 32 == 0:
+                self._report_progress('automaton', states=len(self.states),
+                                      queue=len(state_queue))
             
             # Agrupar items por símbolo después del punto
             symbol_groups = defaultdict(set)
@@ -264,29 +504,161 @@ class LR1Parser:
                     new_item = LR1Item(item.production, item.dot_position + 1, item.lookahead)
                     symbol_groups[next_symbol].add(new_item)
             
-            # Para cada símbolo, crear nuevo estado
-            for symbol, items in symbol_groups.items():
+            # Para cada símbolo, crear nuevo estado (en orden de símbolo: la
+            # numeración en anchura no depende del orden de iteración de los
+            # sets y coincide con la de la construcción incremental)
+            for symbol, items in sorted(symbol_groups.items(), key=lambda group: group[0]):
                 new_state = self._closure(items)
                 state_key = self._state_key(new_state)
                 
                 if state_key not in state_map:
                     # Nuevo estado
+                    self.stats.state_map_misses += 1
                     new_state_num = len(self.states)
                     self.states.append(new_state)
                     state_map[state_key] = new_state_num
                     state_queue.append(new_state_num)
+
+                    if tracker is not None:
+                        tracker.add_state(len(new_state), len(state_queue))
                 else:
+                    self.stats.state_map_hits += 1
                     new_state_num = state_map[state_key]
                 
                 # Agregar transición
                 self.transitions[(current_state_num, symbol)] = new_state_num
     
+    def _reusable_states(self) -> Dict[frozenset, int]:
+        """
+        Estados anteriores que la edición no afecta, indexados por su kernel renumerado
+
+        Un estado se conserva si todas sus producciones siguen en la gramática
+        y ningún item expande un no terminal cuyas producciones cambiaron ni
+        calcula lookaheads con un símbolo cuyo FIRST cambió: su clausura es
+        la misma, salvo la numeración de las producciones.
+        """
+        previous, diff = self._previous, self.diff
+        production_map = diff.production_map
+        changed, first_changed = diff.changed, diff.first_changed
+        reusable: Dict[frozenset, int] = {}
+
+        for number, state in enumerate(previous.states):
+            kernel = []
+            for item in state:
+                new_production = production_map.get(item.production)
+                if new_production is None:
+                    break
+                right = self.grammar[new_production].right
+                if item.dot_position < len(right):
+                    next_symbol = right[item.dot_position]
+                    if next_symbol in changed or (
+                            next_symbol in self.non_terminals and
+                            any(symbol in first_changed for symbol in right[item.dot_position + 1:])):
+                        break
+                if item.dot_position > 0 or item.production == 0:
+                    kernel.append(LR1Item(new_production, item.dot_position, item.lookahead))
+            else:
+                reusable[frozenset(kernel)] = number
+        return reusable
+
+    def _build_lr1_automaton_incremental(self):
+        """
+        Construye el autómata LR(1) reutilizando los estados no afectados
+
+        Recorre el autómata nuevo desde el estado inicial identificando cada
+        estado por su kernel. Si el kernel es el de un estado anterior
+        reutilizable, su clausura se renumera sin recalcularla y sus gotos son
+        los kernels de sus sucesores anteriores; solo la parte afectada pasa
+        por _closure. Los sucesores se numeran en anchura y en orden de
+        símbolo, como en la construcción completa, así que los números de
+        estado (y las tablas) son los mismos que construir desde cero.
+        """
+        previous, diff = self._previous, self.diff
+        production_map = diff.production_map
+        reusable = self._reusable_states()
+
+        # Sucesores anteriores por estado: [(símbolo, estado destino)]
+        old_successors: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        for (source, symbol), target in previous.transitions.items():
+            old_successors[source].append((symbol, target))
+
+        def renumber(items) -> Set[LR1Item]:
+            return {LR1Item(production_map[item.production], item.dot_position, item.lookahead)
+                    for item in items}
+
+        # Kernel renumerado de cada estado anterior que es destino de uno reutilizado
+        old_kernels: Dict[int, frozenset] = {}
+
+        def old_kernel(number: int) -> frozenset:
+            kernel = old_kernels.get(number)
+            if kernel is None:
+                kernel = frozenset(renumber(item for item in previous.states[number]
+                                            if item.dot_position > 0 or item.production == 0))
+                old_kernels[number] = kernel
+            return kernel
+
+        initial_kernel = frozenset({LR1Item(0, 0, '$')})
+        kernels = [initial_kernel]
+        state_map = {initial_kernel: 0}
+        self.states = [set()]
+        state_queue = deque([0])
+
+        tracker = self._budget_tracker
+        while state_queue:
+            current_state_num = state_queue.popleft()
+            kernel = kernels[current_state_num]
+            old_state = reusable.get(kernel)
+
+            if old_state is not None:
+                # Estado no afectado: clausura y gotos de la construcción anterior
+                diff.states_reused += 1
+                self.stats.states_reused += 1
+                current_state = renumber(previous.states[old_state])
+                successors = [(symbol, old_kernel(target)) for symbol, target in old_successors[old_state]]
+            else:
+                current_state = self._closure(set(kernel))
+                symbol_groups = defaultdict(set)
+                for item in current_state:
+                    if item.dot_position < len(self.grammar[item.production].right):
+                        next_symbol = self.grammar[item.production].right[item.dot_position]
+                        symbol_groups[next_symbol].add(
+                            LR1Item(item.production, item.dot_position + 1, item.lookahead))
+                successors = [(symbol, frozenset(items)) for symbol, items in symbol_groups.items()]
+            successors.sort(key=lambda successor: successor[0])
+
+            self.states[current_state_num] = current_state
+            if tracker is not None:
+                tracker.add_state(len(current_state), len(state_queue))
+
+            for symbol, target_kernel in successors:
+                target = state_map.get(target_kernel)
+                if target is None:
+                    self.stats.state_map_misses += 1
+                    target = len(kernels)
+                    kernels.append(target_kernel)
+                    self.states.append(set())
+                    state_map[target_kernel] = target
+                    state_queue.append(target)
+                else:
+                    self.stats.state_map_hits += 1
+                self.transitions[(current_state_num, symbol)] = target
+
+            if current_state_num % 32 == 0:
+                self._report_progress('automaton', states=len(self.states),
+                                      queue=len(state_queue))
+
     def _closure(self, items: Set[LR1Item]) -> Set[LR1Item]:
         """Calcula la clausura de un conjunto de items LR(1)"""
+        stats = self.stats
+        stats.closure_calls += 1
         result = set(items)
         changed = True
         
         while changed:
+            if self._budget_tracker is not None:
+                self._budget_tracker.check(len(result))
+
+            stats.closure_iterations += 1
             changed = False
             new_items = set()
             
@@ -313,9 +685,18 @@ class LR1Parser:
                                         changed = True
             
             result.update(new_items)
-        
+
+        stats.items_generated += len(result)
         return result
     
+    def _closure_of_kernel(self, kernel: FrozenSet[LR1Item]) -> Set[LR1Item]:
+        """Clausura de un estado a partir de su kernel (estados compactados)"""
+        return self._closure(set(kernel))
+
+    def _compact_states(self):
+        """Reemplaza las clausuras por los kernels (ver parser/state_store.py)"""
+        self.states = KernelStates([kernel_of(state) for state in self.states], self._closure_of_kernel)
+
     def _state_key(self, state: Set[LR1Item]) -> str:
         """Genera una clave única para un estado"""
         items_list = sorted(list(state), key=lambda x: (x.production, x.dot_position, x.lookahead))
@@ -323,6 +704,8 @@ class LR1Parser:
     
     def _build_parsing_table(self):
         """Construye la tabla de parsing ACTION/GOTO"""
+        self._precedence_errors = set()
+        self.conflicts = []
         for state_num, state in enumerate(self.states):
             for item in state:
                 prod = self.grammar[item.production]
@@ -336,7 +719,7 @@ class LR1Parser:
                         
                         if next_symbol in self.terminals:
                             # ACTION[state, a] = shift next_state
-                            self.action_table[(state_num, next_symbol)] = f's{next_state}'
+                            self._set_action((state_num, next_symbol), f's{next_state}')
                         else:
                             # GOTO[state, A] = next_state
                             self.goto_table[(state_num, next_symbol)] = next_state
@@ -348,7 +731,94 @@ class LR1Parser:
                         self.action_table[(state_num, '$')] = 'acc'
                     else:
                         # ACTION[state, lookahead] = reduce production
-                        self.action_table[(state_num, item.lookahead)] = f'r{item.production}'
+                        for lookahead in self._reduce_lookaheads(item):
+                            self._set_action((state_num, lookahead), f'r{item.production}')
+        self._drop_precedence_errors()
+
+    def _reduce_lookaheads(self, item: LR1Item) -> Iterable[str]:
+        """Terminales sobre los que se reduce un item completo (LR(1): su lookahead)"""
+        return (item.lookahead,)
+
+    def _set_action(self, key: Tuple[int, str], action: str):
+        """Escribe una acción; en un conflicto sin precedencia gana la última"""
+        existing = self.action_table.get(key)
+        if existing is None or existing == action:
+            self.action_table[key] = action
+        elif not self._resolve_conflict(key, existing, action):
+            self._record_conflict(key, existing, action)
+            self.action_table[key] = action
+
+    def _record_conflict(self, key: Tuple[int, str], existing: str, action: str):
+        """Registra un conflicto que la precedencia no pudo resolver"""
+        kind = 'shift/reduce' if 's' in (existing[0], action[0]) else 'reduce/reduce'
+        self.conflicts.append({
+            'state': key[0],
+            'symbol': key[1],
+            'type': kind,
+            'actions': [existing, action]
+        })
+
+    def _resolve_conflict(self, key: Tuple[int, str], existing: str, action: str) -> bool:
+        """
+        Resuelve un conflicto shift/reduce con las declaraciones de precedencia
+
+        Returns:
+            True si la precedencia decidió (y la tabla ya quedó actualizada),
+            False si el llamador debe aplicar su criterio por defecto
+        """
+        resolved = self._resolve_by_precedence(key[1], existing, action)
+        if resolved is None:
+            return False
+        if resolved:
+            self.action_table[key] = resolved
+        else:
+            self._precedence_errors.add(key)
+        return True
+
+    def _resolve_by_precedence(self, symbol: str, existing: str, action: str) -> Optional[str]:
+        """
+        Acción que elige yacc entre un shift y un reduce sobre el mismo terminal
+
+        Gana la de mayor nivel (la regla toma el de %prec o el de su último
+        terminal); a igual nivel decide la asociatividad del terminal.
+
+        Returns:
+            La acción elegida, '' si la entrada queda como error (%nonassoc)
+            o None si la precedencia no alcanza para decidir
+        """
+        if not self.precedence or {existing[0], action[0]} != {'s', 'r'}:
+            return None
+        shift, reduce = (existing, action) if existing[0] == 's' else (action, existing)
+        token_precedence = self.precedence.get(symbol)
+        rule_precedence = self._production_precedence(int(reduce[1:]))
+        if token_precedence is None or rule_precedence is None:
+            return None
+
+        if rule_precedence[0] != token_precedence[0]:
+            return reduce if rule_precedence[0] > token_precedence[0] else shift
+        associativity = token_precedence[1]
+        if associativity == 'left':
+            return reduce
+        if associativity == 'right':
+            return shift
+        if associativity == 'nonassoc':
+            return ''
+        return None
+
+    def _production_precedence(self, number: int) -> Optional[Tuple[int, str]]:
+        """Precedencia de una producción: la de %prec o la de su último terminal"""
+        prod = self.grammar[number]
+        if prod.precedence is not None:
+            return self.precedence.get(prod.precedence)
+        for symbol in reversed(prod.right):
+            if not self._is_non_terminal(symbol):
+                return self.precedence.get(symbol)
+        return None
+
+    def _drop_precedence_errors(self):
+        """Quita las entradas que %nonassoc dejó como error"""
+        for key in self._precedence_errors:
+            self.action_table.pop(key, None)
     
     def parse_string(self, input_string: str) -> Dict[str, Any]:
         """Analiza una cadena usando el parser LR(1)"""
@@ -455,6 +925,65 @@ class LR1Parser:
                     'trace': trace_steps
                 }
     
+    def parse_tokens(self, tokens: Iterable[Tuple[str, int]],
+                     end_offset: int = -1) -> Dict[str, Any]:
+        """
+        Analiza un flujo de tokens sin materializar la entrada ni la traza
+
+        A diferencia de parse_string, consume los tokens de forma perezosa,
+        no guarda la traza y no tiene límite de pasos, por lo que la memoria
+        solo depende de la profundidad de la pila.
+
+        Args:
+            tokens: Iterable de tuplas (token, offset)
+            end_offset: Offset reportado para el fin de entrada ($)
+
+        Returns:
+            Diccionario con 'success', 'tokens' consumidos y, en caso de
+            error, 'error', 'offset' y 'token' del primer símbolo inesperado
+        """
+        session = ParseSession(self)
+
+        for symbol, offset in tokens:
+            if not session.push(symbol):
+                break
+        else:
+            offset = end_offset
+            session.push('$')
+
+        if session.error is not None:
+            return {
+                'success': False,
+                'tokens': session.tokens,
+                'error': session.error,
+                'offset': offset,
+                'token': session.error_token
+            }
+
+        return {
+            'success': True,
+            'tokens': session.tokens,
+            'message': 'Entrada aceptada correctamente'
+        }
+
+    def parse_file(self, path: str, encoding: str = 'utf-8') -> Dict[str, Any]:
+        """
+        Analiza un archivo de tokens (posiblemente de varios GB) usando mmap
+
+        Args:
+            path: Ruta del archivo con tokens separados por espacios
+            encoding: Codificación de los tokens
+
+        Returns:
+            Igual que parse_tokens; 'offset' es la posición en bytes del primer error
+        """
+        tokens = iter_mmap_tokens(path, encoding)
+        try:
+            return self.parse_tokens(tokens, end_offset=os.path.getsize(path))
+        finally:
+            # Cerrar el generador libera el mmap aunque el análisis termine antes
+            tokens.close()
+
     def get_first_follow_sets(self) -> Dict[str, Any]:
         """Retorna los conjuntos FIRST y FOLLOW"""
         return {
@@ -474,7 +1003,8 @@ class LR1Parser:
                 prod = self.grammar[item.production]
                 rhs = prod.right.copy()
                 rhs.insert(item.dot_position, '•')
-                items_str.append(f"{prod.left} -> {' '.join(rhs)}, {item.lookahead}")
+                items_str.append(f"{prod.left} -> {' '.join(rhs)}" +
+                                 (f", {item.lookahead}" if item.lookahead else ""))
             
             states_info.append({
                 'number': i,
@@ -523,7 +1053,8 @@ class LR1Parser:
                 prod = self.grammar[item.production]
                 rhs = prod.right.copy()
                 rhs.insert(item.dot_position, '•')
-                items.append(f"{prod.left} -> {' '.join(rhs)}, {item.lookahead}")
+                items.append(f"{prod.left} -> {' '.join(rhs)}" +
+                             (f", {item.lookahead}" if item.lookahead else ""))
             
             nodes.append({
                 'id': i,
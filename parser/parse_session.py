@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Sesión de análisis incremental sobre las tablas ACTION/GOTO
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@lru_cache(maxsize=4096)
+def decode_action(action: str) -> Tuple[str, int]:
+    """Decodifica una acción de la tabla ('s5' -> ('s', 5), 'acc' -> ('a', 0))"""
+    if action in ('acc', 'accept'):
+        return 'a', 0
+    return action[0], int(action[1:])
+
+
+class ParseSession:
+    """
+    Ejecuta el autómata de pila token por token
+
+    Mantiene solo la pila de estados, así que puede recibir la entrada en
+    partes (chunks) y emitir eventos de aceptación o error en cuanto ocurren.
+    Las tablas se leen del parser sin copiarlas: muchas sesiones pueden
+    compartir el mismo parser construido.
+    """
+
+    def __init__(self, parser):
+        """
+        Inicializa la sesión
+
+        Args:
+            parser: Instancia de LR1Parser (o subclase) ya construida
+        """
+        self.action_table = parser.action_table
+        self.goto_table = parser.goto_table
+        self.grammar = parser.grammar
+
+        self.stack: List[int] = [0]
+        self.tokens = 0  # Tokens desplazados (shift) hasta ahora
+        self.accepted = False
+        self.error: Optional[str] = None
+        self.error_token: Optional[str] = None
+
+        # Fragmento de token pendiente entre chunks de texto
+        self._pending = ''
+
+    @property
+    def closed(self) -> bool:
+        """La sesión termina al aceptar o al encontrar un error"""
+        return self.accepted or self.error is not None
+
+    def push(self, symbol: str) -> bool:
+        """
+        Procesa un token (aplicando todas las reducciones necesarias)
+
+        Args:
+            symbol: Token de entrada; '$' indica fin de entrada
+
+        Returns:
+            False si el token produjo un error, True en otro caso
+        """
+        if self.closed:
+            if self.error is None:
+                self._fail(symbol, 'La sesión ya aceptó la entrada')
+            return False
+
+        stack = self.stack
+        action_table = self.action_table
+
+        while True:
+            action = action_table.get((stack[-1], symbol))
+
+            if action is None:
+                self._fail(symbol, f'Error sintáctico en posición {self.tokens}: '
+                                   f'símbolo inesperado "{symbol}"')
+                return False
+
+            kind, arg = decode_action(action)
+
+            if kind == 's':  # Shift
+                stack.append(arg)
+                self.tokens += 1
+                return True
+
+            if kind == 'r':  # Reduce
+                prod = self.grammar[arg]
+                if prod.right:
+                    del stack[-len(prod.right):]
+                    if not stack:
+                        stack.append(0)
+
+                goto_state = self.goto_table.get((stack[-1], prod.left))
+                if goto_state is None:
+                    self._fail(symbol, f'Error en GOTO({stack[-1]}, {prod.left})')
+                    return False
+                stack.append(goto_state)
+                continue
+
+            # Accept
+            self.accepted = True
+            return True
+
+    def feed(self, tokens: Iterable[str]) -> Dict[str, Any]:
+        """Procesa una secuencia de tokens ya separados"""
+        # Un fragmento pendiente de feed_text queda completo al llegar tokens separados
+        pending, self._pending = self._pending, ''
+        if pending:
+            tokens = [pending, *tokens]
+        return self._feed(tokens)
+
+    def feed_text(self, chunk: str, final: bool = False) -> Dict[str, Any]:
+        """
+        Procesa un fragmento de texto crudo
+
+        Un token puede quedar partido entre dos fragmentos, por eso el
+        último token se retiene hasta ver un espacio o el fin de entrada.
+
+        Args:
+            chunk: Fragmento de texto
+            final: El fragmento termina en un límite de token (por ejemplo,
+                el fin del cuerpo de una petición): no se retiene nada
+        """
+        text = self._pending + chunk
+        tokens = text.split()
+
+        if tokens and not final and not text[-1].isspace():
+            self._pending = tokens.pop()
+        else:
+            self._pending = ''
+
+        return self._feed(tokens)
+
+    def drop_pending(self):
+        """Descarta el fragmento de token pendiente (el texto que lo completaba no llegará)"""
+        self._pending = ''
+
+    def abort(self, message: str) -> Dict[str, Any]:
+        """Cierra la sesión con un error ajeno a la gramática (por ejemplo, texto mal codificado)"""
+        self._pending = ''
+        if not self.closed:
+            self._fail(None, message)
+        return self.status()
+
+    def finish(self) -> Dict[str, Any]:
+        """Marca el fin de entrada y retorna el resultado final"""
+        pending, self._pending = self._pending, ''
+        if pending and not self.push(pending):
+            return self.status()
+        if not self.closed:
+            self.push('$')
+        return self.status()
+
+    def _feed(self, tokens: Iterable[str]) -> Dict[str, Any]:
+        """Procesa tokens hasta agotarlos o hasta el primer error"""
+        for symbol in tokens:
+            if not self.push(symbol):
+                break
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Retorna el estado actual como evento serializable"""
+        if self.error is not None:
+            return {
+                'event': 'error',
+                'tokens': self.tokens,
+                'token': self.error_token,
+                'error': self.error
+            }
+        if self.accepted:
+            return {'event': 'accept', 'tokens': self.tokens}
+        return {'event': 'progress', 'tokens': self.tokens}
+
+    def _fail(self, symbol: Optional[str], message: str):
+        """Registra el primer error de la sesión"""
+        self.error = message
+        self.error_token = symbol
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Generación de oraciones aleatorias de una gramática (entradas válidas y casi válidas)
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import random
+from functools import reduce
+from math import gcd
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Longitud "infinita" (no terminal recursivo o improductivo)
+UNBOUNDED = float('inf')
+
+# Tipos de mutación de un solo token para casos negativos
+MUTATIONS = ('delete', 'insert', 'replace', 'swap')
+
+
+class SentenceGenerator:
+    """
+    Genera oraciones del lenguaje de una gramática con una longitud objetivo
+
+    Al crearse calcula, para cada no terminal y cada producción, la longitud
+    mínima y máxima de sus derivaciones (la máxima es UNBOUNDED si hay
+    recursión). Expandir un símbolo con un presupuesto de tokens consiste en
+    elegir al azar una producción cuyo rango contenga el presupuesto y
+    repartir el sobrante entre los símbolos que pueden crecer, ajustando cada
+    parte a una longitud que el símbolo pueda derivar.
+
+    Para producir millones de tokens por segundo, las derivaciones cortas
+    (hasta fragment_max tokens) se precalculan: por cada no terminal y cada
+    longitud se guardan pool_size fragmentos y al generar se copian con
+    list.extend en lugar de expandirse símbolo a símbolo.
+    """
+
+    def __init__(self, parser, seed: Optional[int] = None,
+                 fragment_max: int = 48, pool_size: int = 8):
+        """
+        Args:
+            parser: Parser con la gramática ya cargada (parse_grammar)
+            seed: Semilla para obtener siempre las mismas oraciones
+            fragment_max: Longitud máxima de los fragmentos precalculados
+            pool_size: Fragmentos distintos por no terminal y longitud
+        """
+        self.parser = parser
+        self.start_symbol = parser.start_symbol
+        self.terminals = sorted(t for t in parser.terminals if t != '$')
+        self.random = random.Random(seed)
+        self.fragment_max = fragment_max
+        self.pool_size = pool_size
+
+        # Producciones por no terminal (sin la aumentada S' -> S)
+        self.productions: Dict[str, List[List[str]]] = {}
+        for prod in parser.grammar:
+            if prod.left != parser.augmented_start:
+                self.productions.setdefault(prod.left, []).append(list(prod.right))
+
+        self.min_lengths = self._compute_min_lengths()
+        self.max_lengths = self._compute_max_lengths()
+
+        # Producciones utilizables (todos sus símbolos son productivos) con
+        # su rango de longitudes y el de cada símbolo
+        self._options: Dict[str, List[Tuple]] = {}
+        # Por no terminal: presupuesto a partir del cual solo sirven las
+        # producciones no acotadas, y esas producciones
+        self._unbounded: Dict[str, Tuple[float, List[Tuple]]] = {}
+        for left, alternatives in self.productions.items():
+            options = []
+            for right in alternatives:
+                mins = [self._length(s, self.min_lengths) for s in right]
+                if sum(mins) == UNBOUNDED:
+                    continue
+                maxs = [self._length(s, self.max_lengths) for s in right]
+                growable = [i for i in range(len(right)) if maxs[i] > mins[i]]
+                options.append((right, sum(mins), sum(maxs), mins, maxs, growable))
+            self._options[left] = options
+            threshold = max((bound for option in options for bound in option[1:3] if bound < UNBOUNDED),
+                            default=0)
+            self._unbounded[left] = (threshold, [o for o in options if o[2] == UNBOUNDED])
+
+        self._fragments: Dict[str, Dict[int, List[List[str]]]] = {nt: {} for nt in self.productions}
+        self._periods: Dict[str, int] = {}
+        self._build_fragments()
+
+        # Periodo de las longitudes posibles de cada no terminal (mcd de las
+        # diferencias entre longitudes con fragmentos)
+        for symbol, pools in self._fragments.items():
+            lengths = sorted(pools)
+            if len(lengths) > 1:
+                self._periods[symbol] = reduce(gcd, (b - lengths[0] for b in lengths[1:]))
+
+    # ------------------------------------------------------------------
+    # Longitudes de derivación
+    # ------------------------------------------------------------------
+
+    def _length(self, symbol: str, lengths: Dict[str, float]) -> float:
+        return lengths.get(symbol, UNBOUNDED) if symbol in self.productions else 1
+
+    def _compute_min_lengths(self) -> Dict[str, float]:
+        """Punto fijo: menor cantidad de tokens que deriva cada no terminal"""
+        lengths = {nt: UNBOUNDED for nt in self.productions}
+        changed = True
+        while changed:
+            changed = False
+            for left, alternatives in self.productions.items():
+                best = min(sum(self._length(s, lengths) for s in right) for right in alternatives)
+                if best < lengths[left]:
+                    lengths[left] = best
+                    changed = True
+        return lengths
+
+    def _compute_max_lengths(self) -> Dict[str, float]:
+        """
+        Mayor cantidad de tokens que deriva cada no terminal
+
+        Es un camino más largo al estilo Bellman-Ford: si después de tantas
+        pasadas como no terminales hay algún valor todavía crece, ese no
+        terminal está en un ciclo que agrega tokens (recursión), y tanto él
+        como los que lo derivan no tienen cota.
+        """
+        productive = {nt for nt, length in self.min_lengths.items() if length < UNBOUNDED}
+        usable = {left: [right for right in alternatives
+                         if all(s in productive or s not in self.productions for s in right)]
+                  for left, alternatives in self.productions.items() if left in productive}
+        lengths = {nt: 0 for nt in self.productions}
+
+        def relax() -> List[str]:
+            grown = []
+            for left, alternatives in usable.items():
+                best = max((sum(self._length(s, lengths) for s in right) for right in alternatives),
+                           default=0)
+                if best > lengths[left]:
+                    lengths[left] = best
+                    grown.append(left)
+            return grown
+
+        for _ in range(len(usable)):
+            if not relax():
+                return lengths
+
+        # Cada ciclo que agrega tokens hace crecer al menos a uno de sus no terminales
+        for left in relax():
+            lengths[left] = UNBOUNDED
+        changed = True
+        while changed:
+            changed = False
+            for left, alternatives in usable.items():
+                if lengths[left] < UNBOUNDED and any(
+                        any(self._length(s, lengths) == UNBOUNDED for s in right)
+                        for right in alternatives):
+                    lengths[left] = UNBOUNDED
+                    changed = True
+        return lengths
+
+    # ------------------------------------------------------------------
+    # Expansión
+    # ------------------------------------------------------------------
+
+    def _choose(self, symbol: str, budget: int) -> Tuple[List[str], List[int]]:
+        """
+        Elige una producción para el presupuesto y reparte los tokens entre sus símbolos
+
+        Returns:
+            Tupla (lado derecho, presupuesto de cada símbolo)
+        """
+        threshold, unbounded = self._unbounded[symbol]
+        if budget > threshold and unbounded:
+            fitting = unbounded
+        else:
+            fitting = [option for option in self._options[symbol] if option[1] <= budget <= option[2]]
+        if fitting:
+            right, low, _, mins, maxs, growable = self.random.choice(fitting)
+        else:
+            # Longitud inalcanzable: la producción más cercana al presupuesto
+            right, low, _, mins, maxs, growable = min(
+                self._options[symbol], key=lambda o: o[1] - budget if o[1] > budget else budget - o[2])
+
+        budgets = list(mins)
+        extra = budget - low
+        if extra > 0 and growable:
+            # Reparto aleatorio ajustado a longitudes posibles de cada símbolo;
+            # la diferencia (positiva o negativa) pasa a los siguientes
+            order = list(growable)
+            self.random.shuffle(order)
+            for position, i in enumerate(order):
+                amount = extra if position == len(order) - 1 else self.random.randint(0, max(extra, 0))
+                target = self._feasible(right[i], budgets[i] + amount, mins[i], maxs[i])
+                extra -= target - budgets[i]
+                budgets[i] = target
+            for i in order:
+                if extra == 0:
+                    break
+                target = self._feasible(right[i], budgets[i] + extra, mins[i], maxs[i])
+                extra -= target - budgets[i]
+                budgets[i] = target
+        return right, budgets
+
+    def _feasible(self, symbol: str, budget: int, low: int, high: float) -> int:
+        """
+        Longitud más cercana a budget (dentro de [low, high]) que symbol puede derivar
+
+        Las longitudes cortas se conocen por los fragmentos; para las mayores
+        se asume la periodicidad observada en las cortas (por ejemplo, una
+        expresión con paréntesis y operadores binarios solo tiene longitudes
+        impares).
+        """
+        budget = max(low, min(budget, high))
+        if budget > self.fragment_max:
+            period = self._periods.get(symbol, 1)
+            offset = (budget - self.min_lengths[symbol]) % period
+            if offset and budget - offset > self.fragment_max:
+                return budget - offset
+            if offset and budget - offset + period <= high:
+                return budget - offset + period
+            return budget
+
+        pools = self._fragments[symbol]
+        for distance in range(self.fragment_max + 1):
+            if budget - distance >= low and budget - distance in pools:
+                return budget - distance
+            if budget + distance <= high and (budget + distance in pools or
+                                              budget + distance > self.fragment_max):
+                return budget + distance
+        return budget
+
+    def _expand(self, symbol: str, budget: int, out: List[str]):
+        """Agrega a out una derivación de symbol de aproximadamente budget tokens"""
+        stack = [(symbol, budget)]
+        fragments = self._fragments
+        fragment_max = self.fragment_max
+        choice = self.random.choice
+
+        while stack:
+            symbol, budget = stack.pop()
+            if symbol not in fragments:
+                out.append(symbol)
+                continue
+
+            if budget <= fragment_max:
+                pool = fragments[symbol].get(budget)
+                if pool:
+                    out.extend(choice(pool))
+                    continue
+
+            right, budgets = self._choose(symbol, budget)
+            for child, child_budget in zip(reversed(right), reversed(budgets)):
+                stack.append((child, child_budget))
+
+    def _build_fragments(self):
+        """
+        Precalcula fragmentos cortos por no terminal y longitud, de menor a mayor
+
+        Una longitud se repite hasta que no aparecen fragmentos nuevos: con
+        producciones unitarias (A -> B) el fragmento de A depende del de B
+        de la misma longitud.
+        """
+        for length in range(self.fragment_max + 1):
+            pending = [symbol for symbol in self.productions
+                       if self.min_lengths[symbol] <= length <= self.max_lengths[symbol]]
+            while pending:
+                remaining = []
+                for symbol in pending:
+                    pool = []
+                    for _ in range(self.pool_size):
+                        fragment: List[str] = []
+                        self._expand(symbol, length, fragment)
+                        if len(fragment) == length:
+                            pool.append(fragment)
+                    if pool:
+                        self._fragments[symbol][length] = pool
+                    else:
+                        remaining.append(symbol)
+                if len(remaining) == len(pending):
+                    break
+                pending = remaining
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def sentence(self, length: int) -> List[str]:
+        """
+        Oración válida de aproximadamente length tokens
+
+        Casi siempre tiene exactamente length tokens; si la gramática no
+        tiene oraciones de esa longitud se usa la más cercana posible, y en
+        gramáticas irregulares la diferencia es de unos pocos tokens.
+
+        Raises:
+            ValueError: Si el símbolo inicial no deriva ninguna cadena
+        """
+        symbol = self.start_symbol
+        if self.min_lengths.get(symbol, UNBOUNDED) == UNBOUNDED:
+            raise ValueError(f"El símbolo inicial {symbol} no deriva ninguna cadena")
+        out: List[str] = []
+        self._expand(symbol, self._feasible(symbol, length, self.min_lengths[symbol],
+                                            self.max_lengths[symbol]), out)
+        return out
+
+    def sentences(self, count: int, length: int) -> Iterator[List[str]]:
+        """Genera count oraciones válidas de aproximadamente length tokens"""
+        for _ in range(count):
+            yield self.sentence(length)
+
+    def mutate(self, tokens: List[str], kind: Optional[str] = None) -> Tuple[List[str], Dict]:
+        """
+        Aplica una mutación de un solo token
+
+        Args:
+            tokens: Oración original (no se modifica)
+            kind: 'delete', 'insert', 'replace' o 'swap' (None = al azar)
+
+        Returns:
+            Tupla (tokens mutados, descripción con kind, position y token)
+        """
+        kind = kind or self.random.choice(MUTATIONS)
+        if kind not in MUTATIONS:
+            raise ValueError(f"Mutación no válida: {kind}. Opciones: {', '.join(MUTATIONS)}")
+        if not tokens and kind != 'insert':
+            kind = 'insert'
+
+        mutated = list(tokens)
+        if kind == 'insert':
+            position = self.random.randint(0, len(mutated))
+            token = self.random.choice(self.terminals)
+            mutated.insert(position, token)
+        elif kind == 'delete':
+            position = self.random.randrange(len(mutated))
+            token = mutated.pop(position)
+        elif kind == 'replace':
+            position = self.random.randrange(len(mutated))
+            others = [t for t in self.terminals if t != mutated[position]] or self.terminals
+            token = self.random.choice(others)
+            mutated[position] = token
+        else:
+            position = self.random.randrange(max(1, len(mutated) - 1))
+            mutated[position:position + 2] = mutated[position:position + 2][::-1]
+            token = mutated[position]
+
+        return mutated, {'kind': kind, 'position': position, 'token': token}
+
+    def negative(self, length: int, kind: Optional[str] = None,
+                 max_attempts: int = 20) -> Tuple[List[str], Dict]:
+        """
+        Oración casi válida que el parser rechaza (una sola mutación)
+
+        Algunas mutaciones producen otra oración válida (por ejemplo, borrar
+        un token opcional), así que se verifica con parse_tokens y se
+        reintenta.
+
+        Raises:
+            ValueError: Si ninguna mutación fue rechazada en max_attempts intentos
+        """
+        for _ in range(max_attempts):
+            mutated, mutation = self.mutate(self.sentence(length), kind)
+            result = self.parser.parse_tokens((token, i) for i, token in enumerate(mutated))
+            if not result['success']:
+                mutation['error_position'] = result['offset']
+                return mutated, mutation
+        raise ValueError(f"No se obtuvo una oración inválida en {max_attempts} intentos")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Tablas ACTION/GOTO compiladas en un archivo compartido entre procesos
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Con gunicorn cada worker es un proceso con su propio registro, así que cada
+uno construía y guardaba sus propias tablas (diccionarios de Python). El
+primer proceso que construye una gramática escribe aquí sus tablas como
+matrices int32 densas y el resto las mapea en memoria en modo solo lectura:
+las páginas las comparte el sistema operativo, de modo que agregar workers
+no multiplica la memoria de las tablas y una gramática construida por un
+worker se puede usar en los demás sin volver a construirla.
+
+Formato del archivo (enteros int32 en el orden de bytes de la máquina):
+
+    MAGIC | versión | largo del encabezado | encabezado JSON | relleno
+    ACTION  estados x terminales     0 = error, (n << 2) | tipo
+                                     (1 = shift n, 2 = reduce n, 3 = accept)
+    GOTO    estados x no terminales  destino + 1 (0 = sin entrada)
+    SHIFT   estados x terminales     destino + 1 de la transición con el terminal
+    KERNELS desplazamiento de cada estado (estados + 1) y los items
+            (producción, punto, índice del lookahead o -1) de los kernels
+
+El encabezado guarda la gramática (texto y producciones), los terminales y
+no terminales en el orden de las columnas, los conflictos y los datos del
+registro.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+# Importar desde el mismo directorio si se ejecuta directamente
+try:
+    from parser.lr1_parser import LR1Item
+    from parser.state_store import KernelStates, kernel_of
+except ModuleNotFoundError:
+    from lr1_parser import LR1Item
+    from state_store import KernelStates, kernel_of
+
+MAGIC = b'LRTB'
+VERSION = 1
+
+# MAGIC, versión y largo del encabezado JSON
+_PREFIX = struct.Struct('<4sII')
+
+_SHIFT, _REDUCE, _ACCEPT = 1, 2, 3
+
+
+def _encode_action(action: str) -> int:
+    """Codifica una acción de la tabla como entero ('s5' -> 5 << 2 | 1)"""
+    if action in ('acc', 'accept'):
+        return _ACCEPT
+    kind = _SHIFT if action[0] == 's' else _REDUCE
+    return (int(action[1:]) << 2) | kind
+
+
+def _decode_action(cell: int) -> str:
+    """Inverso de _encode_action"""
+    kind = cell & 3
+    if kind == _ACCEPT:
+        return 'acc'
+    return f"{'s' if kind == _SHIFT else 'r'}{cell >> 2}"
+
+
+class SharedTable(Mapping):
+    """
+    Vista de solo lectura (estado, símbolo) -> valor sobre una matriz compartida
+
+    Se usa en lugar de los diccionarios ACTION, GOTO y transitions del parser
+    (get, in, items, len), sin copiar las celdas a objetos de Python.
+    """
+
+    def __init__(self, cells: Sequence[int], symbols: List[str], decode: Callable[[int], Any]):
+        """
+        Args:
+            cells: Celdas de la matriz, fila por estado (0 = sin entrada)
+            symbols: Símbolo de cada columna
+            decode: Convierte una celda no nula en el valor de la tabla
+        """
+        self._cells = cells
+        self._symbols = symbols
+        self._columns = {symbol: column for column, symbol in enumerate(symbols)}
+        self._width = len(symbols)
+        self._rows = len(cells) // self._width if self._width else 0
+        self._decode = decode
+        # Valores ya decodificados: hay pocos distintos (estados y producciones)
+        self._values: Dict[int, Any] = {}
+        self._size: Optional[int] = None
+
+    def get(self, key: Tuple[int, str], default=None):
+        state, symbol = key
+        column = self._columns.get(symbol)
+        if column is None or not 0 <= state < self._rows:
+            return default
+        cell = self._cells[state * self._width + column]
+        return self._value(cell) if cell else default
+
+    def _value(self, cell: int):
+        """Valor de una celda no nula"""
+        value = self._values.get(cell)
+        if value is None:
+            value = self._values[cell] = self._decode(cell)
+        return value
+
+    def __getitem__(self, key: Tuple[int, str]):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for key, _ in self.items():
+            yield key
+
+    def items(self) -> Iterator[Tuple[Tuple[int, str], Any]]:
+        width, symbols = self._width, self._symbols
+        for index, cell in enumerate(self._cells):
+            if cell:
+                yield (index // width, symbols[index % width]), self._value(cell)
+
+    def __len__(self) -> int:
+        if self._size is None:
+            self._size = sum(1 for cell in self._cells if cell)
+        return self._size
+
+
+class SharedKernels(Sequence):
+    """Kernels de los estados leídos del archivo al pedirlos (para KernelStates)"""
+
+    def __init__(self, offsets: Sequence[int], items: Sequence[int], terminals: List[str]):
+        self._offsets = offsets
+        self._items = items
+        self._terminals = terminals
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> FrozenSet[LR1Item]:
+        if index < 0:
+            index += len(self)
+        items, terminals = self._items, self._terminals
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return frozenset(LR1Item(items[i], items[i + 1], terminals[items[i + 2]] if items[i + 2] >= 0 else '')
+                         for i in range(3 * start, 3 * end, 3))
+
+
+def _columns(parser) -> Tuple[List[str], List[str]]:
+    """Terminales y no terminales en el orden de las columnas del archivo"""
+    terminals = sorted(parser.terminals | {'$'})
+    non_terminals = sorted(parser.non_terminals)
+    return terminals, non_terminals
+
+
+def write_tables(parser, path: str, header: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Escribe las tablas de un parser construido en un archivo compartido
+
+    El archivo se escribe aparte y se publica con os.replace, así que otro
+    proceso nunca ve un archivo a medio escribir.
+
+    Args:
+        parser: Parser construido (no perezoso)
+        path: Ruta del archivo
+        header: Datos adicionales para el encabezado (grammar_id, texto de
+            la gramática, tipo de parser, ...)
+
+    Returns:
+        Tamaño del archivo en bytes
+    """
+    terminals, non_terminals = _columns(parser)
+    terminal_column = {symbol: column for column, symbol in enumerate(terminals)}
+    non_terminal_column = {symbol: column for column, symbol in enumerate(non_terminals)}
+    num_states = len(parser.states)
+
+    action = array('i', bytes(4 * num_states * len(terminals)))
+    shift = array('i', bytes(4 * num_states * len(terminals)))
+    goto = array('i', bytes(4 * num_states * len(non_terminals)))
+    for (state, symbol), value in parser.action_table.items():
+        action[state * len(terminals) + terminal_column[symbol]] = _encode_action(value)
+    for (state, symbol), target in parser.goto_table.items():
+        goto[state * len(non_terminals) + non_terminal_column[symbol]] = target + 1
+    for (state, symbol), target in parser.transitions.items():
+        if symbol in terminal_column:
+            shift[state * len(terminals) + terminal_column[symbol]] = target + 1
+
+    offsets = array('i', [0])
+    items = array('i')
+    kernels = parser.states.kernels if isinstance(parser.states, KernelStates) else map(kernel_of, parser.states)
+    for kernel in kernels:
+        for item in sorted(kernel, key=lambda x: (x.production, x.dot_position, x.lookahead)):
+            items.extend((item.production, item.dot_position,
+                          terminal_column[item.lookahead] if item.lookahead else -1))
+        offsets.append(len(items) // 3)
+
+    encoded = json.dumps({
+        **(header or {}),
+        'parser_type_name': parser.parser_type_name,
+        'productions': [[prod.left, prod.right] for prod in parser.grammar],
+        'terminals': terminals,
+        'non_terminals': non_terminals,
+        'states': num_states,
+        'conflicts': parser.conflicts
+    }).encode('utf-8')
+    # Las matrices empiezan alineadas a 4 bytes
+    encoded += b' ' * (-(_PREFIX.size + len(encoded)) % 4)
+
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, VERSION, len(encoded)))
+            f.write(encoded)
+            for table in (action, goto, shift, offsets, items):
+                table.tofile(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return os.path.getsize(path)
+
+
+class SharedTables:
+    """Tablas de un archivo compartido, mapeadas en memoria en modo solo lectura"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Archivo escrito por write_tables
+
+        Raises:
+            ValueError: Si el archivo no tiene el formato o la versión esperados
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_size = _PREFIX.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' no es un archivo de tablas compatible")
+
+        self.header: Dict[str, Any] = json.loads(bytes(self._buffer[_PREFIX.size:_PREFIX.size + header_size]))
+        self.terminals: List[str] = self.header['terminals']
+        self.non_terminals: List[str] = self.header['non_terminals']
+        self.num_states: int = self.header['states']
+        self.size_bytes = len(self._buffer)
+
+        cells = memoryview(self._buffer)[_PREFIX.size + header_size:].cast('i')
+        sizes = (self.num_states * len(self.terminals),
+                 self.num_states * len(self.non_terminals),
+                 self.num_states * len(self.terminals),
+                 self.num_states + 1)
+        arrays = []
+        for size in sizes:
+            arrays.append(cells[:size])
+            cells = cells[size:]
+        action, goto, shift, offsets = arrays
+
+        self.action_table = SharedTable(action, self.terminals, _decode_action)
+        self.goto_table = SharedTable(goto, self.non_terminals, lambda cell: cell - 1)
+        # transitions reúne los shifts de la construcción (los que la precedencia
+        # descartó también) y GOTO
+        self.transitions = _Transitions(SharedTable(shift, self.terminals, lambda cell: cell - 1),
+                                        self.goto_table)
+        self.kernels = SharedKernels(offsets, cells, self.terminals)
+
+    def install(self, parser):
+        """Reemplaza las tablas del parser (ya construido) por las compartidas"""
+        parser.action_table = self.action_table
+        parser.goto_table = self.goto_table
+        parser.transitions = self.transitions
+
+    def attach(self, parser):
+        """
+        Completa un parser que solo cargó su gramática (LR1Parser.load_shared)
+
+        Los estados quedan como KernelStates sobre los kernels del archivo: las
+        clausuras se recalculan al mostrarlos.
+
+        Raises:
+            ValueError: Si la gramática del parser no es la de las tablas
+        """
+        productions = [[prod.left, prod.right] for prod in parser.grammar]
+        if productions != self.header['productions']:
+            raise ValueError(f"Las tablas de '{self.path}' son de otra gramática")
+
+        self.install(parser)
+        parser.states = KernelStates(self.kernels, parser._closure_of_kernel)
+        parser.kernel_only = True
+        parser.conflicts = self.header['conflicts']
+
+
+class _Transitions(Mapping):
+    """Transiciones del autómata: shifts sobre terminales y GOTO sobre no terminales"""
+
+    def __init__(self, shifts: SharedTable, gotos: SharedTable):
+        self._shifts = shifts
+        self._gotos = gotos
+
+    def get(self, key: Tuple[int, str], default=None):
+        value = self._shifts.get(key)
+        if value is None:
+            value = self._gotos.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: Tuple[int, str]):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        yield from self._shifts
+        yield from self._gotos
+
+    def items(self):
+        yield from self._shifts.items()
+        yield from self._gotos.items()
+
+    def __len__(self) -> int:
+        return len(self._shifts) + len(self._gotos)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Estados guardados solo con su kernel y clausura recalculada bajo demanda
+Compiladores - UTEC - Puntos Extras Examen 2
+
+Una vez construidas las tablas, las clausuras solo se usan para mostrar los
+estados (get_states_info, /api/get_states, etiquetas de Graphviz) y suelen
+tener varias veces más items que el kernel. Con parser.kernel_only = True,
+parser.states pasa a ser un KernelStates: guarda el kernel de cada estado
+y recalcula la clausura al pedirla, con una caché LRU pequeña.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Set
+
+
+def kernel_of(state: Iterable) -> FrozenSet:
+    """Items del kernel: los que tienen el punto avanzado y el item inicial S' -> •S"""
+    return frozenset(item for item in state if item.dot_position > 0 or item.production == 0)
+
+
+class KernelStates:
+    """
+    Secuencia de estados que guarda solo los kernels
+
+    Se comporta como la lista de conjuntos que reemplaza (len, índice,
+    iteración): cada acceso retorna la clausura completa del estado.
+    """
+
+    def __init__(self, kernels: List[FrozenSet], closure: Callable[[FrozenSet], Set],
+                 cache_size: int = 64):
+        """
+        Args:
+            kernels: Kernel de cada estado, en orden
+            closure: Calcula la clausura de un kernel
+            cache_size: Clausuras recientes que se conservan
+        """
+        self.kernels = kernels
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._closure = closure
+        self._cache: 'OrderedDict[int, Set]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.kernels)
+
+    def __getitem__(self, index: int) -> Set:
+        if index < 0:
+            index += len(self.kernels)
+        with self._lock:
+            state = self._cache.get(index)
+            if state is not None:
+                self._cache.move_to_end(index)
+                self.hits += 1
+                return state
+
+        state = self._closure(self.kernels[index])
+        with self._lock:
+            self.misses += 1
+            self._cache[index] = state
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return state
+
+    def __iter__(self) -> Iterator[Set]:
+        for index in range(len(self.kernels)):
+            yield self[index]
+
+    def item_count(self) -> int:
+        """Items guardados (sin contar las clausuras en caché)"""
+        return sum(len(kernel) for kernel in self.kernels)
+
+
+def states_memory_bytes(states) -> int:
+    """
+    Memoria que ocupan los estados guardados: contenedores e items
+
+    Para KernelStates cuenta solo los kernels (la caché de clausuras es
+    acotada y temporal). Los objetos compartidos se cuentan una sola vez;
+    los enteros y strings de los items son compartidos con la gramática y no
+    se cuentan.
+    """
+    seen = set()
+    total = 0
+
+    def add(obj):
+        nonlocal total
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+
+    containers = states.kernels if isinstance(states, KernelStates) else states
+    add(containers)
+    for state in containers:
+        add(state)
+        for item in state:
+            add(item)
+            add(item.__dict__)
+    return total
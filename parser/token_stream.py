@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tokenización perezosa de archivos grandes usando memory-mapping
+Compiladores - UTEC - Puntos Extras Examen 2
+"""
+
+import mmap
+import os
+import re
+from typing import Dict, Iterator, Tuple
+
+# Un token es cualquier secuencia de bytes sin espacios (igual que str.split())
+_TOKEN_RE = re.compile(rb'\S+')
+
+# Límite de tokens distintos que se guardan decodificados en memoria
+_INTERN_LIMIT = 4096
+
+
+def iter_mmap_tokens(path: str, encoding: str = 'utf-8') -> Iterator[Tuple[str, int]]:
+    """
+    Recorre los tokens de un archivo sin cargarlo completo en memoria
+
+    El archivo se mapea en memoria y se escanea directamente sobre el buffer,
+    por lo que nunca existe una copia del contenido como string de Python.
+    Solo se decodifica cada token distinto una vez (el alfabeto de una
+    gramática es pequeño), así la memoria usada no depende del tamaño del archivo.
+
+    Args:
+        path: Ruta del archivo con tokens separados por espacios
+        encoding: Codificación de los tokens
+
+    Yields:
+        Tuplas (token, offset_en_bytes)
+    """
+    with open(path, 'rb') as f:
+        # mmap no acepta archivos vacíos
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            interned: Dict[bytes, str] = {}
+
+            for match in _TOKEN_RE.finditer(buffer):
+                raw = match.group()
+                token = interned.get(raw)
+
+                if token is None:
+                    token = raw.decode(encoding)
+                    if len(interned) < _INTERN_LIMIT:
+                        interned[raw] = token
+
+                yield token, match.start()
@@ -5,14 +5,43 @@ Compiladores - UTEC - Puntos Extras Examen 2
 """
 
 import graphviz
-from typing import Set, Dict
+import json
+from collections import defaultdict
+from typing import Set, Dict, Iterator, Optional, Tuple
 import subprocess
+import shutil
 import os
 
+try:
+    from parser.layout import LayeredLayout, layout_to_svg, text_size
+except ModuleNotFoundError:
+    from layout import LayeredLayout, layout_to_svg, text_size
+
+
+def render_dot_source(source: str, output_format: str = 'svg') -> bytes:
+    """
+    Renderiza código DOT en memoria (dot por pipe, sin archivos temporales)
+
+    Args:
+        source: Código DOT
+        output_format: Formato de salida ('png', 'pdf', 'svg')
+    """
+    if output_format == 'dot':
+        return source.encode('utf-8')
+    return graphviz.Source(source).pipe(format=output_format)
+
+
+def dot_available() -> bool:
+    """Indica si el binario dot de Graphviz está instalado en el PATH"""
+    return shutil.which('dot') is not None
+
 
 class LR1GraphvizVisualizer:
     """Visualizador profesional del autómata LR(1) usando Graphviz directo"""
 
+    # Vistas disponibles en create_view
+    VIEWS = ('full', 'kernel', 'ids', 'summary')
+
     def __init__(self, parser):
         """
         Inicializa el visualizador
@@ -23,6 +52,25 @@ class LR1GraphvizVisualizer:
         self.parser = parser
         self.dot = None
 
+        # Índices de adyacencia para las vistas parciales (se crean bajo demanda)
+        self._successors = None
+        self._predecessors = None
+
+        # Estados expandidos del parser perezoso cuando se calcularon dot y
+        # los índices (el autómata crece con cada análisis)
+        self._expanded_seen = None
+
+    def _discard_if_grown(self):
+        """Descarta el grafo y los índices si el parser perezoso expandió estados desde que se calcularon"""
+        if not getattr(self.parser, 'lazy', False):
+            return
+        expanded = self.parser.expanded_states
+        if expanded != self._expanded_seen:
+            self._expanded_seen = expanded
+            self.dot = None
+            self._successors = None
+            self._predecessors = None
+
     def _format_item(self, item) -> str:
         """Formatea un item LR(1) para visualización"""
         prod = self.parser.grammar[item.production]
@@ -32,25 +80,24 @@ class LR1GraphvizVisualizer:
         right.insert(item.dot_position, '•')
         right_str = ' '.join(right)
 
+        # Los items LR(0) (LR(0) y SLR(1)) no tienen lookahead
+        if not item.lookahead:
+            return f"{prod.left} → {right_str}"
         return f"{prod.left} → {right_str}, {item.lookahead}"
 
-    def _format_state_label(self, state_idx: int, state_items: Set) -> str:
-        """Formatea la etiqueta de un estado con sus items"""
-        items_list = []
-
-        # Ordenar items para presentación consistente
+    def _state_lines(self, state_items) -> list:
+        """Items de un estado formateados y ordenados para presentación consistente"""
         sorted_items = sorted(
             state_items,
             key=lambda x: (x.production, x.dot_position, x.lookahead)
         )
+        return [self._format_item(item) for item in sorted_items]
 
-        for item in sorted_items:
-            item_str = self._format_item(item)
-            items_list.append(item_str)
-
+    def _format_state_label(self, state_idx: int, state_items: Set) -> str:
+        """Formatea la etiqueta de un estado con sus items"""
         # Construir etiqueta HTML-like para mejor formato
         header = f"<B>I{state_idx}</B>"
-        items_text = '<BR/>'.join(items_list)
+        items_text = '<BR/>'.join(self._state_lines(state_items))
 
         return f"<{header}<BR/><BR/>{items_text}>"
 
@@ -60,94 +107,443 @@ class LR1GraphvizVisualizer:
         if state_idx == 0:
             return 'lightgreen'
 
-        # Estados de aceptación (tienen S' -> S •, $)
+        # Estados de aceptación (tienen S' -> S •, $; sin lookahead en LR(0))
         for item in state_items:
             prod = self.parser.grammar[item.production]
             if (prod.left == self.parser.augmented_start and
                 item.dot_position == len(prod.right) and
-                item.lookahead == '$'):
+                item.lookahead in ('$', '')):
                 return 'lightcoral'
 
         # Estados normales
         return 'lightblue'
 
-    def create_automaton(self):
-        """Crea el grafo del autómata LR(1) usando Graphviz"""
-        # Crear grafo dirigido
-        self.dot = graphviz.Digraph(
+    def _kernel_items(self, state_items: Set) -> list:
+        """Items del kernel: los que tienen el punto avanzado (o el item inicial S' -> • S)"""
+        return [item for item in state_items
+                if item.dot_position > 0 or item.production == 0]
+
+    def _build_adjacency(self):
+        """Índices de sucesores y predecesores por estado (se calculan una sola vez)"""
+        self._discard_if_grown()
+        if self._successors is not None:
+            return
+
+        self._successors = defaultdict(list)
+        self._predecessors = defaultdict(set)
+        for (from_state, symbol), to_state in sorted(self.parser.transitions.items()):
+            self._successors[from_state].append((symbol, to_state))
+            self._predecessors[to_state].add(from_state)
+
+    def neighborhood(self, center: int, radius: int = 1) -> Set[int]:
+        """
+        Estados a distancia <= radius de center (ignorando la dirección de las aristas)
+
+        El costo depende solo del tamaño de la vecindad, no del autómata completo.
+        """
+        self._build_adjacency()
+
+        visited = {center}
+        frontier = [center]
+        for _ in range(radius):
+            next_frontier = []
+            for state in frontier:
+                neighbors = [to for _, to in self._successors[state]]
+                neighbors.extend(self._predecessors[state])
+                for neighbor in neighbors:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        return visited
+
+    def _new_graph(self, title: str, dpi: str = '300') -> graphviz.Digraph:
+        """Crea un grafo dirigido con la configuración global del autómata"""
+        dot = graphviz.Digraph(
             'LR1_Automaton',
             comment='Autómata LR(1)',
             format='png'
         )
 
         # Configuración global del grafo
-        self.dot.attr(rankdir='LR')  # Izquierda a derecha
-        self.dot.attr(dpi='300')  # Mayor resolución
-        self.dot.attr('node', shape='rectangle', style='rounded,filled',
-                     fontname='Courier', fontsize='14', margin='0.3,0.2')
-        self.dot.attr('edge', fontname='Arial Bold', fontsize='14')
+        dot.attr(rankdir='LR')  # Izquierda a derecha
+        dot.attr(dpi=dpi)  # Mayor resolución
+        dot.attr('node', shape='rectangle', style='rounded,filled',
+                 fontname='Courier', fontsize='14', margin='0.3,0.2')
+        dot.attr('edge', fontname='Arial Bold', fontsize='14')
 
         # Título del autómata
-        self.dot.attr(label='\\n\\nAutómata LR(1)\\n',
-                     fontsize='20', fontname='Arial Bold')
+        dot.attr(label=f'\\n\\n{title}\\n',
+                 fontsize='20', fontname='Arial Bold')
+
+        return dot
+
+    def _add_accept_node(self, dot: graphviz.Digraph):
+        """Nodo de aceptación final"""
+        dot.node('accept', '<<B>ACCEPT</B>>',
+                 shape='doublecircle',
+                 style='filled',
+                 fillcolor='lightcoral',
+                 fontsize='18',
+                 width='1.2',
+                 height='1.2')
+
+    def _add_accept_edge(self, dot: graphviz.Digraph, accept_node: str):
+        """Transición desde el estado de aceptación hacia ACCEPT con $"""
+        dot.edge(
+            accept_node,
+            'accept',
+            label='$',
+            fontcolor='red',
+            color='red',
+            style='bold',
+            fontsize='16',
+            labeldistance='2.5',
+            labelangle='0'
+        )
+
+    def _iter_view(self, view: str = 'full', center: Optional[int] = None,
+                   radius: int = 1) -> Iterator[Tuple[str, Dict]]:
+        """
+        Describe una vista del autómata sin depender del motor de layout
+
+        Los argumentos se validan de inmediato; los elementos se generan
+        estado por estado, así que exportar no necesita el grafo completo
+        en memoria.
+
+        Returns:
+            Iterador de pares (tipo, datos): primero ('graph', {title, sized,
+            dpi}), luego ('node', {id, kind, title, lines, color, dashed}) y
+            ('edge', {source, target, label, kind}) en el orden del DOT
+        """
+        if view not in self.VIEWS:
+            raise ValueError(f"Vista no válida: {view}. Opciones: {', '.join(self.VIEWS)}")
+
+        num_states = len(self.parser.states)
+        if center is not None and not 0 <= center < num_states:
+            raise ValueError(f"Estado {center} fuera de rango (0-{num_states - 1})")
+
+        if view == 'summary':
+            return self._iter_summary()
+
+        if center is not None:
+            self._build_adjacency()
+        return self._iter_states_view(view, center, radius)
+
+    def _iter_states_view(self, view: str, center: Optional[int], radius: int):
+        """Elementos de las vistas con un nodo por estado (ver _iter_view)"""
+        num_states = len(self.parser.states)
+        if center is None:
+            shown = range(num_states)
+            shown_set = None
+        else:
+            shown = sorted(self.neighborhood(center, radius))
+            shown_set = set(shown)
+        has_start = shown_set is None or 0 in shown_set
+
+        title = 'Autómata LR(1)'
+        if center is not None:
+            title += f' - vecindad de I{center} (radio {radius})'
+
+        # Solo la vista completa necesita alta resolución
+        yield 'graph', {'title': title, 'sized': view in ('full', 'kernel'),
+                        'dpi': '300' if view == 'full' else '96'}
 
         # Nodo invisible para la flecha de inicio
-        self.dot.node('start', '', shape='point', width='0')
+        if has_start:
+            yield 'node', {'id': 'start', 'kind': 'start'}
 
-        # Nodo de aceptación final
-        self.dot.node('accept', '<<B>ACCEPT</B>>',
-                     shape='doublecircle',
-                     style='filled',
-                     fillcolor='lightcoral',
-                     fontsize='18',
-                     width='1.2',
-                     height='1.2')
+        # Nodo de aceptación final (en una vecindad solo si el estado de aceptación aparece)
+        if center is None:
+            yield 'node', {'id': 'accept', 'kind': 'accept'}
 
         # Agregar estados y detectar estado de aceptación
         accept_state = None
-        for idx, state in enumerate(self.parser.states):
-            label = self._format_state_label(idx, state)
+        for idx in shown:
+            state = self.parser.states[idx]
             color = self._get_state_color(idx, state)
 
-            # Configurar nodo
-            node_attrs = {
-                'fillcolor': color,
-                'width': '4.5',
-                'height': '2.0'
-            }
+            if view == 'ids':
+                lines = []
+            else:
+                items = state if view == 'full' else self._kernel_items(state)
+                lines = self._state_lines(items)
 
             # Identificar estado de aceptación (no doble borde aquí)
             if color == 'lightcoral':
                 accept_state = idx
-
-            self.dot.node(str(idx), label, **node_attrs)
+                if center is not None:
+                    yield 'node', {'id': 'accept', 'kind': 'accept'}
+
+            yield 'node', {
+                'id': str(idx),
+                'kind': 'state',
+                'title': f'I{idx}',
+                'lines': lines,
+                'color': color,
+                # Borde punteado: el estado tiene vecinos que no se muestran
+                'dashed': center is not None and self._has_hidden_neighbors(idx, shown_set)
+            }
 
         # Flecha de inicio apuntando a I0
-        self.dot.edge('start', '0', style='bold', color='green4')
+        if has_start:
+            yield 'edge', {'source': 'start', 'target': '0', 'label': '', 'kind': 'start'}
 
         # Agregar transiciones
-        for (from_state, symbol), to_state in sorted(self.parser.transitions.items()):
-            self.dot.edge(
-                str(from_state),
-                str(to_state),
-                label=f' {symbol} ',
-                fontcolor='blue'
-            )
-
-        # Agregar transición desde el estado de aceptación hacia ACCEPT con $
+        if center is None:
+            transitions = sorted(self.parser.transitions.items())
+        else:
+            transitions = (((idx, symbol), to_state)
+                           for idx in shown
+                           for symbol, to_state in self._successors[idx]
+                           if to_state in shown_set)
+
+        for (from_state, symbol), to_state in transitions:
+            yield 'edge', {'source': str(from_state), 'target': str(to_state),
+                           'label': symbol, 'kind': 'transition'}
+
+        # Transición desde el estado de aceptación hacia ACCEPT con $
         if accept_state is not None:
-            self.dot.edge(
-                str(accept_state),
-                'accept',
-                label='$',
-                fontcolor='red',
-                color='red',
-                style='bold',
-                fontsize='16',
-                labeldistance='2.5',
-                labelangle='0'
-            )
+            yield 'edge', {'source': str(accept_state), 'target': 'accept',
+                           'label': '$', 'kind': 'accept'}
+
+    def _has_hidden_neighbors(self, idx: int, shown: Set[int]) -> bool:
+        """Indica si un estado tiene transiciones hacia o desde estados no mostrados"""
+        return (any(to not in shown for _, to in self._successors[idx]) or
+                any(frm not in shown for frm in self._predecessors[idx]))
+
+    def _iter_summary(self):
+        """
+        Vista resumida: un nodo por núcleo LALR (items del kernel sin lookahead)
+
+        Los estados LR(1) con el mismo núcleo se agrupan en un solo nodo y las
+        transiciones paralelas se fusionan, así que el tamaño del grafo es el
+        del autómata LR(0) aunque el LR(1) tenga muchos más estados.
+        """
+        grammar = self.parser.grammar
+        groups: Dict[frozenset, list] = {}
+        group_of: Dict[int, int] = {}
+
+        for idx, state in enumerate(self.parser.states):
+            core = frozenset((item.production, item.dot_position)
+                             for item in self._kernel_items(state))
+            members = groups.setdefault(core, [])
+            members.append(idx)
+
+        yield 'graph', {'title': 'Autómata LR(1) - resumen por núcleo', 'sized': False, 'dpi': '96'}
+        yield 'node', {'id': 'start', 'kind': 'start'}
+        yield 'node', {'id': 'accept', 'kind': 'accept'}
+
+        accept_node = None
+        for group_idx, (core, members) in enumerate(groups.items()):
+            for idx in members:
+                group_of[idx] = group_idx
+
+            items = []
+            for production, dot_position in sorted(core):
+                prod = grammar[production]
+                right = list(prod.right)
+                right.insert(dot_position, '•')
+                items.append(f"{prod.left} → {' '.join(right)}")
+
+            colors = [self._get_state_color(idx, self.parser.states[idx]) for idx in members]
+            color = next((c for c in ('lightgreen', 'lightcoral') if c in colors), 'lightblue')
+            if 'lightcoral' in colors:
+                accept_node = f'c{group_idx}'
+
+            yield 'node', {
+                'id': f'c{group_idx}',
+                'kind': 'state',
+                'title': ', '.join(f'I{idx}' for idx in members),
+                'lines': items,
+                'color': color,
+                'dashed': False
+            }
 
+        yield 'edge', {'source': 'start', 'target': f'c{group_of[0]}', 'label': '', 'kind': 'start'}
+
+        transitions = sorted({(group_of[frm], symbol, group_of[to])
+                              for (frm, symbol), to in self.parser.transitions.items()})
+        for from_group, symbol, to_group in transitions:
+            yield 'edge', {'source': f'c{from_group}', 'target': f'c{to_group}',
+                           'label': symbol, 'kind': 'transition'}
+
+        if accept_node is not None:
+            yield 'edge', {'source': accept_node, 'target': 'accept', 'label': '$', 'kind': 'accept'}
+
+    def _view_graph(self, view: str = 'full', center: Optional[int] = None,
+                    radius: int = 1) -> Dict:
+        """Vista completa en memoria: datos de 'graph' más listas 'nodes' y 'edges'"""
+        elements = self._iter_view(view, center, radius)
+        _, graph = next(elements)
+        graph = dict(graph, nodes=[], edges=[])
+        for kind, element in elements:
+            graph['nodes' if kind == 'node' else 'edges'].append(element)
+        return graph
+
+    def _add_element(self, dot: graphviz.Digraph, sized: bool, kind: str, element: Dict):
+        """Agrega un nodo o arista de _iter_view al grafo de Graphviz"""
+        if kind == 'node':
+            if element['kind'] == 'start':
+                dot.node('start', '', shape='point', width='0')
+            elif element['kind'] == 'accept':
+                self._add_accept_node(dot)
+            else:
+                header = f"<B>{element['title']}</B>"
+                if element['lines']:
+                    label = f"<{header}<BR/><BR/>{'<BR/>'.join(element['lines'])}>"
+                else:
+                    label = f"<{header}>"
+
+                # Configurar nodo
+                node_attrs = {'fillcolor': element['color']}
+                if sized:
+                    node_attrs['width'] = '4.5'
+                    node_attrs['height'] = '2.0'
+                if element['dashed']:
+                    node_attrs['style'] = 'rounded,filled,dashed'
+
+                dot.node(element['id'], label, **node_attrs)
+        elif element['kind'] == 'start':
+            dot.edge(element['source'], element['target'], style='bold', color='green4')
+        elif element['kind'] == 'accept':
+            self._add_accept_edge(dot, element['source'])
+        else:
+            dot.edge(element['source'], element['target'],
+                     label=f" {element['label']} ", fontcolor='blue')
+
+    def create_view(self, view: str = 'full', center: Optional[int] = None,
+                    radius: int = 1) -> graphviz.Digraph:
+        """
+        Crea una vista del autómata
+
+        Args:
+            view: 'full' (todos los items), 'kernel' (solo items del kernel),
+                'ids' (solo el número de estado) o 'summary' (un nodo por núcleo LALR)
+            center: Si se indica, solo se muestra la vecindad de este estado
+            radius: Radio (en transiciones) de la vecindad alrededor de center
+
+        Returns:
+            El grafo de Graphviz de la vista
+        """
+        elements = self._iter_view(view, center, radius)
+        _, graph = next(elements)
+
+        dot = self._new_graph(graph['title'], dpi=graph['dpi'])
+        for kind, element in elements:
+            self._add_element(dot, graph['sized'], kind, element)
+
+        return dot
+
+    def iter_dot(self, view: str = 'full', center: Optional[int] = None,
+                 radius: int = 1) -> Iterator[str]:
+        """
+        Genera el código DOT de una vista línea por línea
+
+        El resultado es idéntico a create_view(...).source, pero cada estado
+        se formatea y se entrega apenas se visita: la memoria no crece con el
+        tamaño del autómata y la primera línea sale de inmediato.
+        """
+        elements = self._iter_view(view, center, radius)
+        return self._dot_lines(elements)
+
+    def _dot_lines(self, elements) -> Iterator[str]:
+        """Líneas DOT de los elementos de _iter_view (ver iter_dot)"""
+        _, graph = next(elements)
+
+        # Encabezado y atributos globales del mismo Digraph que usa create_view
+        dot = self._new_graph(graph['title'], dpi=graph['dpi'])
+        header = list(dot)
+        yield from header[:-1]
+        dot.body.clear()
+
+        # Cada elemento se agrega al cuerpo, se entrega y se descarta
+        for kind, element in elements:
+            self._add_element(dot, graph['sized'], kind, element)
+            yield from dot.body
+            dot.body.clear()
+
+        yield header[-1]
+
+    def iter_jsonl(self, view: str = 'full', center: Optional[int] = None,
+                   radius: int = 1) -> Iterator[str]:
+        """
+        Genera la vista como JSON lines: un registro por línea con 'type'
+        ('graph', 'node' o 'edge') y los datos del elemento
+        """
+        elements = self._iter_view(view, center, radius)
+        return (json.dumps(dict(type=kind, **element), ensure_ascii=False) + '\n'
+                for kind, element in elements)
+
+    def create_layout(self, view: str = 'ids', center: Optional[int] = None,
+                      radius: int = 1, rankdir: str = 'LR') -> Dict:
+        """
+        Calcula el layout de una vista con el motor por capas en Python puro
+
+        No necesita el binario dot: retorna coordenadas listas para serializar
+        a JSON o convertir a SVG con layout_to_svg.
+
+        Args:
+            view, center, radius: Igual que en create_view
+            rankdir: 'LR', 'TB', 'RL' o 'BT'
+
+        Returns:
+            Diccionario con 'title', 'width', 'height', 'crossings', 'nodes'
+            (id, kind, x, y, width, height, lines, color, shape, dashed) y
+            'edges' (source, target, label, color, points)
+        """
+        graph = self._view_graph(view, center, radius)
+
+        sizes = {}
+        for node in graph['nodes']:
+            if node['kind'] == 'start':
+                sizes[node['id']] = (6.0, 6.0)
+            elif node['kind'] == 'accept':
+                sizes[node['id']] = (80.0, 80.0)
+            else:
+                sizes[node['id']] = text_size([node['title']] + node['lines'])
+
+        engine = LayeredLayout(rankdir=rankdir)
+        centers, edges = engine.run(
+            sizes, [(e['source'], e['target'], e['label']) for e in graph['edges']])
+
+        nodes = []
+        for node in graph['nodes']:
+            x, y = centers[node['id']]
+            width, height = sizes[node['id']]
+            if node['kind'] == 'start':
+                shape, lines, color = 'point', [], 'black'
+            elif node['kind'] == 'accept':
+                shape, lines, color = 'doublecircle', ['ACCEPT'], 'lightcoral'
+            else:
+                shape, lines, color = 'rectangle', [node['title']] + node['lines'], node['color']
+            nodes.append({'id': node['id'], 'kind': node['kind'], 'x': x, 'y': y,
+                          'width': width, 'height': height, 'lines': lines,
+                          'color': color, 'shape': shape, 'dashed': node.get('dashed', False)})
+
+        edge_colors = {(e['source'], e['target']): {'start': 'green', 'accept': 'red'}.get(e['kind'], 'black')
+                       for e in graph['edges']}
+        layout_edges = [{'source': e.source, 'target': e.target, 'label': e.label,
+                         'color': edge_colors[(e.source, e.target)],
+                         'points': [list(p) for p in e.points]}
+                        for e in edges]
+
+        margin = 20.0
+        width = max((n['x'] + n['width'] / 2 for n in nodes), default=0.0) + margin
+        height = max((n['y'] + n['height'] / 2 for n in nodes), default=0.0) + margin
+
+        return {'title': graph['title'], 'width': width, 'height': height,
+                'crossings': engine.crossings, 'nodes': nodes, 'edges': layout_edges}
+
+    def render_layout_svg(self, view: str = 'ids', center: Optional[int] = None,
+                          radius: int = 1, rankdir: str = 'LR') -> str:
+        """SVG de una vista generado con el motor de layout integrado"""
+        return layout_to_svg(self.create_layout(view, center, radius, rankdir))
+
+    def create_automaton(self):
+        """Crea el grafo del autómata LR(1) usando Graphviz"""
+        self.dot = self.create_view('full')
         return self.dot
 
     def visualize(self, filename: str = "automata_lr1_graphviz",
@@ -160,6 +556,7 @@ class LR1GraphvizVisualizer:
             view_file: Si True, abre automáticamente el archivo generado
             output_format: Formato de salida ('png', 'pdf', 'svg')
         """
+        self._discard_if_grown()
         if self.dot is None:
             self.create_automaton()
 
@@ -185,17 +582,49 @@ class LR1GraphvizVisualizer:
 
         return output_path
 
-    def save_dot_file(self, filename: str = "automata_lr1.dot"):
-        """Guarda el código DOT del grafo"""
+    def render(self, output_format: str = 'svg') -> bytes:
+        """
+        Renderiza el autómata en memoria y retorna los bytes generados
+
+        Args:
+            output_format: Formato de salida ('png', 'pdf', 'svg')
+        """
+        self._discard_if_grown()
+        if self.dot is None:
+            self.create_automaton()
+
+        return render_dot_source(self.dot.source, output_format)
+
+    def get_dot_source(self, view: str = 'full', center: Optional[int] = None,
+                       radius: int = 1) -> str:
+        """Retorna el código DOT del grafo completo o de una vista (ver create_view)"""
+        if view != 'full' or center is not None:
+            return self.create_view(view, center, radius).source
+
+        self._discard_if_grown()
         if self.dot is None:
             self.create_automaton()
 
+        return self.dot.source
+
+    def save_dot_file(self, filename: str = "automata_lr1.dot", view: str = 'full',
+                      center: Optional[int] = None, radius: int = 1):
+        """Guarda el código DOT del grafo (o de una vista) escribiéndolo estado por estado"""
         with open(filename, 'w') as f:
-            f.write(self.dot.source)
+            f.writelines(self.iter_dot(view, center, radius))
 
         print(f"[OK] Archivo DOT guardado: {filename}")
         return filename
 
+    def save_jsonl_file(self, filename: str = "automata_lr1.jsonl", view: str = 'full',
+                        center: Optional[int] = None, radius: int = 1):
+        """Guarda los nodos y aristas del grafo como JSON lines"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.writelines(self.iter_jsonl(view, center, radius))
+
+        print(f"[OK] Archivo JSON lines guardado: {filename}")
+        return filename
+
     def get_automaton_info(self) -> Dict:
         """Retorna información del autómata"""
         return {
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las sesiones de análisis en streaming: ParseSession
+y los protocolos HTTP (NDJSON) y WebSocket del servidor ASGI
+"""
+
+import sys
+import os
+import json
+import asyncio
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from parser.parse_session import ParseSession
+from backend import asgi
+from backend.registry import ParserRegistry
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def run_app(scope, messages):
+    """Ejecuta la aplicación ASGI con los mensajes dados y retorna los enviados"""
+    pending = list(messages)
+    sent = []
+    disconnect = {'type': 'websocket.disconnect' if scope['type'] == 'websocket' else 'http.disconnect'}
+
+    async def receive():
+        return pending.pop(0) if pending else disconnect
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app(scope, receive, send))
+    return sent
+
+
+def http(method, path, chunks=(b'',), query=b'', disconnect=False):
+    """
+    Petición HTTP con el cuerpo partido en chunks; retorna (status, cuerpo)
+
+    Con disconnect el cliente se desconecta después del último chunk, sin
+    terminar el cuerpo.
+    """
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query}
+    messages = [{'type': 'http.request', 'body': chunk,
+                 'more_body': disconnect or i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)]
+    sent = run_app(scope, messages)
+    body = b''.join(m.get('body', b'') for m in sent if m['type'] == 'http.response.body')
+    return sent[0]['status'], body
+
+
+def open_session():
+    """Abre una sesión HTTP y retorna su id"""
+    status, body = http('POST', '/api/sessions', [json.dumps({'grammar': GRAMMAR}).encode()])
+    assert status == 200, body
+    return json.loads(body)['session_id']
+
+
+def stream(session_id, chunks, end=False, disconnect=False):
+    """Envía tokens a una sesión y retorna los eventos NDJSON"""
+    status, body = http('POST', f'/api/sessions/{session_id}/tokens', chunks,
+                        b'end=1' if end else b'', disconnect)
+    assert status == 200
+    return [json.loads(line) for line in body.splitlines()]
+
+
+async def concurrent_streams(session_id):
+    """Abre una segunda petición de tokens mientras la primera sigue recibiendo el cuerpo"""
+    scope = {'type': 'http', 'method': 'POST', 'path': f'/api/sessions/{session_id}/tokens',
+             'query_string': b'end=1'}
+    gate = asyncio.Event()
+    chunks = [{'type': 'http.request', 'body': b'id +', 'more_body': True},
+              {'type': 'http.request', 'body': b' id', 'more_body': False}]
+    first, second = [], []
+
+    async def first_receive():
+        if len(chunks) == 1:
+            await gate.wait()
+        return chunks.pop(0)
+
+    async def first_send(message):
+        first.append(message)
+
+    async def second_receive():
+        return {'type': 'http.request', 'body': b'+', 'more_body': False}
+
+    async def second_send(message):
+        second.append(message)
+
+    task = asyncio.ensure_future(asgi.app(scope, first_receive, first_send))
+    while len(chunks) == 2:
+        await asyncio.sleep(0)
+    await asgi.app(scope, second_receive, second_send)
+    gate.set()
+    await task
+
+    body = b''.join(m.get('body', b'') for m in first if m['type'] == 'http.response.body')
+    return second[0]['status'], [json.loads(line) for line in body.splitlines()]
+
+
+def test_parse_session():
+    print("="*70)
+    print("PRUEBA DE ParseSession")
+    print("="*70)
+    parser = ParserRegistry().build(GRAMMAR, 'LR1')[0].parser
+
+    # Un token partido entre fragmentos se retiene hasta ver el espacio
+    session = ParseSession(parser)
+    assert session.feed_text("i")['tokens'] == 0
+    assert session.feed_text("d + i")['tokens'] == 2
+    assert session.feed_text("d ")['tokens'] == 3
+    assert session.finish() == {'event': 'accept', 'tokens': 3}
+
+    # Con final=True el último token queda completo
+    session = ParseSession(parser)
+    assert session.feed_text("id +", final=True)['tokens'] == 2
+    assert session.feed_text("id", final=True)['tokens'] == 3
+    assert session.finish()['event'] == 'accept'
+
+    # finish() procesa el fragmento pendiente; los tokens separados lo completan
+    session = ParseSession(parser)
+    session.feed_text("id *")
+    assert session.feed(["id"])['tokens'] == 3
+    session.feed_text("+ id")
+    assert session.finish() == {'event': 'accept', 'tokens': 5}
+
+    # El primer error cierra la sesión
+    session = ParseSession(parser)
+    event = session.feed_text("id id ")
+    assert event['event'] == 'error' and event['token'] == 'id' and session.closed
+    assert not session.push('+') and session.status() == event
+
+    # Fragmento descartado y cierre por un error ajeno a la gramática
+    session = ParseSession(parser)
+    session.feed_text("id + i")
+    session.drop_pending()
+    assert session.feed_text("id", final=True)['tokens'] == 3
+    event = session.abort('Texto UTF-8 inválido')
+    assert event['event'] == 'error' and event['token'] is None and session.closed
+    print("\n✅ ParseSession correcta")
+
+
+def test_http_sessions():
+    print("="*70)
+    print("PRUEBA DE SESIONES HTTP (NDJSON)")
+    print("="*70)
+
+    # Tokens partidos entre chunks (incluido un carácter UTF-8 multibyte)
+    session_id = open_session()
+    events = stream(session_id, [b'( i', b'd ) * ', b'id +', b' id'], end=True)
+    print(f"\nEventos: {events}")
+    assert [e['tokens'] for e in events[:4]] == [1, 4, 5, 7]
+    assert events[-1] == {'event': 'accept', 'tokens': 7}
+    assert session_id not in asgi._sessions
+
+    session_id = open_session()
+    events = stream(session_id, ['id ñ'.encode()[:-1], 'id ñ'.encode()[-1:]])
+    assert events[-1]['event'] == 'error' and events[-1]['token'] == 'ñ'
+
+    # Una petición siempre termina en un límite de token: "id +" y luego
+    # "+ id" no forman el token "++"
+    session_id = open_session()
+    assert stream(session_id, [b'id +'])[-1] == {'event': 'progress', 'tokens': 2}
+    event = stream(session_id, [b'+ id'])[-1]
+    assert event['event'] == 'error' and event['token'] == '+'
+
+    session_id = open_session()
+    stream(session_id, [b'id +'])
+    assert stream(session_id, [b'id'], end=True)[-1] == {'event': 'accept', 'tokens': 3}
+
+    # Si el cliente se desconecta a mitad de un token, el fragmento se descarta
+    session_id = open_session()
+    assert stream(session_id, [b'id + i'], disconnect=True) == [{'event': 'progress', 'tokens': 2}]
+    assert stream(session_id, [b'id'], end=True)[-1] == {'event': 'accept', 'tokens': 3}
+
+    # Un cuerpo UTF-8 truncado cierra la sesión con un evento de error
+    session_id = open_session()
+    events = stream(session_id, [b'id + ', 'ñ'.encode()[:1]])
+    assert events[-1]['event'] == 'error' and 'UTF-8' in events[-1]['error']
+    assert session_id not in asgi._sessions
+
+    # Dos peticiones simultáneas a la misma sesión: la segunda recibe 409
+    session_id = open_session()
+    status, first = asyncio.run(concurrent_streams(session_id))
+    assert status == 409
+    assert first[-1] == {'event': 'accept', 'tokens': 3} and session_id not in asgi._sessions
+
+    # DELETE retorna el estado y olvida la sesión
+    session_id = open_session()
+    stream(session_id, [b'id *'])
+    status, body = http('DELETE', f'/api/sessions/{session_id}')
+    assert status == 200 and json.loads(body)['result'] == {'event': 'progress', 'tokens': 2}
+    assert http('DELETE', f'/api/sessions/{session_id}')[0] == 404
+    assert http('POST', '/api/sessions', [b'{}'])[0] == 400
+
+    # Las sesiones inactivas se purgan al abrir una nueva
+    stale = open_session()
+    asgi._sessions[stale].last_used = time.monotonic() - asgi.SESSION_TTL - 1
+    open_session()
+    assert stale not in asgi._sessions
+    assert http('POST', f'/api/sessions/{stale}/tokens', [b'id'])[0] == 404
+    print("\n✅ Sesiones HTTP correctas")
+
+
+def test_websocket():
+    print("="*70)
+    print("PRUEBA DE SESIONES WEBSOCKET")
+    print("="*70)
+    scope = {'type': 'websocket', 'path': '/ws/parse'}
+
+    def ws(*payloads):
+        messages = [{'type': 'websocket.connect'}]
+        messages += [{'type': 'websocket.receive', 'text': json.dumps(p)} for p in payloads]
+        sent = run_app(scope, messages)
+        assert sent[0] == {'type': 'websocket.accept'}
+        return [json.loads(m['text']) for m in sent if m['type'] == 'websocket.send'], sent[-1]
+
+    # En WebSocket el texto puede partir un token entre mensajes
+    events, last = ws({'grammar': GRAMMAR}, {'tokens': 'i'}, {'tokens': 'd + '},
+                      {'tokens': ['id', '*']}, {'tokens': 'id', 'end': True})
+    print(f"\nEventos: {events}")
+    assert [e['event'] for e in events] == ['ready', 'progress', 'progress', 'progress', 'accept']
+    assert events[-1]['tokens'] == 5 and last == {'type': 'websocket.close', 'code': 1000}
+
+    # Errores: mensaje desconocido (la sesión sigue) y error sintáctico (se cierra)
+    events, last = ws({'grammar': GRAMMAR}, {'foo': 1}, {'tokens': 'id id '})
+    assert events[1] == {'event': 'error', 'error': 'Mensaje no reconocido'}
+    assert events[2]['event'] == 'error' and events[2]['token'] == 'id'
+    assert last['type'] == 'websocket.close'
+
+    events, _ = ws({'parser_type': 'LR1'})
+    assert events[0]['event'] == 'error'
+    print("\n✅ Sesiones WebSocket correctas")
+
+
+if __name__ == "__main__":
+    test_parse_session()
+    test_http_sessions()
+    test_websocket()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el corpus de benchmarks: cada gramática se construye
+y acepta su archivo de entrada
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from benchmarks.bench_corpus import bench_grammar, compare, corpus_names
+
+
+def test_benchmark_corpus():
+    print("="*70)
+    print("PRUEBA DEL CORPUS DE BENCHMARKS")
+    print("="*70)
+
+    names = corpus_names()
+    assert {'json', 'sql', 'clike', 'pascal', 'minic', 'config'} <= set(names)
+
+    # LALR(1) directo: el más rápido de construir, mismas tablas que LALR(1)
+    results = []
+    for name in names:
+        results.extend(bench_grammar(name, ['LALR1-directo'], parse_seconds=0.01))
+
+    for row in results:
+        print(f"\n{row['grammar']}: {row['states']} estados, {row['input_tokens']} tokens, "
+              f"{row['table_bytes']} bytes de tablas, {row['tokens_per_second']:,} tokens/s")
+        assert row['accepted'], f"{row['grammar']}: la entrada de ejemplo fue rechazada"
+        assert row['table_bytes'] > 0 and row['tokens_per_second'] > 0
+        assert 'automaton' in row['phases']
+
+    # La comparación marca construcciones más lentas y cambios en los estados
+    slower = [dict(row, build_seconds=row['build_seconds'] * 2 + 1, states=row['states'] + 1)
+              for row in results]
+    regressions = compare(slower, {'results': results}, threshold=0.2)
+    assert len(regressions) == 2 * len(results)
+    assert compare(results, {'results': results}, threshold=0.2) == []
+
+    print("\n✅ Corpus de benchmarks correcto")
+
+
+if __name__ == "__main__":
+    test_benchmark_corpus()
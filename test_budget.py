@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para los límites de construcción y el fallback a LALR(1)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.budget import BuildBudget, BudgetExceeded
+from backend.registry import ParserRegistry
+
+
+def precedence_grammar(levels):
+    """Gramática de expresiones con varios niveles de precedencia"""
+    lines = ["S -> E0"]
+    for i in range(levels):
+        lines.append(f"E{i} -> E{i} o{i} E{i + 1} | E{i + 1}")
+    lines.append(f"E{levels} -> ( E0 ) | id")
+    return '\n'.join(lines)
+
+
+def test_budget():
+    print("="*70)
+    print("PRUEBA DE LÍMITES DE CONSTRUCCIÓN")
+    print("="*70)
+
+    grammar = precedence_grammar(5)
+
+    # Sin límites: LR(1) canónico vs LALR(1) por fusión y LALR(1) directo
+    lr1 = LR1Parser()
+    lr1.parse_grammar(grammar)
+    lalr1 = LALR1Parser()
+    lalr1.parse_grammar(grammar)
+    direct = LALR1Parser(direct=True)
+    direct.parse_grammar(grammar)
+    print(f"\nLR(1): {len(lr1.states)} | LALR(1): {len(lalr1.states)} | "
+          f"LALR(1) directo: {len(direct.states)}")
+    assert {frozenset(s) for s in lalr1.states} == {frozenset(s) for s in direct.states}
+    for test_str in ["id", "id o0 id o3 ( id o4 id )"]:
+        assert lalr1.parse_string(test_str)['success']
+        assert direct.parse_string(test_str)['success']
+
+    # Límite de estados: error estructurado con estadísticas parciales
+    parser = LR1Parser()
+    parser.budget = BuildBudget(max_states=20)
+    try:
+        parser.parse_grammar(grammar)
+        assert False, "Debió exceder el límite de estados"
+    except BudgetExceeded as e:
+        print(f"[1] {e}")
+        info = e.to_dict()
+        assert info['resource'] == 'states'
+        assert info['stats']['phase'] == 'automaton'
+        assert info['stats']['states'] == 21
+
+    # Límite de items (se verifica también dentro de la clausura)
+    parser = LR1Parser()
+    parser.budget = BuildBudget(max_items=100)
+    try:
+        parser.parse_grammar(grammar)
+        assert False, "Debió exceder el límite de items"
+    except BudgetExceeded as e:
+        print(f"[2] {e}")
+        assert e.resource == 'items'
+
+    # Registro con fallback: retorna LALR(1) directo en vez de fallar
+    registry = ParserRegistry(budget=BuildBudget(max_states=len(direct.states) + 5))
+    entry, _ = registry.build(grammar, 'LR1')
+    print(f"[3] Fallback: {type(entry.parser).__name__} con {entry.num_states} estados")
+    assert isinstance(entry.parser, LALR1Parser) and entry.parser.direct
+    assert entry.extras['fallback']['reason']['resource'] == 'states'
+
+    # Sin fallback el error llega al llamador
+    try:
+        registry.build(precedence_grammar(6), 'LR1', fallback=False)
+        assert False, "Debió exceder el límite de estados"
+    except BudgetExceeded as e:
+        print(f"[4] Sin fallback: {e}")
+
+    print("\n✅ Límites de construcción correctos")
+
+
+if __name__ == "__main__":
+    test_budget()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las construcciones en segundo plano: progreso,
+cancelación, construcciones compartidas y errores
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from parser.budget import BuildBudget
+from backend.registry import BuildCancelled, ParserRegistry, grammar_id
+from backend.jobs import BuildJobManager
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+class GatedRegistry(ParserRegistry):
+    """Registro cuyas construcciones se detienen en la fase 'automaton' hasta abrir la compuerta"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.reached = threading.Event()
+        self.gate = threading.Event()
+
+    def _construct(self, key, grammar_text, parser_type, progress_callback, *args):
+        def gated(phase, data):
+            progress_callback(phase, data)
+            if phase == 'automaton' and not self.reached.is_set():
+                self.reached.set()
+                assert self.gate.wait(5)
+        return super()._construct(key, grammar_text, parser_type, gated, *args)
+
+
+def wait_until(condition, timeout=5.0):
+    """Espera a que se cumpla una condición (falla si no ocurre a tiempo)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "La condición no se cumplió a tiempo"
+        time.sleep(0.01)
+
+
+def waiters(registry, key):
+    """Interesados en la construcción en curso de una gramática"""
+    with registry._lock:
+        inflight = registry._building.get(key)
+        return len(inflight.cancel_checks) if inflight is not None else 0
+
+
+def start_sync_build(registry, results):
+    """Construcción síncrona (como /api/build_parser) en otro thread"""
+    def run():
+        try:
+            results.append(registry.build(GRAMMAR, 'LR1')[0])
+        except Exception as e:
+            results.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_build_jobs():
+    print("="*70)
+    print("PRUEBA DE CONSTRUCCIONES EN SEGUNDO PLANO")
+    print("="*70)
+    key = grammar_id(GRAMMAR, 'LR1')
+
+    # Progreso: la fase avanza y al terminar queda el grammar_id
+    registry = GatedRegistry()
+    jobs = BuildJobManager(registry)
+    job = jobs.submit(GRAMMAR, 'LR(1)')
+    assert registry.reached.wait(5)
+    wait_until(lambda: job.phase == 'automaton')
+    assert job.status == 'running'
+    registry.gate.set()
+    wait_until(lambda: job.finished)
+    print(f"\nTrabajo terminado: {job.to_dict()}")
+    assert job.status == 'done' and job.phase == 'done' and job.grammar_id == key
+    assert job.progress['states'] == registry.get(key).num_states
+    assert not jobs.cancel(job.job_id) and not jobs.cancel('no-existe')
+
+    # Cancelar el único interesado aborta la construcción
+    registry = GatedRegistry()
+    jobs = BuildJobManager(registry)
+    job = jobs.submit(GRAMMAR, 'LR1')
+    assert registry.reached.wait(5)
+    assert jobs.cancel(job.job_id)
+    registry.gate.set()
+    wait_until(lambda: job.finished)
+    assert job.status == 'cancelled' and job.grammar_id is None
+    assert registry.get(key) is None and registry.in_flight() == 0
+    assert str(BuildCancelled())
+
+    # El trabajo que inició la construcción se cancela, pero una petición
+    # síncrona la espera: la construcción termina para ella
+    registry = GatedRegistry()
+    jobs = BuildJobManager(registry)
+    job = jobs.submit(GRAMMAR, 'LR1')
+    assert registry.reached.wait(5)
+    results = []
+    thread = start_sync_build(registry, results)
+    wait_until(lambda: waiters(registry, key) == 2)
+    assert jobs.cancel(job.job_id)
+    registry.gate.set()
+    thread.join(5)
+    wait_until(lambda: job.finished)
+    print(f"Dueño cancelado con otro interesado: trabajo {job.status}, síncrona {results[0].grammar_id}")
+    assert job.status == 'cancelled'
+    assert len(results) == 1 and results[0].grammar_id == key
+    assert registry.get(key) is results[0]
+
+    # Un trabajo que se suma a una construcción síncrona recibe su progreso
+    # y cancelarlo deja de esperarla sin afectar a la síncrona
+    registry = GatedRegistry()
+    jobs = BuildJobManager(registry)
+    results = []
+    thread = start_sync_build(registry, results)
+    assert registry.reached.wait(5)
+    job = jobs.submit(GRAMMAR, 'LR1')
+    wait_until(lambda: job.phase == 'automaton')
+    assert jobs.cancel(job.job_id)
+    wait_until(lambda: job.finished)
+    assert job.status == 'cancelled' and not results
+    registry.gate.set()
+    thread.join(5)
+    assert results[0].grammar_id == key
+
+    # Dos trabajos de la misma gramática: se construye una vez
+    registry = GatedRegistry()
+    jobs = BuildJobManager(registry)
+    first = jobs.submit(GRAMMAR, 'LR1')
+    assert registry.reached.wait(5)
+    second = jobs.submit(GRAMMAR, 'LR1')
+    wait_until(lambda: waiters(registry, key) == 2)
+    registry.gate.set()
+    wait_until(lambda: first.finished and second.finished)
+    assert first.status == second.status == 'done' and registry.stats()['misses'] == 2
+    assert registry.stats()['entries'] == 1
+
+    # Con límite de memoria (la RSS es del proceso) las construcciones van de
+    # a una: la segunda espera en la fase 'queued' y se puede cancelar ahí
+    registry = GatedRegistry(budget=BuildBudget(max_memory_bytes=1 << 40))
+    jobs = BuildJobManager(registry, max_workers=3)
+    first = jobs.submit(GRAMMAR, 'LR1')
+    assert registry.reached.wait(5)
+    second = jobs.submit(GRAMMAR, 'LALR1')
+    third = jobs.submit(GRAMMAR, 'SLR1')
+    wait_until(lambda: second.phase == 'queued' and third.phase == 'queued')
+    assert jobs.cancel(third.job_id)
+    wait_until(lambda: third.finished)
+    assert third.status == 'cancelled' and first.phase == 'automaton'
+    registry.gate.set()
+    wait_until(lambda: first.finished and second.finished)
+    assert first.status == second.status == 'done'
+    print(f"Límite de memoria: construcciones en serie ({second.grammar_id} esperó su turno)")
+
+    # Sin límite de memoria otra gramática se construye en paralelo
+    registry = GatedRegistry()
+    jobs = BuildJobManager(registry)
+    first = jobs.submit(GRAMMAR, 'LR1')
+    assert registry.reached.wait(5)
+    second = jobs.submit(GRAMMAR, 'LALR1')
+    wait_until(lambda: second.finished)
+    assert second.status == 'done' and not first.finished
+    registry.gate.set()
+    wait_until(lambda: first.finished)
+
+    # Errores: gramática inválida y presupuesto excedido sin fallback
+    jobs = BuildJobManager(ParserRegistry(budget=BuildBudget(max_states=5), fallback=False))
+    invalid = jobs.submit("S -> A", 'LR1')
+    too_big = jobs.submit(GRAMMAR, 'LR1')
+    wait_until(lambda: invalid.finished and too_big.finished)
+    print(f"Errores: '{invalid.error}' / '{too_big.error}'")
+    assert invalid.status == 'failed' and 'improductivo' in invalid.error
+    assert too_big.status == 'failed' and too_big.budget_exceeded['resource'] == 'states'
+    assert jobs.active_count() == 0
+
+    print("\n✅ Construcciones en segundo plano correctas")
+
+
+if __name__ == "__main__":
+    test_build_jobs()
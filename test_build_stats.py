@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las estadísticas de construcción (tiempos por fase y contadores)
+"""
+
+import sys
+import os
+import hashlib
+import threading
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from benchmarks.bench_corpus import load_grammar
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def test_build_stats():
+    print("="*70)
+    print("PRUEBA DE ESTADÍSTICAS DE CONSTRUCCIÓN")
+    print("="*70)
+
+    lr1 = LR1Parser()
+    lr1.parse_grammar(GRAMMAR)
+    stats = lr1.stats.to_dict()
+
+    print()
+    for phase in stats['phases']:
+        print(f"  {phase['name']:<15} {phase['wall_seconds'] * 1000:8.3f} ms")
+    print(f"Clausuras: {stats['closure_calls']} | items: {stats['items_generated']} | "
+          f"hits/misses: {stats['state_map_hits']}/{stats['state_map_misses']}")
+
+    names = [phase['name'] for phase in stats['phases']]
+    assert names == ['parse_grammar', 'reduce', 'augment', 'first_sets', 'follow_sets', 'automaton', 'parsing_table']
+    assert stats['first_iterations'] >= 2 and stats['follow_iterations'] >= 2
+
+    # Cada goto es un hit o un miss; cada miss es un estado nuevo (además del inicial)
+    assert stats['state_map_hits'] + stats['state_map_misses'] == len(lr1.transitions)
+    assert stats['state_map_misses'] == len(lr1.states) - 1
+    assert stats['states'] == len(lr1.states) and stats['peak_memory_bytes'] >= 0
+
+    # LALR(1) por fusión agrega la fase merge_states
+    lalr1 = LALR1Parser()
+    lalr1.parse_grammar(GRAMMAR)
+    assert 'merge_states' in [phase['name'] for phase in lalr1.stats.phases]
+
+    # Reconstruir reinicia las estadísticas
+    lr1.parse_grammar(GRAMMAR)
+    assert lr1.stats.to_dict()['closure_calls'] == stats['closure_calls']
+
+    # La CPU de cada fase es la del thread que construye: otro thread
+    # ocupado en paralelo (hashlib suelta el GIL) no se le suma
+    stop = threading.Event()
+    data = b'x' * (1 << 20)
+
+    def busy():
+        while not stop.is_set():
+            hashlib.sha256(data).digest()
+
+    thread = threading.Thread(target=busy)
+    thread.start()
+    try:
+        sql = LR1Parser()
+        sql.parse_grammar(load_grammar('sql')[0])
+    finally:
+        stop.set()
+        thread.join()
+    stats = sql.stats.to_dict()
+    print(f"\nsql con otro thread ocupado: {stats['total_cpu_seconds']:.3f} s de CPU, "
+          f"{stats['total_wall_seconds']:.3f} s reales, pico +{stats['peak_memory_bytes'] // 1024} KB")
+    assert stats['total_cpu_seconds'] <= stats['total_wall_seconds'] * 1.1 + 0.01
+    assert stats['peak_memory_bytes'] > 0
+
+    print("\n✅ Estadísticas de construcción correctas")
+
+
+if __name__ == "__main__":
+    test_build_stats()
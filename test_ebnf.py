@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la sintaxis EBNF (X*, X+, X?, grupos) en las gramáticas
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.parse_session import ParseSession
+
+EBNF_GRAMMAR = """
+Program -> Stmt*
+Stmt -> id = Expr ; | print Args ; | call id ( Params? ) ;
+Args -> Expr (, Expr)*
+Params -> Expr (, Expr)*
+Expr -> Term (+ Term | - Term)*
+Term -> id | number | ( Expr )
+"""
+
+# La misma gramática escrita a mano: cada regla con su propia lista
+# recursiva a derecha, como se hacía sin EBNF
+MANUAL_GRAMMAR = """
+Program -> Stmt Program | ε
+Stmt -> id = Expr ; | print Args ; | call id ( Params ) ; | call id ( ) ;
+Args -> Expr ArgsRest
+ArgsRest -> , Expr ArgsRest | ε
+Params -> Expr ParamsRest
+ParamsRest -> , Expr ParamsRest | ε
+Expr -> Term ExprRest
+ExprRest -> + Term ExprRest | - Term ExprRest | ε
+Term -> id | number | ( Expr )
+"""
+
+
+def max_stack(parser, tokens):
+    session = ParseSession(parser)
+    deepest = 0
+    for token in tokens:
+        session.push(token)
+        deepest = max(deepest, len(session.stack))
+    assert session.finish()['event'] == 'accept'
+    return deepest
+
+
+def test_ebnf():
+    print("="*70)
+    print("PRUEBA DE SINTAXIS EBNF")
+    print("="*70)
+
+    parser = LR1Parser()
+    parser.parse_grammar(EBNF_GRAMMAR)
+    for prod in parser.grammar:
+        print(f"  {prod}")
+
+    # Auxiliares recursivos a izquierda; (, Expr)* se comparte entre Args y Params
+    assert parser.ebnf_helpers == {
+        'Star[Stmt]': 'Stmt*',
+        'Opt[Params]': 'Params?',
+        'Star[,_Expr]': '(, Expr)*',
+        'Star[+_Term/-_Term]': '(+ Term | - Term)*',
+    }
+    productions = [str(p) for p in parser.grammar]
+    assert 'Args -> Expr Star[,_Expr]' in productions and 'Params -> Expr Star[,_Expr]' in productions
+    assert 'Star[,_Expr] -> Star[,_Expr] , Expr' in productions
+    assert 'Star[Stmt] -> Star[Stmt] Stmt' in productions and 'Star[Stmt] -> ε' in productions
+
+    sentence = 'print id , number , ( id + id ) ; id = id - number ; call id ( id , id ) ; call id ( ) ;'
+    assert parser.parse_string(sentence)['success']
+    assert not parser.parse_string('print id , ;')['success']
+
+    # Los "(" y operadores separados por espacios siguen siendo terminales
+    plain = LR1Parser()
+    plain.parse_grammar("E -> E + T | T\nT -> T * F | F\nF -> ( E ) | id ++")
+    assert plain.ebnf_helpers == {} and {'+', '*', '(', ')', '++'} < plain.terminals
+
+    # Autómatas más chicos que con las listas escritas a mano
+    for parser_class in (LR1Parser, LALR1Parser):
+        ebnf, manual = parser_class(), parser_class()
+        ebnf.parse_grammar(EBNF_GRAMMAR)
+        manual.parse_grammar(MANUAL_GRAMMAR)
+        print(f"{parser_class.__name__}: {len(manual.states)} estados a mano, {len(ebnf.states)} con EBNF")
+        assert len(ebnf.states) < len(manual.states)
+
+    # Pila constante con listas largas: la recursión a derecha crece con la entrada
+    tokens = ('print id' + ' , id' * 2000 + ' ;').split() * 50
+    ebnf_depth, manual_depth = max_stack(ebnf, tokens), max_stack(manual, tokens)
+    print(f"Pila máxima con {len(tokens)} tokens: {ebnf_depth} con EBNF, {manual_depth} a mano")
+    assert ebnf_depth < 10 and manual_depth > 2000
+
+    for bad in ("S -> (a b", "S -> a b)*", "S -> (a b)) c"):
+        try:
+            LR1Parser().parse_grammar(bad)
+            assert False, f"Debió rechazar {bad}"
+        except ValueError as e:
+            print(f"Error esperado: {e}")
+
+    print("\n✅ Sintaxis EBNF correcta")
+
+
+if __name__ == "__main__":
+    test_ebnf()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el generador de gramáticas sintéticas
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from benchmarks.grammar_generator import families, generate
+from benchmarks.bench_scaling import sweep
+
+
+def build(parser_class, grammar_text):
+    parser = parser_class()
+    parser.parse_grammar(grammar_text)
+    return parser
+
+
+def test_grammar_generator():
+    print("="*70)
+    print("PRUEBA DEL GENERADOR DE GRAMÁTICAS")
+    print("="*70)
+
+    # Cada familia genera gramáticas válidas que crecen con n
+    for family in families():
+        sizes = [len(build(LALR1Parser, generate(family, n)).grammar) for n in (1, 2, 4)]
+        print(f"\n{family}: producciones {sizes}")
+        assert sizes[0] < sizes[1] < sizes[2]
+
+    # Precedencia: cadenas con operadores de todos los niveles
+    parser = build(LR1Parser, generate('precedence', 3))
+    assert parser.parse_string('id o0 ( id o2 id ) o1 id')['success']
+    assert not parser.parse_string('id o0 o1 id')['success']
+
+    # Nullable: cualquier subconjunto de b_i en orden, seguido de end
+    parser = build(LR1Parser, generate('nullable', 4))
+    assert parser.parse_string('b0 b2 end')['success']
+    assert not parser.parse_string('b2 b0 end')['success']
+
+    # Explosión LR(1): ~una copia de la subgramática por contexto
+    lr1 = [len(build(LR1Parser, generate('lr1_blowup', n)).states) for n in (2, 4, 8)]
+    lalr = [len(build(LALR1Parser, generate('lr1_blowup', n)).states) for n in (2, 4, 8)]
+    print(f"lr1_blowup: LR(1) {lr1} vs LALR(1) {lalr}")
+    assert lr1[2] - lr1[1] > 4 * (lalr[2] - lalr[1])
+
+    try:
+        generate('desconocida', 3)
+        assert False, "Debió rechazar una familia desconocida"
+    except ValueError as e:
+        print(f"Error esperado: {e}")
+
+    # El barrido produce una fila por familia, parser y tamaño
+    results = sweep(['statements'], [1, 2], ['LR1', 'LALR1'], max_seconds=10, memory=False)
+    assert [(row['parser'], row['n']) for row in results] == [('LR1', 1), ('LR1', 2), ('LALR1', 1), ('LALR1', 2)]
+
+    print("\n✅ Generador de gramáticas correcto")
+
+
+if __name__ == "__main__":
+    test_grammar_generator()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para los importadores de gramáticas yacc/bison y Lark
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.grammar_import import import_bison, import_lark, import_grammar_file
+
+BISON_GRAMMAR = r"""
+%{
+#include <math.h>   /* el prólogo se ignora */
+%}
+%union { double value; }
+%token <value> NUM
+%token POW "**"
+%left '+' '-'
+%left '*'
+%right POW
+%nonassoc '<'
+%precedence NEG
+%start calc
+%%
+calc : %empty | calc line ;
+line : expr '\n'            { printf("%g\n", $1); }
+     ;
+expr : NUM
+     | expr '+' expr        { $$ = $1 + $3; }
+     | expr '-' expr        { $$ = $1 - $3; }
+     | expr '*' expr        { if ($3) { $$ = $1 * $3; } }
+     | expr "**" expr       { $$ = pow($1, $3); }
+     | expr '<' expr
+     | '-' expr %prec NEG   { $$ = -$2; }
+     | '(' expr ')'
+     ;
+%%
+int main(void) { return yyparse(); }
+"""
+
+LARK_GRAMMAR = r"""
+// Listas con separadores
+?start: list+
+list: "(" [item ("," item)*] ")"
+item: NAME -> name
+    | NUMBER
+    | list
+    | PLUS
+PLUS: "+"
+%import common.NUMBER
+%import common.CNAME -> NAME
+%ignore " "
+"""
+
+
+def reductions(parser, text):
+    """Producciones reducidas al analizar, en orden"""
+    return [step['action'].split('(', 1)[1][:-1] for step in parser.parse_string(text)['trace']
+            if step['action'].startswith('reduce') and 'expr ->' in step['action']]
+
+
+def test_grammar_import():
+    print("="*70)
+    print("PRUEBA DE IMPORTACIÓN DE GRAMÁTICAS BISON Y LARK")
+    print("="*70)
+
+    grammar = import_bison(BISON_GRAMMAR)
+    assert grammar.start_symbol == 'calc' and grammar.non_terminals == {'calc', 'line', 'expr'}
+    assert [str(p) for p in grammar.productions][:4] == [
+        'calc -> ε', 'calc -> calc line', 'line -> expr \\n', 'expr -> NUM']
+    assert 'expr -> expr POW expr' in [str(p) for p in grammar.productions]
+    assert grammar.productions[-2].precedence == 'NEG'
+    assert grammar.precedence['+'] == (1, 'left') and grammar.precedence['POW'] == (3, 'right')
+    assert grammar.precedence['<'] == (4, 'nonassoc')
+
+    # Los conflictos de la gramática ambigua se resuelven por precedencia
+    for parser in (LR1Parser(), LALR1Parser(), LALR1Parser(direct=True)):
+        parser.parse_grammar(grammar)
+        assert reductions(parser, 'NUM - NUM - NUM \\n') == [
+            'expr -> NUM', 'expr -> NUM', 'expr -> expr - expr', 'expr -> NUM', 'expr -> expr - expr']
+        assert reductions(parser, 'NUM + NUM * NUM \\n')[-2:] == ['expr -> expr * expr', 'expr -> expr + expr']
+        assert reductions(parser, 'NUM POW NUM POW NUM \\n')[-2:] == ['expr -> expr POW expr'] * 2
+        assert reductions(parser, '- NUM * NUM \\n')[:3] == ['expr -> NUM', 'expr -> - expr', 'expr -> NUM']
+        assert not parser.parse_string('NUM < NUM < NUM \\n')['success']
+        assert parser.parse_string('NUM < NUM \\n ( NUM ) \\n')['success']
+    print(f"\nbison: {len(grammar.productions)} producciones, {len(parser.states)} estados LALR(1)")
+
+    grammar = import_lark(LARK_GRAMMAR)
+    productions = [str(p) for p in grammar.productions]
+    for prod in productions:
+        print(f"  {prod}")
+    assert grammar.start_symbol == 'start' and grammar.precedence == {}
+    assert 'item -> PLUS' in productions and 'item -> NAME' in productions
+    assert 'Star[,_item] -> Star[,_item] , item' in productions
+    assert grammar.ebnf_helpers['Plus[list]'] == 'list+'
+    parser = LALR1Parser(direct=True)
+    parser.parse_grammar(grammar)
+    assert parser.parse_string('( NAME , NUMBER , ( ) , PLUS ) ( )')['success']
+    assert not parser.parse_string('( NAME , )')['success']
+
+    # Corpus: un subconjunto de C en bison y un formato de configuración en Lark
+    for name in ('minic.y', 'config.lark'):
+        imported = import_grammar_file(os.path.join(os.path.dirname(__file__), 'benchmarks', 'corpus', name))
+        parser = LALR1Parser(direct=True)
+        parser.parse_grammar(imported)
+        print(f"{name}: {len(imported.productions)} producciones, {len(parser.states)} estados")
+        assert not parser.reduction.changed
+
+    for importer, text in ((import_bison, "%token A\nexpr : A"), (import_bison, "%%\nexpr : A %glr\n"),
+                           (import_lark, "start: a~3"), (import_grammar_file, "gramatica.txt")):
+        try:
+            importer(text)
+            assert False, f"Debió rechazar {text!r}"
+        except ValueError as e:
+            print(f"Error esperado: {e}")
+
+    print("\n✅ Importación de gramáticas correcta")
+
+
+if __name__ == "__main__":
+    test_grammar_import()
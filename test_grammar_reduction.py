@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la reducción de gramáticas antes de la construcción
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from benchmarks.grammar_generator import precedence
+
+GRAMMAR = """
+S -> E
+E -> E + T | T | T
+T -> id | ( E ) | U
+U -> U x
+V -> id V | id
+W -> Q
+"""
+
+
+def build(parser, grammar_text):
+    start = time.perf_counter()
+    parser.parse_grammar(grammar_text)
+    return time.perf_counter() - start
+
+
+def test_grammar_reduction():
+    print("="*70)
+    print("PRUEBA DE REDUCCIÓN DE GRAMÁTICAS")
+    print("="*70)
+
+    parser = LR1Parser()
+    parser.parse_grammar(GRAMMAR)
+    report = parser.reduction
+
+    for removed in report.removed:
+        print(f"\n  eliminada ({removed['reason']}): {removed['number']}. {removed['production']}")
+    assert report.duplicates == [{'number': 4, 'production': 'E -> T', 'duplicate_of': 3}]
+    assert report.undefined == ['Q']
+    assert report.unproductive == ['U', 'W']
+    assert report.unreachable == ['V']
+
+    # Las producciones conservadas se pueden mapear a la numeración original
+    assert [str(p) for p in parser.grammar] == ["S' -> S", 'S -> E', 'E -> E + T', 'E -> T',
+                                                'T -> id', 'T -> ( E )']
+    assert parser.production_origin == [0, 1, 2, 3, 5, 6]
+    assert parser.terminals == {'id', '+', '(', ')', '$'}
+    assert parser.parse_string('id + ( id )')['success']
+
+    # Sin reducción se conservan todas
+    unreduced = LR1Parser()
+    unreduced.reduce_grammar = False
+    unreduced.parse_grammar(GRAMMAR)
+    assert unreduced.reduction is None and len(unreduced.grammar) == 12
+
+    # Gramática con un subconjunto muerto: una copia de la de precedencia sin
+    # caso base (alcanzable pero improductiva) y alternativas repetidas.
+    # Reducida queda igual a la limpia: menos estados y menos tiempo
+    clean_grammar = precedence(6)
+    dead = [line.replace('E', 'D') for line in clean_grammar.split('\n')[1:-1]]
+    grammar = '\n'.join([clean_grammar, 'E6 -> D0 | ( E0 ) | id'] + dead)
+    for parser_class in (LR1Parser, LALR1Parser):
+        reduced, full, clean = parser_class(), parser_class(), parser_class()
+        full.reduce_grammar = False
+        reduced_time, full_time = build(reduced, grammar), build(full, grammar)
+        clean.parse_grammar(clean_grammar)
+        print(f"{parser_class.__name__}: {len(full.states)} -> {len(reduced.states)} estados, "
+              f"{full_time:.3f}s -> {reduced_time:.3f}s")
+        assert len(reduced.states) == len(clean.states) < len(full.states)
+        assert [str(p) for p in reduced.grammar] == [str(p) for p in clean.grammar]
+
+    try:
+        LR1Parser().parse_grammar("S -> S a")
+        assert False, "Debió rechazar una gramática sin cadenas"
+    except ValueError as e:
+        print(f"Error esperado: {e}")
+
+    print("\n✅ Reducción de gramáticas correcta")
+
+
+if __name__ == "__main__":
+    test_grammar_reduction()
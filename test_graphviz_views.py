@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las vistas parciales del visualizador (vecindad, kernel, resumen)
+y la exportación en streaming
+"""
+
+import json
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.visualizer_graphviz import LR1GraphvizVisualizer
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def test_views():
+    print("="*70)
+    print("PRUEBA DE VISTAS DEL AUTÓMATA")
+    print("="*70)
+
+    lr1 = LR1Parser()
+    lr1.parse_grammar(GRAMMAR)
+    viz = LR1GraphvizVisualizer(lr1)
+
+    full = viz.get_dot_source()
+    kernel = viz.get_dot_source('kernel')
+    ids = viz.get_dot_source('ids')
+    print(f"\nTamaño DOT: full={len(full)} kernel={len(kernel)} ids={len(ids)}")
+    assert len(ids) < len(kernel) < len(full)
+
+    # Vecindad de radio 1 alrededor de I0: I0 y sus sucesores directos
+    expected = {0} | {to for (frm, _), to in lr1.transitions.items() if frm == 0}
+    assert viz.neighborhood(0, 1) == expected
+    neighborhood = viz.create_view('full', center=0, radius=1)
+    nodes = [line.split()[0] for line in neighborhood.body
+             if '[label=<' in line and 'ACCEPT' not in line]
+    print(f"Vecindad de I0: {nodes}")
+    assert {int(n) for n in nodes} == expected
+
+    # Radio suficiente cubre todo el autómata
+    assert viz.neighborhood(0, len(lr1.states)) == set(range(len(lr1.states)))
+
+    # Resumen por núcleo: tantos nodos como estados LALR(1)
+    lalr1 = LALR1Parser()
+    lalr1.parse_grammar(GRAMMAR)
+    summary = viz.create_view('summary')
+    groups = [line for line in summary.body if line.strip().startswith('c') and '[label=<' in line]
+    print(f"Resumen: {len(groups)} núcleos (LR(1): {len(lr1.states)}, LALR(1): {len(lalr1.states)})")
+    assert len(groups) == len(lalr1.states)
+
+    # Exportación en streaming: mismo DOT que el grafo en memoria
+    for view, center in [('full', None), ('kernel', 3), ('summary', None)]:
+        assert ''.join(viz.iter_dot(view, center)) == viz.create_view(view, center).source
+    records = [json.loads(line) for line in viz.iter_jsonl('ids')]
+    kinds = [r['type'] for r in records]
+    print(f"JSON lines: {kinds.count('node')} nodos, {kinds.count('edge')} aristas")
+    assert kinds[0] == 'graph'
+    assert kinds.count('edge') == len(lr1.transitions) + 2  # inicio y aceptación
+
+    try:
+        viz.create_view('ids', center=len(lr1.states))
+        assert False, "Debió rechazar un estado fuera de rango"
+    except ValueError as e:
+        print(f"Error esperado: {e}")
+
+    print("\n✅ Vistas del autómata correctas")
+
+
+if __name__ == "__main__":
+    test_views()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la reconstrucción incremental: el resultado debe ser
+idéntico (incluida la numeración de estados) al de una construcción completa
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from backend.registry import ParserRegistry
+from benchmarks.bench_corpus import load_grammar
+
+# Ediciones típicas del editor: agregar una alternativa, quitar una
+# producción, agregar un no terminal nuevo y cambiar un FIRST
+EDITS = [
+    ("Type -> int | text", "Type -> int | bigint | text"),
+    ("OrderItem -> Expr | Expr asc | Expr desc", "OrderItem -> Expr asc | Expr desc"),
+    ("Term -> Term * Factor | Term / Factor | Factor",
+     "Term -> Term * Factor | Term / Factor | Factor | Case\nCase -> case when Cond then Expr else Expr end"),
+    ("Distinct -> distinct | ε", "Distinct -> distinct | all | ε"),
+]
+
+
+def canonical(parser):
+    """Autómata, tablas y conjuntos expresados sin números de estado ni de producción"""
+    def kernel(state):
+        return frozenset((str(parser.grammar[item.production]), item.dot_position, item.lookahead)
+                         for item in state if item.dot_position > 0 or item.production == 0)
+
+    kernels = [kernel(state) for state in parser.states]
+
+    def action(value):
+        if value.startswith('s'):
+            return 's', kernels[int(value[1:])]
+        if value.startswith('r'):
+            return 'r', str(parser.grammar[int(value[1:])])
+        return value
+
+    return (set(kernels),
+            {(kernels[a], symbol): kernels[b] for (a, symbol), b in parser.transitions.items()},
+            {(kernels[a], symbol): action(v) for (a, symbol), v in parser.action_table.items()},
+            {nt: parser.first_sets[nt] for nt in parser.non_terminals},
+            {nt: parser.follow_sets[nt] for nt in parser.non_terminals})
+
+
+def edited(text, old, new):
+    assert old in text, old
+    return text.replace(old, new, 1)
+
+
+def test_incremental():
+    print("="*70)
+    print("PRUEBA DE RECONSTRUCCIÓN INCREMENTAL")
+    print("="*70)
+
+    text, _ = load_grammar('sql')
+
+    for cls in (LR1Parser, LALR1Parser):
+        base = cls()
+        if cls is LALR1Parser:
+            base.keep_canonical = True
+        start = time.perf_counter()
+        base.parse_grammar(text)
+        full_seconds = time.perf_counter() - start
+        assert base.diff is None
+
+        for old, new in EDITS:
+            new_text = edited(text, old, new)
+            incremental = cls()
+            start = time.perf_counter()
+            incremental.parse_grammar(new_text, previous=base)
+            seconds = time.perf_counter() - start
+
+            reference = cls()
+            reference.parse_grammar(new_text)
+            summary = incremental.diff.to_dict()
+            print(f"\n{cls.__name__} '{new.splitlines()[0][:30]}...': {seconds:.3f}s (completa {full_seconds:.3f}s) {summary}")
+            assert canonical(incremental) == canonical(reference)
+            assert incremental.transitions == reference.transitions
+            assert incremental.action_table == reference.action_table
+            assert incremental.goto_table == reference.goto_table
+            assert summary['states_reused'] > 0
+            assert summary['states_reused'] == incremental.stats.states_reused
+            assert summary['changed'] and summary['first_recomputed'] < len(incremental.non_terminals)
+
+        # Sin cambios se reutiliza todo, incluso pasando el propio parser
+        base.parse_grammar(text, previous=base)
+        assert base.diff.to_dict()['first_recomputed'] == 0
+        assert base.diff.states_reused == len(base.lr1_states if cls is LALR1Parser else base.states)
+
+    # Mismos números de estado que desde cero también en clike: quitar la
+    # última alternativa y agregar una alternativa ε (con conflictos)
+    text, _ = load_grammar('clike')
+    base = LR1Parser()
+    base.parse_grammar(text)
+    for old, new in (("Primary -> id | number | string | ( Expr )", "Primary -> id | number | string"),
+                     ("Program -> Program Decl | Decl", "Program -> Program Decl | Decl | ε")):
+        incremental = LR1Parser()
+        incremental.parse_grammar(edited(text, old, new), previous=base)
+        reference = LR1Parser()
+        reference.parse_grammar(edited(text, old, new))
+        print(f"\nclike '{new}': {incremental.diff.states_reused} estados reutilizados, "
+              f"{len(reference.conflicts)} conflictos")
+        assert incremental.diff.states_reused > 0
+        assert incremental.transitions == reference.transitions
+        assert incremental.action_table == reference.action_table
+        assert incremental.goto_table == reference.goto_table
+        assert incremental.conflicts == reference.conflicts
+    text, _ = load_grammar('sql')
+
+    # Sin keep_canonical LALR(1) descarta el autómata LR(1) tras fusionar y
+    # la reconstrucción reutiliza solo FIRST/FOLLOW
+    base = LALR1Parser()
+    base.parse_grammar(text)
+    assert not base.lr1_states and not base.lr1_transitions and not base.lr1_to_lalr_map
+    rebuilt = LALR1Parser()
+    rebuilt.parse_grammar(edited(text, *EDITS[0]), previous=base)
+    reference = LALR1Parser()
+    reference.parse_grammar(edited(text, *EDITS[0]))
+    assert rebuilt.diff.states_reused == 0 and canonical(rebuilt) == canonical(reference)
+
+    # LALR(1) directo no conserva el autómata LR(1): reutiliza solo FIRST/FOLLOW
+    base = LALR1Parser(direct=True)
+    base.parse_grammar(text)
+    direct = LALR1Parser(direct=True)
+    direct.parse_grammar(edited(text, *EDITS[0]), previous=base)
+    reference = LALR1Parser(direct=True)
+    reference.parse_grammar(edited(text, *EDITS[0]))
+    assert direct.diff.states_reused == 0 and direct.diff.first_recomputed < set(direct.non_terminals)
+    assert direct.action_table == reference.action_table
+
+    # El registro reconstruye a partir de una entrada anterior
+    registry = ParserRegistry()
+    entry, _ = registry.build(text, 'LR1')
+    rebuilt, cached = registry.build(edited(text, *EDITS[0]), 'LR1', previous=entry.parser)
+    assert not cached and rebuilt.parser.diff.states_reused > 0
+
+    # LALR(1) conserva el autómata LR(1) solo si el registro lo pide
+    for keep in (False, True):
+        registry = ParserRegistry(keep_canonical=keep)
+        entry, _ = registry.build(text, 'LALR1')
+        assert bool(entry.parser.lr1_states) == keep
+        rebuilt, _ = registry.build(edited(text, *EDITS[0]), 'LALR1', previous=entry.parser)
+        assert (rebuilt.parser.diff.states_reused > 0) == keep
+
+    print("\n✅ Reconstrucción incremental correcta")
+
+
+if __name__ == "__main__":
+    test_incremental()
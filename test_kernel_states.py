@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el modo que guarda solo los kernels de los estados y
+recalcula las clausuras al mostrarlas
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.lr0_parser import SLR1Parser
+from parser.state_store import KernelStates, states_memory_bytes
+from backend.registry import ParserRegistry
+from benchmarks.bench_corpus import load_grammar
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def test_kernel_states():
+    print("="*70)
+    print("PRUEBA DE ESTADOS GUARDADOS SOLO CON SU KERNEL")
+    print("="*70)
+
+    sql, _ = load_grammar('sql')
+    factories = [LR1Parser, LALR1Parser, lambda: LALR1Parser(direct=True), SLR1Parser]
+
+    for grammar in (GRAMMAR, sql):
+        for factory in factories:
+            full = factory()
+            full.parse_grammar(grammar)
+            compact = factory()
+            compact.kernel_only = True
+            compact.parse_grammar(grammar)
+
+            # Mismas tablas y, al pedirlos, los mismos estados completos
+            assert isinstance(compact.states, KernelStates)
+            assert compact.action_table == full.action_table and compact.goto_table == full.goto_table
+            assert compact.get_states_info() == full.get_states_info()
+            assert compact.get_automaton_graph() == full.get_automaton_graph()
+
+            full_bytes = states_memory_bytes(full.states)
+            kernel_bytes = states_memory_bytes(compact.states)
+            print(f"\n{full.parser_type_name} ({len(full.states)} estados): "
+                  f"{full_bytes // len(full.states)} -> {kernel_bytes // len(full.states)} bytes por estado")
+            assert kernel_bytes < full_bytes
+            if grammar is sql:
+                assert kernel_bytes < 0.6 * full_bytes
+
+    # LALR(1) también compacta el autómata LR(1) que conserva
+    parser = LALR1Parser()
+    parser.kernel_only = True
+    parser.keep_canonical = True
+    parser.parse_grammar(GRAMMAR)
+    assert isinstance(parser.lr1_states, KernelStates) and len(parser.lr1_states) == 23
+
+    # Las clausuras recientes quedan en una caché LRU acotada
+    states = parser.states
+    states.cache_size = 4
+    for index in (0, 1, 0, 2, 3, 4, 5, 0):
+        states[index]
+    print(f"\nCaché de clausuras: {states.hits} hits, {states.misses} misses")
+    assert (states.hits, states.misses) == (1, 7)
+    assert states[-1] == states[len(states) - 1]
+
+    # Un parser compactado sirve de base para una reconstrucción incremental
+    rebuilt = LR1Parser()
+    rebuilt.parse_grammar(GRAMMAR.replace("F -> id", "F -> id\nF -> num"), previous=parser)
+    assert rebuilt.diff.states_reused > 0 and rebuilt.parse_string("num * ( id + num )")['success']
+
+    # En el registro las entradas compactadas ocupan menos
+    sizes = []
+    for kernel_only in (False, True):
+        registry = ParserRegistry(kernel_only=kernel_only)
+        entry, _ = registry.build(sql, 'LALR1')
+        sizes.append(entry.size_bytes)
+    print(f"Registro: {sizes[0]} -> {sizes[1]} bytes estimados")
+    assert sizes[1] < sizes[0]
+
+    print("\n✅ Estados compactados correctos")
+
+
+if __name__ == "__main__":
+    test_kernel_states()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el motor de layout integrado (sin el binario dot)
+"""
+
+from parser.lr1_parser import LR1Parser
+from parser.layout import LayeredLayout
+from parser.visualizer_graphviz import LR1GraphvizVisualizer
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def overlaps(nodes):
+    """Pares de nodos cuyos rectángulos se superponen"""
+    count = 0
+    for i, a in enumerate(nodes):
+        for b in nodes[i + 1:]:
+            if (abs(a['x'] - b['x']) * 2 < a['width'] + b['width'] and
+                    abs(a['y'] - b['y']) * 2 < a['height'] + b['height']):
+                count += 1
+    return count
+
+
+def test_layout():
+    print("="*70)
+    print("PRUEBA DEL MOTOR DE LAYOUT INTEGRADO")
+    print("="*70)
+
+    # Grafo pequeño: sin cruces posibles y capas por distancia al origen
+    small_nodes = {'a': (40, 20), 'b': (40, 20), 'c': (40, 20), 'd': (40, 20)}
+    small_edges = [('a', 'b', 'x'), ('a', 'c', 'y'), ('b', 'd', 'z'), ('c', 'd', 'w'),
+                   ('d', 'a', 'v'), ('d', 'd', 'l')]
+    engine = LayeredLayout()
+    centers, edges = engine.run(small_nodes, small_edges)
+    print(f"\nCentros: {centers}")
+    assert centers['a'][0] < centers['b'][0] == centers['c'][0] < centers['d'][0]
+    assert engine.crossings == 0
+    assert len(edges) == 6 and all(len(e.points) >= 2 for e in edges)
+
+    # RL y BT: las mismas capas en sentido inverso, dentro del mismo rango
+    for forward, backward, axis in (('LR', 'RL', 0), ('TB', 'BT', 1)):
+        straight, _ = LayeredLayout(rankdir=forward).run(small_nodes, small_edges)
+        mirrored, _ = LayeredLayout(rankdir=backward).run(small_nodes, small_edges)
+        assert mirrored['a'][axis] > mirrored['b'][axis] == mirrored['c'][axis] > mirrored['d'][axis]
+        assert mirrored['a'][axis] == straight['d'][axis] and mirrored['d'][axis] == straight['a'][axis]
+    try:
+        LayeredLayout(rankdir='XY')
+        assert False, "rankdir inválido aceptado"
+    except ValueError:
+        pass
+
+    # Autómata completo: un nodo por estado, sin superposiciones
+    parser = LR1Parser()
+    parser.parse_grammar(GRAMMAR)
+    visualizer = LR1GraphvizVisualizer(parser)
+
+    for view in visualizer.VIEWS:
+        layout = visualizer.create_layout(view)
+        states = [n for n in layout['nodes'] if n['kind'] == 'state']
+        print(f"Vista {view}: {len(states)} nodos, {len(layout['edges'])} aristas, "
+              f"{layout['crossings']} cruces")
+        assert overlaps(layout['nodes']) == 0
+        if view != 'summary':
+            assert len(states) == len(parser.states)
+
+    svg = visualizer.render_layout_svg('kernel', center=0, radius=1)
+    assert svg.startswith('<svg') and svg.rstrip().endswith('</svg>')
+    assert 'I0' in svg
+
+    print("\n✅ Motor de layout correcto")
+
+
+if __name__ == "__main__":
+    test_layout()
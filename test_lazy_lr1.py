@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el parser LR(1) perezoso: los estados se construyen
+al analizar y, expandidos todos, el autómata es el LR(1) canónico
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lazy_lr1_parser import LazyLR1Parser
+from parser.token_stream import iter_mmap_tokens
+from parser.visualizer_graphviz import LR1GraphvizVisualizer
+from backend.registry import ParserRegistry
+from benchmarks.bench_corpus import load_grammar
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def canonical(parser):
+    """Autómata y tabla ACTION expresados por kernels en vez de números de estado"""
+    def kernel(state):
+        return frozenset((item.production, item.dot_position, item.lookahead)
+                         for item in state if item.dot_position > 0 or item.production == 0)
+
+    kernels = [kernel(state) for state in parser.states]
+    actions = {}
+    for (state, symbol), action in parser.action_table.items():
+        actions[(kernels[state], symbol)] = kernels[int(action[1:])] if action.startswith('s') else action
+    return (set(kernels),
+            {(kernels[a], symbol): kernels[b] for (a, symbol), b in parser.transitions.items()},
+            actions)
+
+
+def test_lazy_lr1():
+    print("="*70)
+    print("PRUEBA DEL PARSER LR(1) PEREZOSO")
+    print("="*70)
+
+    # Al construir solo se expande el estado inicial
+    parser = LazyLR1Parser()
+    parser.parse_grammar(GRAMMAR)
+    eager = LR1Parser()
+    eager.parse_grammar(GRAMMAR)
+    print(f"\nTras construir: {parser.expanded_states} de {len(eager.states)} estados")
+    assert parser.expanded_states == 1
+
+    for text in ("id + id * id", "( id + id ) * id", "id + * id", "( id", "id id"):
+        assert parser.parse_string(text)['success'] == eager.parse_string(text)['success'], text
+    print(f"Tras analizar: {parser.expanded_states} estados expandidos")
+    assert 1 < parser.expanded_states < len(eager.states)
+
+    # Expandido todo, es el autómata LR(1) canónico
+    parser.materialize()
+    assert parser.expanded_states == len(parser.states) == len(eager.states)
+    assert canonical(parser) == canonical(eager)
+
+    # Gramática del corpus: la entrada real solo ejercita parte del autómata
+    text, input_path = load_grammar('sql')
+    tokens = list(iter_mmap_tokens(input_path))
+    parser = LazyLR1Parser()
+    parser.parse_grammar(text)
+    assert parser.parse_tokens(tokens)['success']
+    eager = LR1Parser()
+    eager.parse_grammar(text)
+    print(f"\nsql: {parser.expanded_states} de {len(eager.states)} estados para {len(tokens)} tokens")
+    assert parser.expanded_states < len(eager.states)
+    parser.materialize()
+    assert canonical(parser) == canonical(eager)
+
+    # Varias sesiones expanden el mismo parser a la vez
+    parser = LazyLR1Parser()
+    parser.parse_grammar(text)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(parser.parse_tokens(tokens)['success']))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 8
+
+    # Los conflictos aparecen a medida que se visitan los estados
+    parser = LazyLR1Parser()
+    parser.parse_grammar("E -> E + E | id")
+    assert not parser.conflicts
+    parser.parse_string("id + id + id")
+    assert parser.conflicts and parser.conflicts[0]['type'] == 'shift/reduce'
+
+    registry = ParserRegistry()
+    entry, _ = registry.build(GRAMMAR, 'LR1-lazy')
+    assert entry.parser_type == 'LR1LAZY' and entry.parser.lazy and entry.num_states < 23
+
+    # El crecimiento del autómata cuenta en los estados y bytes del registro
+    before_bytes, before_states = entry.size_bytes, entry.num_states
+    entry.parser.parse_string("id * id + id")
+    assert registry.track_growth(entry)
+    print(f"\nRegistro: {before_states} -> {entry.num_states} estados, "
+          f"{before_bytes} -> {entry.size_bytes} bytes")
+    assert entry.num_states > before_states and entry.size_bytes > before_bytes
+    assert registry.total_bytes == entry.size_bytes and registry.total_states == entry.num_states
+    assert not registry.track_growth(registry.build(GRAMMAR, 'LR1')[0])
+
+    # El grafo del visualizador sigue al autómata a medida que crece
+    visualizer = LR1GraphvizVisualizer(entry.parser)
+    before = visualizer.get_dot_source()
+    neighbors = visualizer.neighborhood(0, radius=10)
+    entry.parser.parse_string("( id + id ) * id")
+    after = visualizer.get_dot_source()
+    assert after != before and after.count('->') > before.count('->')
+    assert visualizer.get_dot_source() == after
+    assert visualizer.neighborhood(0, radius=10) > neighbors
+
+    print("\n✅ Parser LR(1) perezoso correcto")
+
+
+if __name__ == "__main__":
+    test_lazy_lr1()
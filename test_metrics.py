@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las métricas de Prometheus (/metrics)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+from backend.metrics import MetricsRegistry
+from backend.registry import ParserRegistry
+from backend.app import app, metrics as app_metrics, record_build
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def sample(text, line_prefix, default=None):
+    """Valor de la primera línea que empieza con line_prefix"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(' ', 1)[1])
+    assert default is not None, f"No se encontró {line_prefix}"
+    return default
+
+
+def test_metrics():
+    print("="*70)
+    print("PRUEBA DE MÉTRICAS")
+    print("="*70)
+
+    # Histograma: buckets acumulados, suma y cantidad
+    metrics = MetricsRegistry()
+    latency = metrics.histogram('demo_seconds', 'Demo', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, route='/a"b')
+    metrics.collected('demo_gauge', 'Demo', lambda: [({}, 2)])
+    text = metrics.render()
+    print(f"\n{text}")
+    assert 'demo_seconds_bucket{route="/a\\"b",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="1"} 3' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in text
+    assert sample(text, 'demo_seconds_count') == 4
+    assert sample(text, 'demo_gauge') == 2
+
+    # Endpoint: construcción, análisis y latencia por ruta (diferencias
+    # respecto de la consulta inicial, la app es compartida con otras pruebas)
+    client = app.test_client()
+    before = client.get('/metrics').get_data(as_text=True)
+    delta = lambda text, prefix: sample(text, prefix) - sample(before, prefix, 0)
+    grammar_id = client.post('/api/build_parser', json={'grammar': GRAMMAR}).get_json()['grammar_id']
+    client.post('/api/parse_string', json={'grammar_id': grammar_id, 'string': 'id + id * id'})
+    etag = client.get(f'/api/get_states?grammar_id={grammar_id}').headers['ETag']
+    client.get(f'/api/get_states?grammar_id={grammar_id}', headers={'If-None-Match': etag})
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+
+    assert sample(text, 'lr1_build_states_count{parser_type="LR1"}') >= 1
+    assert delta(text, 'lr1_parse_steps_count{accepted="true"}') == 1
+    assert delta(text, 'lr1_parse_tokens_total') == 5
+    assert delta(text, 'lr1_view_responses_total{result="not_modified"}') == 1
+    assert 0 < sample(text, 'lr1_cache_hit_ratio{cache="views"}') <= 1
+    assert sample(text, 'lr1_builds_in_flight') == 0
+    assert delta(text, 'lr1_http_request_duration_seconds_count'
+                       '{route="/api/parse_string",method="POST",status="200"}') == 1
+    print(f"Métricas expuestas: {text.count('# TYPE')}")
+
+    # Cargar una gramática de las tablas compartidas no cuenta como construcción
+    with tempfile.TemporaryDirectory() as directory:
+        entry, _ = ParserRegistry(shared_dir=directory).build(GRAMMAR, 'LALR1')
+        before = app_metrics.render()
+        attached = ParserRegistry(shared_dir=directory, prepare=record_build).get(entry.grammar_id)
+        assert attached.extras['shared']['attached']
+        text = app_metrics.render()
+        builds = 'lr1_build_states_count{parser_type="LALR1"}'
+        assert sample(text, builds, 0) == sample(before, builds, 0)
+        assert delta(text, 'lr1_shared_attaches_total{parser_type="LALR1"}') == 1
+
+    print("\n✅ Métricas correctas")
+
+
+if __name__ == "__main__":
+    test_metrics()
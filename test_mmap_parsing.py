@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el análisis de archivos grandes con mmap
+"""
+
+import os
+import tempfile
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def _write_tokens(text):
+    fd, path = tempfile.mkstemp(suffix='.tok')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    return path
+
+
+def test_parse_file():
+    print("="*70)
+    print("PRUEBA DE ANÁLISIS DE ARCHIVOS CON MMAP")
+    print("="*70)
+
+    for parser_class in (LR1Parser, LALR1Parser):
+        parser = parser_class()
+        parser.parse_grammar(GRAMMAR)
+
+        # Entrada válida larga (supera el límite de pasos de parse_string)
+        path = _write_tokens(' + '.join(['( id * id )'] * 5000) + '\n')
+        try:
+            result = parser.parse_file(path)
+            print(f"\n[{parser_class.__name__}] válida: {result}")
+            assert result['success']
+            assert result['tokens'] == 5000 * 5 + 4999
+        finally:
+            os.remove(path)
+
+        # Entrada con error: el offset debe apuntar al token inesperado
+        text = 'id + id\n* ) id'
+        path = _write_tokens(text)
+        try:
+            result = parser.parse_file(path)
+            print(f"[{parser_class.__name__}] inválida: {result}")
+            assert not result['success']
+            assert result['token'] == ')'
+            assert result['offset'] == text.index(')')
+        finally:
+            os.remove(path)
+
+        # Entrada truncada: el error ocurre al final del archivo
+        text = 'id +'
+        path = _write_tokens(text)
+        try:
+            result = parser.parse_file(path)
+            print(f"[{parser_class.__name__}] truncada: {result}")
+            assert not result['success']
+            assert result['token'] == '$'
+            assert result['offset'] == len(text)
+        finally:
+            os.remove(path)
+
+    print("\n✅ Análisis con mmap correcto para LR(1) y LALR(1)")
+
+
+if __name__ == "__main__":
+    test_parse_file()
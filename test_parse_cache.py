@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la caché de resultados de /api/parse_string
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(__file__))
+
+from backend.registry import ParserRegistry
+from backend.parse_cache import ParseResultCache
+from backend.app import app, registry as app_registry
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def test_parse_cache():
+    print("="*70)
+    print("PRUEBA DE LA CACHÉ DE RESULTADOS DE ANÁLISIS")
+    print("="*70)
+
+    registry = ParserRegistry()
+    cache = ParseResultCache(registry, max_results=2)
+    entry, _ = registry.build(GRAMMAR, 'LR1')
+    base_bytes = entry.size_bytes
+    calls = []
+
+    def parse_with(text):
+        def parse():
+            calls.append(text)
+            return {'accepted': entry.parser.parse_string(text)['success']}
+        return parse
+
+    # Misma secuencia de tokens (con otros espacios): un solo análisis
+    view, cached = cache.get_or_parse(entry, "id + id", True, parse_with("id + id"))
+    assert not cached and json.loads(view.plain_body()) == {'accepted': True}
+    view, cached = cache.get_or_parse(entry, "  id   +\tid ", True, parse_with("id + id"))
+    assert cached and calls == ["id + id"]
+
+    # La traza es parte de la clave
+    _, cached = cache.get_or_parse(entry, "id + id", False, parse_with("id + id"))
+    assert not cached
+
+    # Los bytes de los resultados cuentan en el registro y el LRU por gramática los acota
+    assert entry.size_bytes > base_bytes and registry.total_bytes == entry.size_bytes
+    cache.get_or_parse(entry, "id *", True, parse_with("id *"))
+    assert len(entry.extras['parse_results']) == 2
+    assert entry.size_bytes == base_bytes + sum(view.size_bytes for view in entry.extras['parse_results'].values())
+    print(f"\nEstadísticas: {cache.stats()}")
+    assert cache.stats() == {'hits': 1, 'misses': 3}
+
+    # Otra gramática es otro grammar_id: no ve los resultados anteriores
+    edited, _ = registry.build(GRAMMAR + "F -> num\n", 'LR1')
+    assert 'parse_results' not in edited.extras
+
+    # Expulsar la gramática se lleva sus resultados
+    small = ParserRegistry(max_entries=1)
+    cache = ParseResultCache(small)
+    entry, _ = small.build(GRAMMAR, 'LR1')
+    cache.get_or_parse(entry, "id", True, parse_with("id"))
+    lalr, _ = small.build(GRAMMAR, 'LALR1')
+    assert small.get(entry.grammar_id) is None and small.total_bytes == lalr.size_bytes
+
+    # Endpoint: la segunda petición igual sale de la caché
+    client = app.test_client()
+    grammar_id = client.post('/api/build_parser', json={'grammar': GRAMMAR}).get_json()['grammar_id']
+    request = {'grammar_id': grammar_id, 'string': '( id ) * id + id'}
+    first = client.post('/api/parse_string', json=request)
+    second = client.post('/api/parse_string', json=request)
+    assert first.headers['X-Parse-Cache'] == 'miss' and second.headers['X-Parse-Cache'] == 'hit'
+    assert first.get_json() == second.get_json()
+    assert first.get_json()['accepted'] and first.get_json()['trace']
+    no_trace = client.post('/api/parse_string', json={**request, 'trace': False}).get_json()
+    assert no_trace['accepted'] and 'trace' not in no_trace
+    for value in ('false', '0', 0, 'False'):
+        response = client.post('/api/parse_string', json={**request, 'trace': value})
+        assert 'trace' not in response.get_json() and response.headers['X-Parse-Cache'] == 'hit'
+    for value in ('true', '1', 1):
+        assert client.post('/api/parse_string', json={**request, 'trace': value}).get_json()['trace']
+
+    # Con un parser perezoso cada análisis nuevo suma al tamaño de la entrada
+    lazy_id = client.post('/api/build_parser',
+                          json={'grammar': GRAMMAR, 'parser_type': 'LR1-lazy'}).get_json()['grammar_id']
+    lazy = app_registry.get(lazy_id)
+    before = lazy.parser_bytes
+    client.post('/api/parse_string', json={'grammar_id': lazy_id, 'string': '( id ) * id + id'})
+    assert lazy.parser_bytes > before
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'lr1_cache_hits_total{cache="parse"}' in metrics
+
+    print("\n✅ Caché de resultados correcta")
+
+
+if __name__ == "__main__":
+    test_parse_cache()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el registro de parsers del backend
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from backend.registry import ParserRegistry, grammar_id
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+GRAMMAR_2 = """
+S -> q * A * B * C
+A -> a
+A -> b * b * D
+B -> a
+B -> ε
+C -> b
+C -> ε
+D -> C
+D -> ε
+"""
+
+
+def test_registry():
+    print("="*70)
+    print("PRUEBA DEL REGISTRO DE PARSERS")
+    print("="*70)
+
+    # El id ignora comentarios y espacios, pero distingue el tipo de parser
+    same_text = "# comentario\nS -> E\nE->E + T |   T\nT -> T * F\nT -> F\nF -> ( E )\nF -> id"
+    assert grammar_id(GRAMMAR, 'LR1') != grammar_id(GRAMMAR, 'LALR1')
+    assert grammar_id(GRAMMAR, 'LALR1') == grammar_id(GRAMMAR, 'LALR(1)')
+    assert grammar_id("E -> E + T | T", 'LR1') == grammar_id("E  ->  E + T|T", 'LR1')
+
+    registry = ParserRegistry(max_entries=2)
+
+    entry, cached = registry.build(GRAMMAR, 'LR1')
+    print(f"\n[1] Construido {entry.grammar_id}: {entry.num_states} estados, cached={cached}")
+    assert not cached and entry.num_states == 23
+
+    again, cached = registry.build(GRAMMAR, 'LR1')
+    print(f"[2] Reconstruido: cached={cached}")
+    assert cached and again is entry
+
+    lalr, _ = registry.build(GRAMMAR, 'LALR1')
+    print(f"[3] LALR(1) {lalr.grammar_id}: {lalr.num_states} estados")
+    assert lalr.num_states == 13
+
+    # Una tercera gramática expulsa la menos usada recientemente (LR1)
+    other, _ = registry.build(GRAMMAR_2, 'LR1')
+    print(f"[4] Tercera gramática {other.grammar_id}: {registry.stats()}")
+    assert registry.get(entry.grammar_id) is None
+    assert registry.get(lalr.grammar_id) is lalr
+    assert registry.stats()['entries'] == 2
+
+    # Expulsión por número total de estados
+    small = ParserRegistry(max_states=30)
+    first, _ = small.build(GRAMMAR, 'LR1')
+    second, _ = small.build(GRAMMAR_2, 'LR1')
+    print(f"[5] Límite de estados: {small.stats()}")
+    assert small.get(first.grammar_id) is None
+    assert small.get(second.grammar_id) is second
+
+    print("\n✅ Registro de parsers correcto")
+
+
+if __name__ == "__main__":
+    test_registry()
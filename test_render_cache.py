@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para la caché de renderizados (render_id, formato)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from backend.render_cache import RenderCache
+from backend.app import app, render_cache
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def test_render_cache():
+    print("="*70)
+    print("PRUEBA DE LA CACHÉ DE RENDERIZADOS")
+    print("="*70)
+
+    calls = []
+
+    def renderer(source, output_format):
+        calls.append((source, output_format))
+        return f'{output_format}:{source}'.encode('utf-8') * 10
+
+    # Mismo DOT, mismo render_id; otro DOT, otro render_id
+    cache = RenderCache()
+    first = cache.register('digraph { a -> b }')
+    assert cache.register('digraph { a -> b }') == first
+    second = cache.register('digraph { b -> a }')
+    assert second != first and len(first) == 16
+
+    # Cada formato es una clave propia y se renderiza una sola vez
+    svg = cache.get(first, 'svg', renderer)
+    assert cache.get(first, 'svg', renderer) is svg
+    png = cache.get(first, 'png', renderer)
+    assert png != svg and png.startswith(b'png:')
+    assert cache.get(second, 'svg', renderer) != svg
+    assert calls == [('digraph { a -> b }', 'svg'), ('digraph { a -> b }', 'png'),
+                     ('digraph { b -> a }', 'svg')]
+
+    # Las claves de layout por rankdir no chocan entre sí
+    assert cache.get(first, 'layout-LR', renderer) != cache.get(first, 'layout-TB', renderer)
+    print(f"\nEstadísticas: {cache.stats()}")
+    assert cache.stats()['entries'] == 7 and cache.stats()['hits'] == 1
+
+    # render_id desconocido: no se llama al renderer
+    calls.clear()
+    assert cache.get('0' * 16, 'svg', renderer) is None and not calls
+
+    # Tope de bytes: se expulsa lo menos usado (incluido el DOT)
+    source = 'digraph { x }'
+    small = RenderCache(max_bytes=3 * len(renderer(source, 'svg')))
+    render_id = small.register(source)
+    small.get(render_id, 'svg', renderer)
+    small.get(render_id, 'png', renderer)
+    assert small.stats()['entries'] == 3
+    small.get(render_id, 'pdf', renderer)
+    assert small.total_bytes <= small.max_bytes
+    assert small.total_bytes == sum(len(data) for data in small._data.values())
+    assert (render_id, 'dot') not in small._data and (render_id, 'pdf') in small._data
+    assert small.get(render_id, 'gif', renderer) is None
+
+    # Una sola salida más grande que el tope se conserva (la última)
+    tiny = RenderCache(max_bytes=1)
+    render_id = tiny.register(source)
+    assert tiny.stats()['entries'] == 1
+    tiny.get(render_id, 'svg', renderer)
+    assert list(tiny._data) == [(render_id, 'svg')]
+
+    # Endpoint: rankdir se valida antes de usarlo en la clave
+    client = app.test_client()
+    grammar_id = client.post('/api/build_parser', json={'grammar': GRAMMAR}).get_json()['grammar_id']
+    request = {'grammar_id': grammar_id, 'engine': 'builtin', 'view': 'ids'}
+    entries = render_cache.stats()['entries']
+    response = client.post('/api/generate_graphviz', json={**request, 'rankdir': 'x' * 1000})
+    assert response.status_code == 400 and 'rankdir' in response.get_json()['error']
+    assert render_cache.stats()['entries'] == entries + 1  # solo el DOT registrado
+
+    for rankdir in ('LR', 'TB', 'RL', 'BT'):
+        response = client.post('/api/generate_graphviz', json={**request, 'rankdir': rankdir})
+        assert response.status_code == 200 and response.get_json()['layout']['nodes']
+    assert render_cache.stats()['entries'] == entries + 5
+
+    print("\n✅ Caché de renderizados correcta")
+
+
+if __name__ == "__main__":
+    test_render_cache()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para el generador de oraciones (entradas válidas y mutadas)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.sentence_generator import SentenceGenerator, UNBOUNDED
+from benchmarks.bench_corpus import load_grammar
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def accepts(parser, tokens):
+    return parser.parse_tokens((token, i) for i, token in enumerate(tokens))['success']
+
+
+def test_sentence_generator():
+    print("="*70)
+    print("PRUEBA DEL GENERADOR DE ORACIONES")
+    print("="*70)
+
+    parser = LR1Parser()
+    parser.parse_grammar(GRAMMAR)
+    generator = SentenceGenerator(parser, seed=42)
+
+    # Longitudes mínimas y máximas de derivación
+    print(f"\nMínimos: {generator.min_lengths}")
+    assert generator.min_lengths == {'S': 1, 'E': 1, 'T': 1, 'F': 1}
+    assert generator.max_lengths['E'] == UNBOUNDED
+
+    # Oraciones válidas con la longitud pedida (las longitudes pares no existen)
+    for length in (1, 3, 7, 25, 301, 5001):
+        tokens = generator.sentence(length)
+        assert len(tokens) == length and accepts(parser, tokens)
+    print(f"Ejemplo: {' '.join(generator.sentence(9))}")
+
+    # Misma semilla, mismas oraciones
+    again = SentenceGenerator(parser, seed=42)
+    assert again.sentence(50) == SentenceGenerator(parser, seed=42).sentence(50)
+
+    # Mutaciones de un token y casos negativos verificados
+    tokens = generator.sentence(11)
+    for kind in ('delete', 'insert', 'replace', 'swap'):
+        mutated, mutation = generator.mutate(tokens, kind)
+        assert mutation['kind'] == kind and abs(len(mutated) - len(tokens)) <= 1
+    for _ in range(20):
+        mutated, mutation = generator.negative(15)
+        assert not accepts(parser, mutated)
+    print(f"Negativo: {' '.join(mutated)} ({mutation})")
+
+    # Gramáticas del corpus: oraciones grandes aceptadas, a lo sumo 0.1% más cortas o largas
+    for name in ('json', 'pascal'):
+        corpus_parser = LALR1Parser(direct=True)
+        corpus_parser.parse_grammar(load_grammar(name)[0])
+        tokens = SentenceGenerator(corpus_parser, seed=1).sentence(20000)
+        assert abs(len(tokens) - 20000) <= 20 and accepts(corpus_parser, tokens)
+        print(f"{name}: {len(tokens)} tokens aceptados")
+
+    print("\n✅ Generador de oraciones correcto")
+
+
+if __name__ == "__main__":
+    test_sentence_generator()
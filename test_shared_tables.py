@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las tablas ACTION/GOTO compartidas entre procesos:
+un proceso construye y publica, otro carga las tablas sin construir
+"""
+
+import sys
+import os
+import multiprocessing
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.lr0_parser import SLR1Parser
+from parser.shared_tables import SharedTable, SharedTables, write_tables
+from parser.token_stream import iter_mmap_tokens
+from backend.registry import ParserRegistry
+from benchmarks.bench_corpus import load_grammar
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def worker_parse(shared_dir, key, texts):
+    """Otro proceso (como un worker de gunicorn): usa el grammar_id sin construir"""
+    registry = ParserRegistry(shared_dir=shared_dir)
+    entry = registry.get(key)
+    return (entry.extras['shared']['attached'], entry.num_states,
+            [entry.parser.parse_string(text)['success'] for text in texts])
+
+
+def test_shared_tables():
+    print("="*70)
+    print("PRUEBA DE TABLAS COMPARTIDAS ENTRE PROCESOS")
+    print("="*70)
+
+    directory = tempfile.mkdtemp()
+    sql, input_path = load_grammar('sql')
+    tokens = list(iter_mmap_tokens(input_path))
+
+    # Cargado del archivo, el parser es igual al construido
+    for factory in (LR1Parser, LALR1Parser, SLR1Parser):
+        built = factory()
+        built.parse_grammar(sql)
+        path = os.path.join(directory, 'tablas.tables')
+        size = write_tables(built, path, {'grammar': sql})
+
+        attached = factory()
+        attached.load_shared(sql, SharedTables(path))
+        assert isinstance(attached.action_table, SharedTable)
+        assert attached.action_table == built.action_table and attached.goto_table == built.goto_table
+        assert attached.transitions == built.transitions
+        assert attached.get_states_info() == built.get_states_info()
+        assert attached.parse_tokens(tokens) == built.parse_tokens(tokens)
+        print(f"\n{built.parser_type_name}: {len(built.states)} estados, archivo de {size:,} bytes")
+
+    # Un archivo de otra gramática se rechaza
+    try:
+        LR1Parser().load_shared(GRAMMAR, SharedTables(path))
+        assert False, "Debió rechazar tablas de otra gramática"
+    except ValueError as e:
+        print(f"Gramática distinta: {e}")
+
+    # El primer registro construye y publica; su parser ya lee del archivo
+    registry = ParserRegistry(shared_dir=directory)
+    entry, cached = registry.build(GRAMMAR, 'LALR1')
+    assert not cached and entry.extras['shared']['attached'] is False
+    assert isinstance(entry.parser.action_table, SharedTable)
+    assert entry.parser.parse_string("id + id * id")['success']
+
+    # Otro proceso usa el grammar_id directamente
+    texts = ["id + id * id", "( id + id ) * id", "id + * id"]
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        attached, num_states, results = pool.apply(worker_parse, (directory, entry.grammar_id, texts))
+    print(f"Otro proceso: {num_states} estados cargados, resultados {results}")
+    assert attached and num_states == entry.num_states
+    assert results == [True, True, False]
+
+    # Otro registro que construye la misma gramática la carga en vez de construirla
+    other = ParserRegistry(shared_dir=directory)
+    loaded, cached = other.build(GRAMMAR, 'LALR1')
+    assert loaded.extras['shared']['attached'] and loaded.size_bytes < entry.size_bytes
+    assert loaded.parser.get_parsing_table() == entry.parser.get_parsing_table()
+
+    # AUTO recuerda la clase elegida
+    entry, _ = registry.build(GRAMMAR, 'AUTO')
+    loaded = other.get(entry.grammar_id)
+    assert loaded.parser.parser_type_name == entry.parser.parser_type_name == 'SLR(1)'
+    assert loaded.extras['auto'] == entry.extras['auto']
+
+    # Al cargar desde el directorio también se prepara la entrada (métricas y vistas)
+    prepared = []
+    third = ParserRegistry(shared_dir=directory, prepare=lambda entry: prepared.append(entry) or 100)
+    loaded = third.get(entry.grammar_id)
+    assert prepared == [loaded] and third.total_bytes == loaded.size_bytes
+
+    # Un grammar_id que no tiene la forma de un hash nunca llega al disco
+    outside = os.path.join(os.path.dirname(directory), 'afuera.tables')
+    shutil.copy(os.path.join(directory, f'{entry.grammar_id}.tables'), outside)
+    for bad_id in ('../afuera', entry.grammar_id + '/..', entry.grammar_id.upper(), ''):
+        assert other.get(bad_id) is None
+    os.remove(outside)
+
+    # El directorio respeta su tamaño máximo: se borran los archivos menos usados
+    capped = ParserRegistry(shared_dir=directory, shared_max_bytes=1)
+    newest, _ = capped.build(GRAMMAR + "F -> num\n", 'LR1')
+    assert os.listdir(directory) == [f'{newest.grammar_id}.tables']
+    assert newest.parser.parse_string("num + id")['success']
+    # Quien ya tenía mapeado un archivo borrado lo sigue usando
+    assert entry.parser.parse_string("id + id * id")['success']
+
+    # Sin shared_dir no se comparte nada
+    assert 'shared' not in ParserRegistry().build(GRAMMAR, 'LR1')[0].extras
+
+    shutil.rmtree(directory, ignore_errors=True)
+
+    print("\n✅ Tablas compartidas correctas")
+
+
+if __name__ == "__main__":
+    test_shared_tables()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para los parsers LR(0) y SLR(1) y la selección automática
+de la clase más barata sin conflictos
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from parser.lalr1_parser import LALR1Parser
+from parser.lr0_parser import LR0Parser, SLR1Parser
+from parser.auto_parser import build_cheapest_parser
+from backend.registry import ParserRegistry, normalize_parser_type
+from benchmarks.bench_corpus import load_grammar
+
+# Gramática más barata que admite cada una, con cadenas aceptadas y rechazadas
+GRAMMARS = {
+    'LR0': ("S -> ( S ) | x", ["x", "( ( x ) )"], ["( x", "x )"]),
+    'SLR1': ("S -> E\nE -> E + T | T\nT -> T * F | F\nF -> ( E ) | id",
+             ["id + id * id", "( id + id ) * id"], ["id + * id", "( id"]),
+    'LALR1': ("S -> L = R | R\nL -> * R | id\nR -> L", ["id = * id", "* * id"], ["id = = id", "="]),
+    'LR1': ("S -> a A d | b B d | a B e | b A e\nA -> c\nB -> c", ["a c d", "b c d", "a c e"], ["a c", "c d"]),
+}
+
+
+def test_slr_lr0():
+    print("="*70)
+    print("PRUEBA DE PARSERS LR(0), SLR(1) Y SELECCIÓN AUTOMÁTICA")
+    print("="*70)
+
+    order = ['LR0', 'SLR1', 'LALR1', 'LR1']
+    classes = {'LR0': LR0Parser, 'SLR1': SLR1Parser, 'LALR1': LALR1Parser, 'LR1': LR1Parser}
+
+    for expected, (grammar, accepted, rejected) in GRAMMARS.items():
+        print(f"\n{expected}: {grammar.splitlines()[0]} ...")
+        for parser_type in order:
+            parser = classes[parser_type]()
+            parser.parse_grammar(grammar)
+            conflict_free = not parser.conflicts
+            print(f"  {parser.parser_type_name}: {len(parser.states)} estados, "
+                  f"{len(parser.conflicts)} conflictos")
+            # Admiten la gramática las clases desde la esperada en adelante
+            assert conflict_free == (order.index(parser_type) >= order.index(expected))
+            if conflict_free:
+                for text in accepted:
+                    assert parser.parse_string(text)['success'], text
+                for text in rejected:
+                    assert not parser.parse_string(text)['success'], text
+
+        # LR(0) y SLR(1) usan el autómata LR(0): tantos estados como LALR(1)
+        sizes = set()
+        for parser in (LR0Parser(), SLR1Parser(), LALR1Parser(direct=True)):
+            parser.parse_grammar(grammar)
+            sizes.add(len(parser.states))
+        assert len(sizes) == 1
+
+        parser, info = build_cheapest_parser(grammar)
+        print(f"  AUTO -> {info['selected']} (probados: {[t['type'] for t in info['tried']]})")
+        assert info['selected'] == expected and not parser.conflicts
+        assert [t['type'] for t in info['tried']] == order[:order.index(expected) + 1]
+
+    # SLR(1) tras LR(0) toma su autómata y solo rehace la tabla
+    text, _ = load_grammar('clike')
+    lr0 = LR0Parser()
+    lr0.parse_grammar(text)
+    slr = SLR1Parser()
+    slr.parse_grammar(text, previous=lr0)
+    fresh = SLR1Parser()
+    fresh.parse_grammar(text)
+    print(f"\nclike: SLR(1) reutiliza {slr.stats.states_reused} de {len(slr.states)} estados, "
+          f"{slr.stats.closure_calls} clausuras")
+    assert slr.stats.states_reused == len(slr.states) == len(fresh.states)
+    assert slr.stats.closure_calls == 0 and not slr.conflicts
+    assert slr.action_table == fresh.action_table and slr.goto_table == fresh.goto_table
+    parser, info = build_cheapest_parser(text)
+    assert info['selected'] == 'SLR1' and parser.stats.states_reused == len(parser.states)
+
+    # Otra gramática: el autómata se construye de nuevo
+    other = SLR1Parser()
+    other.parse_grammar(GRAMMARS['SLR1'][0], previous=lr0)
+    assert other.stats.states_reused == 0 and other.stats.closure_calls > 0
+
+    # Los items LR(0) no llevan lookahead
+    parser = SLR1Parser()
+    parser.parse_grammar(GRAMMARS['SLR1'][0])
+    items = [item for state in parser.get_states_info() for item in state['items']]
+    assert "E -> E • + T" in items and not any(',' in item for item in items)
+
+    # Una gramática ambigua tiene conflictos en todas las clases; la
+    # precedencia (gramáticas importadas) los resuelve
+    parser, info = build_cheapest_parser("E -> E + E | id")
+    assert info['selected'] == 'LR1' and parser.conflicts[0]['type'] == 'shift/reduce'
+    print(f"\nAmbigua: {parser.conflicts[0]}")
+
+    # API: los nuevos tipos en el registro
+    assert normalize_parser_type('SLR(1)') == 'SLR1' and normalize_parser_type('lr(0)') == 'LR0'
+    assert normalize_parser_type('auto') == 'AUTO'
+    registry = ParserRegistry()
+    entry, _ = registry.build(GRAMMARS['LALR1'][0], 'AUTO')
+    assert entry.parser.parser_type_name == 'LALR(1)' and entry.extras['auto']['selected'] == 'LALR1'
+    entry, _ = registry.build(GRAMMARS['SLR1'][0], 'SLR(1)')
+    assert isinstance(entry.parser, SLR1Parser)
+
+    print("\n✅ Parsers LR(0)/SLR(1) y selección automática correctos")
+
+
+if __name__ == "__main__":
+    test_slr_lr0()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para las vistas paginadas, sparse y precalculadas de estados y tabla ACTION/GOTO
+"""
+
+import gzip
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from parser.lr1_parser import LR1Parser
+from backend.registry import ParserRegistry
+from backend.views import (STATE_ITEM_FIELDS, encode_view, page_bounds, page_info, parse_fields,
+                           parsing_table_page, states_page, table_rows)
+
+GRAMMAR = """
+S -> E
+E -> E + T
+E -> T
+T -> T * F
+T -> F
+F -> ( E )
+F -> id
+"""
+
+
+def test_table_views():
+    print("="*70)
+    print("PRUEBA DE VISTAS PAGINADAS")
+    print("="*70)
+
+    parser = LR1Parser()
+    parser.parse_grammar(GRAMMAR)
+    total = len(parser.states)
+    rows = table_rows(parser)
+
+    # La tabla densa completa coincide celda a celda con las tablas del parser
+    dense = parsing_table_page(parser, rows, 0, total)
+    for idx in range(total):
+        for terminal in dense['terminals']:
+            assert dense['action'][idx][terminal] == parser.action_table.get((idx, terminal), '')
+    print(f"\nTabla densa: {total} estados x {len(dense['terminals'])} terminales")
+
+    # Sparse: solo celdas no vacías, mismo contenido
+    sparse = parsing_table_page(parser, rows, 0, total, sparse=True)
+    cells = sum(len(row) for row in sparse['action'].values())
+    print(f"Sparse: {cells} celdas ACTION (de {total * len(dense['terminals'])})")
+    assert cells == len(parser.action_table)
+    assert all(value != '' for row in sparse['goto'].values() for value in row.values())
+
+    # Páginas consecutivas cubren todos los estados sin repetir
+    seen = []
+    start = 0
+    while start is not None:
+        start, end = page_bounds(total, start, 5)
+        page = parsing_table_page(parser, rows, start, end, sparse=True, fields=('goto',))
+        assert 'action' not in page
+        seen.extend(page['goto'])
+        start = page_info(total, start, end)['next']
+    assert seen == list(range(total))
+    print(f"Páginas de 5: {len(seen)} estados")
+
+    # Selección de campos de los items
+    fields = parse_fields('left,lookahead', STATE_ITEM_FIELDS)
+    states = states_page(parser, 0, 2, fields)
+    assert len(states) == 2 and set(states[0]['items'][0]) == {'left', 'lookahead'}
+
+    try:
+        parse_fields('left,foo', STATE_ITEM_FIELDS)
+        assert False, "Debió rechazar un campo desconocido"
+    except ValueError as e:
+        print(f"Error esperado: {e}")
+
+    # Vistas serializadas: mismo contenido, mismo ETag; gzip reversible
+    view = encode_view(dense, 'tabla')
+    assert view.etag == encode_view(parsing_table_page(parser, table_rows(parser), 0, total), 'tabla').etag
+    assert view.etag != encode_view(sparse, 'tabla').etag
+    assert json.loads(gzip.decompress(view.gzip_body)) == json.loads(view.body)
+    print(f"Vista serializada: {len(view.body)} bytes, gzip {len(view.gzip_body)} bytes")
+
+    # El hook prepare del registro precalcula al construir y suma su tamaño
+    registry = ParserRegistry(prepare=lambda entry: entry.extras.setdefault('vista', view).size_bytes)
+    entry, _ = registry.build(GRAMMAR)
+    assert entry.extras['vista'] is view
+    assert registry.stats()['total_bytes'] == entry.size_bytes >= view.size_bytes
+
+    print("\n✅ Vistas paginadas correctas")
+
+
+if __name__ == "__main__":
+    test_table_views()